@@ -0,0 +1,90 @@
+from typing import Any, Dict, List
+from crewai import BaseLLM
+from types import SimpleNamespace
+from lessoncraftai.utils.embeddings import LocalHashEmbeddings
+import json
+import re
+import threading
+import time
+
+class SlowEmbeddings(LocalHashEmbeddings):
+    """Offline embeddings that sleep like a remote API: a fixed cost per request plus a cost per text"""
+
+    def __init__(self, dimensions: int = 256, request_latency: float = 0.0, per_text_latency: float = 0.0):
+        super().__init__(dimensions)
+        self.model = f"fake-embeddings-{dimensions}"
+        self.request_latency = request_latency
+        self.per_text_latency = per_text_latency
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        with self._lock:
+            self.requests += 1
+        time.sleep(self.request_latency + self.per_text_latency * len(texts))
+        return super().embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+def chat_reply(prompt: str) -> str:
+    """AnalyzeTopics answer: the unit headings found in the prompt, or objectives for one outline section"""
+    section = re.search(r"^Section: (.+)$", prompt, re.MULTILINE)
+    if section:
+        return json.dumps([f"Explain {section.group(1).strip().lower()}"])
+    headings = dict.fromkeys(re.findall(r"Unit \d+: ([A-Za-z ]+)", prompt)) or {"General Review": None}
+    return json.dumps([
+        {"topic": heading.strip(), "objectives": [f"Explain {heading.strip().lower()}"]}
+        for heading in headings
+    ])
+
+def agent_reply(messages: List[Dict[str, Any]]) -> str:
+    """Agent answer: call the only tool named in the prompt once, then return its observation"""
+    transcript = "\n".join(str(m.get("content", "")) for m in messages)
+
+    # Once the tool has run, its result comes back as an assistant message
+    replies = [str(m.get("content", "")) for m in messages if m.get("role") == "assistant"]
+    if replies:
+        observation = replies[-1].split("Observation:", 1)[-1].strip()
+        return f"Thought: I now know the final answer\nFinal Answer: {observation or 'Done'}"
+
+    match = re.search(r"Tool Name: ([^\n]+)", transcript)
+    if not match:
+        return "Thought: I now know the final answer\nFinal Answer: Done"
+    return f"Thought: I should use my tool\nAction: {match.group(1).strip()}\nAction Input: {{}}"
+
+class FakeChatModel:
+    """Stands in for ChatOpenAI in AnalyzeTopics, answering with chat_reply()"""
+
+    def __init__(self, latency: float = 0.0):
+        self.model_name = "fake-chat"
+        self.temperature = 0.2
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt: Any) -> SimpleNamespace:
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        return SimpleNamespace(content=chat_reply(str(prompt)))
+
+class FakeAgentLLM(BaseLLM):
+    """Agent LLM that calls the agent's only tool once, then returns its observation as the final answer"""
+
+    latency: float = 0.0
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, **kwargs):
+        time.sleep(self.latency)
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+        return agent_reply(messages)
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+    def supports_stop_words(self) -> bool:
+        return True
+
+    def get_context_window_size(self) -> int:
+        return 128000
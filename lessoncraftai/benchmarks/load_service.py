@@ -0,0 +1,251 @@
+"""Load generator for the lesson-generation service: throughput and latency percentiles
+
+Closed loop: each client submits a job, follows its event stream to the end and
+submits the next. Jobs go round-robin over --curricula synthetic curricula,
+since the service runs jobs on one vector store one at a time. Without --url
+the service is started as a subprocess against the mock OpenAI server, together
+with cold `main.py run` processes as a baseline, so the whole comparison runs
+offline:
+
+    python benchmarks/load_service.py --jobs 20 --clients 4
+    python benchmarks/load_service.py --url http://127.0.0.1:8080 --curriculum sample_curriculum.pdf
+"""
+from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+def _latency_ms(samples: List[float]) -> Dict[str, float]:
+    return {
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 1) if samples else 0.0,
+        "p50_ms": round(_percentile(samples, 0.50) * 1000, 1),
+        "p95_ms": round(_percentile(samples, 0.95) * 1000, 1),
+        "p99_ms": round(_percentile(samples, 0.99) * 1000, 1),
+    }
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def _offline_env(base_url: str) -> Dict[str, str]:
+    """Point every OpenAI client at the mock server and keep caches out of the measurement"""
+    return {
+        **os.environ,
+        "OPENAI_API_KEY": "sk-mock",
+        "OPENAI_BASE_URL": base_url,
+        "OPENAI_API_BASE": base_url,
+        "OPENAI_MODEL_NAME": "gpt-4o-mini",
+        "LESSONCRAFT_CHAT_MODEL": "gpt-4o-mini",
+        "LESSONCRAFT_EMBEDDING_BACKEND": "local",
+        "LESSONCRAFT_EMBED_CACHE_MAX_MB": "0",
+        "LESSONCRAFT_LLM_CACHE": "0",
+    }
+
+class LoadGenerator:
+    """Submits jobs from `clients` threads and records per-job latency"""
+
+    def __init__(self, url: str, curricula: List[str], force: bool = True):
+        self.url = url.rstrip("/")
+        self.curricula = curricula
+        self.force = force
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def _submit(self, curriculum: str) -> Dict[str, Any]:
+        body = json.dumps({"curriculum": curriculum, "force": self.force}).encode("utf-8")
+        while True:
+            request = Request(f"{self.url}/jobs", data=body, headers={"Content-Type": "application/json"}, method="POST")
+            try:
+                with urlopen(request, timeout=30) as response:
+                    return json.load(response)
+            except HTTPError as e:
+                if e.code != 503:
+                    raise
+                # Queue full: back off as the service asks and try again
+                with self._lock:
+                    self.rejected += 1
+                time.sleep(float(e.headers.get("Retry-After") or 1))
+
+    def run_job(self, index: int = 0) -> Dict[str, Any]:
+        started = time.perf_counter()
+        job = self._submit(self.curricula[index % len(self.curricula)])
+        first_record = None
+        final = None
+        with urlopen(f"{self.url}/jobs/{job['id']}/events", timeout=3600) as stream:
+            for line in stream:
+                record = json.loads(line)
+                if first_record is None and record["kind"] != "job":
+                    first_record = time.perf_counter() - started
+                if record["kind"] == "job":
+                    final = record["data"]
+        return {
+            "id": job["id"],
+            "status": final["status"] if final else "unknown",
+            "latency_s": time.perf_counter() - started,
+            "first_record_s": first_record,
+            "queue_s": final["queue_s"] if final else None,
+            "run_s": final["run_s"] if final else None,
+            "records": final["records"] if final else 0,
+            "error": final.get("error") if final else "Stream ended without a final status",
+        }
+
+    def run(self, jobs: int, clients: int) -> Dict[str, Any]:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=clients) as pool:
+            outcomes = list(pool.map(self.run_job, range(jobs)))
+        elapsed = time.perf_counter() - started
+        succeeded = [o for o in outcomes if o["status"] == "succeeded"]
+        return {
+            "jobs": jobs,
+            "clients": clients,
+            "succeeded": len(succeeded),
+            "failed": len(outcomes) - len(succeeded),
+            "rejected_submissions": self.rejected,
+            "elapsed_s": round(elapsed, 3),
+            "throughput_jobs_per_s": round(len(succeeded) / elapsed, 3) if elapsed > 0 else 0.0,
+            "latency": _latency_ms([o["latency_s"] for o in succeeded]),
+            "first_record": _latency_ms([o["first_record_s"] for o in succeeded if o["first_record_s"] is not None]),
+            "mean_queue_s": round(sum(o["queue_s"] for o in succeeded) / len(succeeded), 3) if succeeded else None,
+            "mean_run_s": round(sum(o["run_s"] for o in succeeded) / len(succeeded), 3) if succeeded else None,
+            "errors": sorted({o["error"] for o in outcomes if o["error"]})[:5],
+        }
+
+def _wait_for_service(url: str, process: subprocess.Popen, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Service exited with code {process.returncode} before it was ready")
+        try:
+            with urlopen(f"{url}/health", timeout=2):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Service at {url} was not ready after {timeout}s")
+
+def cold_runs(curriculum: str, env: Dict[str, str], workdir: str, runs: int) -> List[float]:
+    """Wall clock of separate `main.py run` processes on one store, ingested by the first"""
+    persist_dir = os.path.join(workdir, "cold_store")
+    seconds = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(
+            [sys.executable, os.path.join(PROJECT_DIR, "main.py"), "run",
+             "--curriculum", curriculum, "--persist-dir", persist_dir, "--force"],
+            cwd=PROJECT_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True
+        )
+        seconds.append(time.perf_counter() - started)
+    return seconds
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Service to load (default: start one against the mock OpenAI server)")
+    parser.add_argument("--curriculum", help="Curriculum the jobs ask for, relative to the service's corpus root (default: synthetic PDFs)")
+    parser.add_argument("--pages", type=int, default=10, help="Pages in each synthetic curriculum")
+    parser.add_argument("--curricula", type=int, help="Synthetic curricula the jobs are spread over (default: --clients)")
+    parser.add_argument("--jobs", type=int, default=20, help="Jobs submitted in total")
+    parser.add_argument("--clients", type=int, default=4, help="Clients submitting jobs at the same time")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent jobs of the started service")
+    parser.add_argument("--queue-size", type=int, default=32, help="Queue size of the started service")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Mock OpenAI server latency per request")
+    parser.add_argument("--cold-runs", type=int, default=2, help="Separate `main.py run` processes timed as a baseline")
+    parser.add_argument("--resume", action="store_true", help="Let jobs reuse checkpoints instead of forcing a full run")
+    parser.add_argument("--output", help="Also write the report to this JSON file")
+    args = parser.parse_args(argv)
+
+    report: Dict[str, Any] = {"settings": {k: v for k, v in vars(args).items() if k != "output"}}
+    with tempfile.TemporaryDirectory(prefix="lessoncraft-load-") as workdir:
+        if args.curriculum is not None:
+            # The started service uses its default corpus root, ./data
+            corpus_root = os.path.join(PROJECT_DIR, "data")
+            curricula = [args.curriculum]
+        else:
+            from synthetic_pdf import write_synthetic_pdf
+            corpus_root = os.path.join(workdir, "corpus")
+            os.makedirs(corpus_root)
+            curricula = [
+                os.path.basename(write_synthetic_pdf(os.path.join(corpus_root, f"curriculum-{seed}.pdf"), args.pages, seed=seed))
+                for seed in range(max(1, args.curricula or args.clients))
+            ]
+        curriculum = os.path.join(corpus_root, curricula[0])
+
+        server = None
+        process: Optional[subprocess.Popen] = None
+        log = None
+        url = args.url
+        try:
+            if url is None:
+                from mock_openai_server import MockOpenAIServer
+                server = MockOpenAIServer(latency=args.latency_ms / 1000)
+                env = _offline_env(server.start())
+                url = f"http://127.0.0.1:{_free_port()}"
+                log = open(os.path.join(workdir, "service.log"), "w", encoding="utf-8")
+                process = subprocess.Popen(
+                    [sys.executable, os.path.join(PROJECT_DIR, "main.py"), "serve",
+                     "--port", url.rsplit(":", 1)[1], "--workdir", os.path.join(workdir, "service"), "--corpus-root", corpus_root,
+                     "--concurrency", str(args.concurrency), "--queue-size", str(args.queue_size)],
+                    cwd=PROJECT_DIR, env=env, stdout=log, stderr=subprocess.STDOUT
+                )
+                started = time.perf_counter()
+                _wait_for_service(url, process, timeout=120)
+                report["service_startup_s"] = round(time.perf_counter() - started, 3)
+
+                if args.cold_runs:
+                    seconds = cold_runs(curriculum, env, workdir, args.cold_runs)
+                    report["cold_process"] = {"runs": len(seconds), **_latency_ms(seconds)}
+                    print(f"cold process per job : {report['cold_process']['mean_ms']:.0f}ms mean over {len(seconds)} run(s)")
+
+            generator = LoadGenerator(url, curricula, force=not args.resume)
+            # One job first so the reported numbers measure the warm service
+            report["first_job"] = generator.run_job()
+            report["load"] = generator.run(args.jobs, args.clients)
+            with urlopen(f"{url}/health", timeout=10) as response:
+                report["service"] = json.load(response)
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait(timeout=30)
+            if log is not None:
+                log.close()
+            if server is not None:
+                server.stop()
+
+    load = report["load"]
+    print(f"first job            : {report['first_job']['latency_s'] * 1000:.0f}ms ({report['first_job']['status']})")
+    print(
+        f"warm service         : {load['succeeded']}/{load['jobs']} succeeded with {load['clients']} clients in "
+        f"{load['elapsed_s']}s, {load['throughput_jobs_per_s']} jobs/s, {load['rejected_submissions']} rejected submissions"
+    )
+    print(
+        f"job latency          : mean {load['latency']['mean_ms']:.0f}ms, p50 {load['latency']['p50_ms']:.0f}ms, "
+        f"p95 {load['latency']['p95_ms']:.0f}ms, p99 {load['latency']['p99_ms']:.0f}ms "
+        f"(queued {load['mean_queue_s']}s, running {load['mean_run_s']}s on average)"
+    )
+    print(f"first streamed record: p50 {load['first_record']['p50_ms']:.0f}ms, p99 {load['first_record']['p99_ms']:.0f}ms")
+    for error in load["errors"]:
+        print(f"  error: {error}")
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0 if load["failed"] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
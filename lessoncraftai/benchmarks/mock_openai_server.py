@@ -0,0 +1,255 @@
+"""Local OpenAI-compatible server with enforced rate limits, for exercising the request scheduler offline
+
+Serves /v1/embeddings and /v1/chat/completions with deterministic answers and
+returns 429s with Retry-After headers once a model's requests/min or tokens/min
+budget is spent; like OpenAI, every model has its own budget. Point the OpenAI
+clients at it to run a whole crew offline:
+
+    python benchmarks/mock_openai_server.py --port 8099 --rpm 120 --tpm 60000
+    OPENAI_BASE_URL=http://127.0.0.1:8099/v1 OPENAI_API_BASE=http://127.0.0.1:8099/v1 python main.py run
+"""
+from typing import Any, Dict, Optional, Tuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import base64
+import json
+import math
+import os
+import struct
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fakes import agent_reply, chat_reply
+from lessoncraftai.utils.embeddings import LocalHashEmbeddings
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+class _Limits:
+    """The server's own token buckets, refilled continuously and holding `burst_seconds` of each limit"""
+
+    def __init__(self, rpm: float, tpm: float, burst_seconds: float):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.burst_seconds = burst_seconds
+        self.requests = rpm * burst_seconds / 60
+        self.tokens = tpm * burst_seconds / 60
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self, tokens: int) -> Tuple[bool, float]:
+        """Whether a request of `tokens` tokens may run now, and otherwise how long until it could"""
+        with self.lock:
+            now = time.monotonic()
+            elapsed = now - self.updated
+            self.updated = now
+            if self.rpm:
+                self.requests = min(self.rpm * self.burst_seconds / 60, self.requests + elapsed * self.rpm / 60)
+            if self.tpm:
+                self.tokens = min(self.tpm * self.burst_seconds / 60, self.tokens + elapsed * self.tpm / 60)
+            # A request larger than the burst is let through once the bucket is full, then paid back
+            needed = min(tokens, self.tpm * self.burst_seconds / 60)
+            waits = []
+            if self.rpm and self.requests < 1:
+                waits.append((1 - self.requests) * 60 / self.rpm)
+            if self.tpm and self.tokens < needed:
+                waits.append((needed - self.tokens) * 60 / self.tpm)
+            if waits:
+                return False, max(waits)
+            if self.rpm:
+                self.requests -= 1
+            if self.tpm:
+                self.tokens -= tokens
+            return True, 0.0
+
+class MockOpenAIServer:
+    """Threaded HTTP server answering like the OpenAI API; start() returns the base URL"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        rpm: float = 0,
+        tpm: float = 0,
+        latency: float = 0.0,
+        burst_seconds: float = 1.0,
+        dimensions: int = 256
+    ):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.burst_seconds = burst_seconds
+        self._limits: Dict[str, _Limits] = {}
+        self.latency = latency
+        self.embedder = LocalHashEmbeddings(dimensions)
+        self.stats = {"requests": 0, "throttled": 0, "embedding_inputs": 0, "chat_completions": 0}
+        self._stats_lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="mock-openai", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def limits(self, model: str) -> _Limits:
+        with self._stats_lock:
+            if model not in self._limits:
+                self._limits[model] = _Limits(self.rpm, self.tpm, self.burst_seconds)
+            return self._limits[model]
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[name] += amount
+
+    def _embeddings(self, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        inputs = body.get("input")
+        if isinstance(inputs, str) or (isinstance(inputs, list) and inputs and isinstance(inputs[0], int)):
+            inputs = [inputs]
+        texts = [item if isinstance(item, str) else " ".join(map(str, item)) for item in inputs or []]
+        tokens = sum(_estimate_tokens(text) for text in texts)
+        data = []
+        for index, text in enumerate(texts):
+            vector = self.embedder.embed_query(text)
+            if body.get("encoding_format") == "base64":
+                vector = base64.b64encode(struct.pack(f"<{len(vector)}f", *vector)).decode("ascii")
+            data.append({"object": "embedding", "index": index, "embedding": vector})
+        self._count("embedding_inputs", len(texts))
+        return tokens, {
+            "object": "list",
+            "data": data,
+            "model": body.get("model", "mock-embedding"),
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        }
+
+    def _chat(self, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        messages = body.get("messages") or []
+        for message in messages:
+            # Content may be a list of parts
+            if isinstance(message.get("content"), list):
+                message["content"] = " ".join(str(part.get("text", "")) for part in message["content"] if isinstance(part, dict))
+        transcript = "\n".join(str(m.get("content") or "") for m in messages)
+        message: Dict[str, Any] = {"role": "assistant"}
+        finish_reason = "stop"
+        tools = body.get("tools") or []
+        if tools:
+            # Native function calling: call the first tool once, then answer with its result
+            results = [m for m in messages if m.get("role") == "tool"]
+            if results:
+                message["content"] = str(results[-1].get("content") or "Done")
+            else:
+                message["content"] = None
+                message["tool_calls"] = [{
+                    "id": f"call_mock_{time.time_ns()}",
+                    "type": "function",
+                    "function": {"name": tools[0]["function"]["name"], "arguments": "{}"},
+                }]
+                finish_reason = "tool_calls"
+        elif "Tool Name:" in transcript or any(m.get("role") == "assistant" for m in messages):
+            message["content"] = agent_reply(messages)
+        else:
+            message["content"] = chat_reply(transcript)
+        prompt_tokens = _estimate_tokens(transcript)
+        completion_tokens = _estimate_tokens(json.dumps(message))
+        self._count("chat_completions")
+        return prompt_tokens + completion_tokens, {
+            "id": f"chatcmpl-mock-{time.time_ns()}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "mock-chat"),
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens},
+        }
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path.rstrip("/") == "/v1/mock/stats":
+                    with server._stats_lock:
+                        return self._send(200, dict(server.stats))
+                self._send(404, {"error": {"message": f"Unknown path {self.path}", "type": "invalid_request_error"}})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    return self._send(400, {"error": {"message": "Invalid JSON body", "type": "invalid_request_error"}})
+                path = self.path.rstrip("/")
+                if body.get("stream"):
+                    return self._send(400, {"error": {"message": "Streaming is not supported by the mock server", "type": "invalid_request_error"}})
+                if path.endswith("/embeddings"):
+                    handler = server._embeddings
+                elif path.endswith("/chat/completions"):
+                    handler = server._chat
+                else:
+                    return self._send(404, {"error": {"message": f"Unknown path {self.path}", "type": "invalid_request_error"}})
+
+                server._count("requests")
+                tokens, payload = handler(body)
+                allowed, wait = server.limits(str(body.get("model"))).take(tokens)
+                if not allowed:
+                    server._count("throttled")
+                    return self._send(429, {
+                        "error": {
+                            "message": f"Rate limit reached for {body.get('model')}. Please try again in {wait:.3f}s.",
+                            "type": "requests",
+                            "code": "rate_limit_exceeded",
+                        }
+                    }, {"retry-after": str(math.ceil(wait)), "retry-after-ms": str(math.ceil(wait * 1000))})
+                time.sleep(server.latency)
+                self._send(200, payload)
+
+        return Handler
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--rpm", type=float, default=0, help="Requests per minute before 429s (0 = unlimited)")
+    parser.add_argument("--tpm", type=float, default=0, help="Tokens per minute before 429s (0 = unlimited)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Delay added to every successful response")
+    parser.add_argument("--burst-seconds", type=float, default=1.0, help="Seconds of each limit that may be used at once")
+    args = parser.parse_args(argv)
+
+    server = MockOpenAIServer(args.host, args.port, args.rpm, args.tpm, args.latency_ms / 1000, args.burst_seconds)
+    print(f"Mock OpenAI server listening on {server.start()}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,424 @@
+"""Offline performance benchmarks for ingestion, retrieval, the generator tools and full crew runs
+
+Every external service is replaced by a fake with configurable latency, so results
+depend only on this code and the machine. Run from the lessoncraftai directory:
+
+    python benchmarks/run_benchmarks.py --quick
+    python benchmarks/run_benchmarks.py --compare old.json new.json
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+# Make the project modules importable when run as a script
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_RESULTS_DIR = os.path.join(PROJECT_DIR, "benchmarks", "results")
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+@contextlib.contextmanager
+def _quiet(verbose: bool):
+    """Hide the tools' progress output unless --verbose is set"""
+    if verbose:
+        yield
+        return
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+def _timed(fn: Callable[[], Any]):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+def _latency_stats(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "mean_ms": round(statistics.mean(ordered) * 1000, 3),
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+    }
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+def install_fakes(args) -> Dict[str, Any]:
+    """Route embeddings, chat and agent LLM calls to offline fakes"""
+    from fakes import FakeAgentLLM, FakeChatModel, SlowEmbeddings
+    from lessoncraftai.utils.embeddings import BatchedEmbeddings
+    from lessoncraftai.utils.registry import use_backends
+
+    # Caches would turn repeated runs into no-ops, so keep them out of the measurement
+    os.environ["LESSONCRAFT_LLM_CACHE"] = "0"
+    os.environ["LESSONCRAFT_VECTOR_BACKEND"] = args.vector_backend
+    os.environ.setdefault("OPENAI_API_KEY", "sk-offline-benchmark")
+
+    backend = SlowEmbeddings(
+        request_latency=args.embed_latency_ms / 1000,
+        per_text_latency=args.embed_per_text_ms / 1000
+    )
+    fakes = {
+        "embeddings": backend,
+        "chat": FakeChatModel(latency=args.chat_latency_ms / 1000),
+        "agent_llm": FakeAgentLLM(model="fake-agent", latency=args.agent_latency_ms / 1000),
+    }
+    use_backends(
+        embeddings=BatchedEmbeddings(
+            backend=backend,
+            model=backend.model,
+            cache=None,
+            batch_size=args.embed_batch_size,
+            max_concurrency=args.embed_concurrency
+        ),
+        chat_model=fakes["chat"],
+        agent_llm=fakes["agent_llm"]
+    )
+    return fakes
+
+def bench_ingest(args, workdir: str) -> List[Dict[str, Any]]:
+    """VectorizePDFTool throughput for each PDF size, eager and streaming"""
+    from synthetic_pdf import write_synthetic_pdf
+    from lessoncraftai.tools.vectorize_pdf import VectorizePDFTool
+    from lessoncraftai.utils.manifest import load_manifest
+
+    results = []
+    for pages in args.pages:
+        pdf_path = write_synthetic_pdf(os.path.join(workdir, f"curriculum_{pages}.pdf"), pages)
+        for streaming in (False, True):
+            mode = "streaming" if streaming else "eager"
+            persist_dir = os.path.join(workdir, f"store_{pages}_{mode}")
+            tool = VectorizePDFTool(
+                pdf_path=pdf_path,
+                persist_dir=persist_dir,
+                streaming=streaming,
+                extract_workers=args.extract_workers
+            )
+            with _quiet(args.verbose):
+                seconds, message = _timed(lambda: tool._run({}))
+            manifest = load_manifest(persist_dir)
+            if manifest is None:
+                raise RuntimeError(f"Ingestion of {pages} pages failed: {message}")
+            results.append({
+                "benchmark": "ingest",
+                "case": f"{mode}/{pages}_pages",
+                "metrics": {
+                    "seconds": round(seconds, 4),
+                    "pages_per_sec": round(pages / seconds, 2),
+                    "chunks_per_sec": round(manifest.chunk_count / seconds, 2),
+                    "chunks": manifest.chunk_count,
+                }
+            })
+            print(f"ingest {mode:<9} {pages:>5} pages: {seconds:.2f}s, {manifest.chunk_count} chunks")
+    return results
+
+def bench_retrieval(args, workdir: str) -> List[Dict[str, Any]]:
+    """Similarity search latency and AnalyzeTopicsTool wall clock on the largest eager store"""
+    from lessoncraftai.tools.analyze_topics import TOPIC_PROMPT, AnalyzeTopicsTool
+    from lessoncraftai.utils.registry import get_vector_store
+
+    pages = max(args.pages)
+    persist_dir = os.path.join(workdir, f"store_{pages}_eager")
+    vectordb = get_vector_store(persist_dir)
+
+    samples = []
+    for _ in range(args.queries):
+        seconds, _ = _timed(lambda: vectordb.similarity_search(TOPIC_PROMPT, k=10))
+        samples.append(seconds)
+    results = [{
+        "benchmark": "retrieval",
+        "case": f"similarity_search_k10/{pages}_pages",
+        "metrics": {**_latency_stats(samples), "queries": len(samples)}
+    }]
+    print(f"retrieval k=10 on {pages} pages: p50 {results[0]['metrics']['p50_ms']}ms")
+
+    if hasattr(vectordb, "search_batch"):
+        queries = [f"{TOPIC_PROMPT} {i}" for i in range(args.queries)]
+        seconds, _ = _timed(lambda: vectordb.search_batch(queries, k=10))
+        results.append({
+            "benchmark": "retrieval",
+            "case": f"search_batch_k10/{pages}_pages",
+            "metrics": {"seconds": round(seconds, 4), "queries_per_sec": round(len(queries) / seconds, 2)}
+        })
+        print(f"retrieval batch of {len(queries)} on {pages} pages: {seconds * 1000:.1f}ms")
+
+    for mode in ("stuff", "map_reduce"):
+        tool = AnalyzeTopicsTool(persist_dir=persist_dir, mode=mode)
+        with _quiet(args.verbose):
+            seconds, message = _timed(lambda: tool._run({}))
+        if message.startswith("Error"):
+            raise RuntimeError(f"AnalyzeTopics ({mode}) failed: {message}")
+        results.append({
+            "benchmark": "analyze_topics",
+            "case": f"{mode}/{pages}_pages",
+            "metrics": {"seconds": round(seconds, 4)}
+        })
+        print(f"analyze_topics {mode:<10} on {pages} pages: {seconds:.2f}s")
+    return results
+
+def bench_generators(args) -> List[Dict[str, Any]]:
+    """The three generator tools at each topic count"""
+    from lessoncraftai.tools.design_assessments import DesignAssessmentsTool
+    from lessoncraftai.tools.enhance_lessons import EnhanceLessonsTool
+    from lessoncraftai.tools.plan_lessons import PlanLessonsTool
+    from lessoncraftai.utils.artifacts import TOPICS, ArtifactStore
+
+    results = []
+    for count in args.topics:
+        artifacts = ArtifactStore()
+        artifacts.put(TOPICS, [
+            {"topic": f"Topic {i}", "objectives": [f"Objective {i}.1", f"Objective {i}.2"]}
+            for i in range(count)
+        ])
+        for tool in (
+            PlanLessonsTool(artifacts=artifacts),
+            DesignAssessmentsTool(artifacts=artifacts),
+            EnhanceLessonsTool(artifacts=artifacts),
+        ):
+            with _quiet(args.verbose):
+                seconds, _ = _timed(lambda: tool._run({}))
+            results.append({
+                "benchmark": "generator",
+                "case": f"{tool.name}/{count}_topics",
+                "metrics": {"seconds": round(seconds, 4), "topics_per_sec": round(count / seconds, 2)}
+            })
+            print(f"{tool.name:<18} {count:>5} topics: {seconds:.3f}s")
+    return results
+
+def bench_crew(args, workdir: str) -> List[Dict[str, Any]]:
+    """End-to-end wall clock through the scheduler and through crew.kickoff()
+
+    An untimed warm-up run first pays the one-time import and client set-up
+    costs, then the runners alternate and each reports the median of
+    `--crew-repeats` runs.
+    """
+    from lessoncraftai.crew import LessonCraftCrew
+    from synthetic_pdf import write_synthetic_pdf
+    from lessoncraftai.utils.artifacts import LESSON_PLANS
+
+    pages = max(args.pages)
+    pdf_path = write_synthetic_pdf(os.path.join(workdir, f"crew_{pages}.pdf"), pages)
+
+    def run_once(runner: str, store: str) -> Tuple[float, int]:
+        # A fresh store per run so every run includes ingestion
+        lesson_crew = LessonCraftCrew(curriculum_path=pdf_path, persist_dir=os.path.join(workdir, store))
+        with _quiet(args.verbose):
+            lesson_crew.build()
+            run = lesson_crew.run if runner == "scheduler" else lesson_crew.crew.kickoff
+            seconds, _ = _timed(run)
+        lesson_plans = lesson_crew.artifacts.get(LESSON_PLANS)
+        if not lesson_plans:
+            raise RuntimeError(f"Crew run via {runner} produced no lesson plans")
+        return seconds, len(lesson_plans)
+
+    run_once("scheduler", "crew_store_warmup")
+    runners = ("scheduler", "kickoff")
+    samples: Dict[str, List[float]] = {runner: [] for runner in runners}
+    lesson_plans = {}
+    for repeat in range(max(1, args.crew_repeats)):
+        for runner in runners if repeat % 2 == 0 else runners[::-1]:
+            seconds, lesson_plans[runner] = run_once(runner, f"crew_store_{runner}_{repeat}")
+            samples[runner].append(seconds)
+
+    results = []
+    for runner in runners:
+        seconds = statistics.median(samples[runner])
+        results.append({
+            "benchmark": "crew",
+            "case": f"{runner}/{pages}_pages",
+            "metrics": {
+                "seconds": round(seconds, 4),
+                "runs": [round(run, 4) for run in samples[runner]],
+                "lesson_plans": lesson_plans[runner],
+            }
+        })
+        print(f"crew via {runner:<9} on {pages} pages: {seconds:.2f}s median of {len(samples[runner])}")
+    return results
+
+def bench_rate_limits(args) -> List[Dict[str, Any]]:
+    """Parallel embedding and chat calls against the rate-limited mock OpenAI server
+
+    Compares the OpenAI clients' own retries with the request scheduler, both
+    without configured limits (adaptive concurrency and Retry-After only) and
+    with token buckets matching the server.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+    from mock_openai_server import MockOpenAIServer
+    from lessoncraftai.utils.rate_limit import RequestScheduler
+
+    rpm, tpm = args.rate_limit_rpm, args.rate_limit_tpm
+    texts = [f"Unit {i}: Fractions and decimals on the number line" for i in range(16)]
+    cases = {
+        "client_retries": None,
+        "adaptive": {},
+        "token_bucket": {"*": {"rpm": rpm, "tpm": tpm}},
+    }
+    results = []
+    for case, limits in cases.items():
+        server = MockOpenAIServer(rpm=rpm, tpm=tpm, latency=args.chat_latency_ms / 1000 / 10)
+        base_url = server.start()
+        retries = {"max_retries": 2} if limits is None else {"max_retries": 0}
+        embeddings = OpenAIEmbeddings(
+            model="text-embedding-3-small", base_url=base_url, api_key="sk-mock",
+            check_embedding_ctx_length=False, **retries
+        )
+        chat = ChatOpenAI(model="gpt-4o-mini", base_url=base_url, api_key="sk-mock", **retries)
+        scheduler = RequestScheduler(limits=limits, max_concurrency=args.rate_limit_workers) if limits is not None else None
+
+        def request(index):
+            if index % 2:
+                fn, model, tokens = (lambda: chat.invoke("Unit 1: Fractions")), "gpt-4o-mini", 600
+            else:
+                fn, model, tokens = (lambda: embeddings.embed_documents(texts)), "text-embedding-3-small", 16 * 12
+            try:
+                if scheduler is None:
+                    fn()
+                else:
+                    scheduler.call(model, fn, tokens)
+                return True
+            except Exception:
+                return False
+
+        total = args.rate_limit_workers * args.rate_limit_requests
+        with _quiet(args.verbose):
+            with ThreadPoolExecutor(max_workers=args.rate_limit_workers) as pool:
+                seconds, outcomes = _timed(lambda: list(pool.map(request, range(total))))
+        server.stop()
+
+        metrics = {
+            "seconds": round(seconds, 4),
+            "requests": total,
+            "failed": outcomes.count(False),
+            "server_429s": server.stats["throttled"],
+        }
+        if scheduler is not None:
+            rows = scheduler.metrics().values()
+            metrics["mean_wait_ms"] = round(sum(r["wait_seconds"] for r in rows) / max(1, sum(r["requests"] for r in rows)) * 1000, 3)
+            metrics["max_queued"] = max(r["max_queued"] for r in rows)
+        results.append({"benchmark": "rate_limits", "case": case, "metrics": metrics})
+        print(f"rate limits via {case:<14}: {seconds:.2f}s, {metrics['failed']} failed, {metrics['server_429s']} server 429s")
+    return results
+
+def run_all(args) -> Dict[str, Any]:
+    fakes = install_fakes(args)
+    results = []
+    with tempfile.TemporaryDirectory(prefix="lessoncraft-bench-") as workdir:
+        results += bench_ingest(args, workdir)
+        results += bench_retrieval(args, workdir)
+        results += bench_generators(args)
+        if not args.skip_crew:
+            results += bench_crew(args, workdir)
+        if not args.skip_rate_limits:
+            results += bench_rate_limits(args)
+
+        from lessoncraftai.utils.registry import close_all
+        with _quiet(args.verbose):
+            close_all()
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "settings": {
+                key: value for key, value in vars(args).items()
+                if key not in ("output", "compare", "verbose")
+            },
+            "fake_calls": {
+                "embedding_requests": fakes["embeddings"].requests,
+                "chat_calls": fakes["chat"].calls,
+            },
+        },
+        "results": results,
+    }
+
+def compare(old_path: str, new_path: str) -> int:
+    """Print the relative change of every metric the two result files share"""
+    with open(old_path, "r", encoding="utf-8") as f:
+        old = json.load(f)
+    with open(new_path, "r", encoding="utf-8") as f:
+        new = json.load(f)
+
+    old_metrics = {(r["benchmark"], r["case"]): r["metrics"] for r in old["results"]}
+    print(f"{old['meta'].get('commit')} -> {new['meta'].get('commit')}")
+    for record in new["results"]:
+        before = old_metrics.get((record["benchmark"], record["case"]))
+        if before is None:
+            continue
+        for name, value in record["metrics"].items():
+            if name not in before or not before[name] or not isinstance(value, (int, float)):
+                continue
+            change = (value - before[name]) / before[name] * 100
+            print(f"  {record['benchmark']:<15} {record['case']:<32} {name:<15} {before[name]:>10} -> {value:>10} ({change:+.1f}%)")
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=_int_list, default=[10, 50, 200], help="Synthetic PDF sizes in pages")
+    parser.add_argument("--topics", type=_int_list, default=[10, 100, 1000], help="Topic counts for the generator tools")
+    parser.add_argument("--queries", type=int, default=50, help="Similarity searches timed for retrieval latency")
+    parser.add_argument("--embed-latency-ms", type=float, default=50, help="Fake embedding latency per request")
+    parser.add_argument("--embed-per-text-ms", type=float, default=0.2, help="Fake embedding latency per text")
+    parser.add_argument("--embed-batch-size", type=int, default=64)
+    parser.add_argument("--embed-concurrency", type=int, default=4)
+    parser.add_argument("--chat-latency-ms", type=float, default=500, help="Fake chat model latency per call")
+    parser.add_argument("--agent-latency-ms", type=float, default=200, help="Fake agent LLM latency per call")
+    parser.add_argument("--vector-backend", choices=["chroma", "numpy"], default="chroma", help="Vector store implementation to measure")
+    parser.add_argument("--extract-workers", type=int, default=1, help="Page extraction processes (0 uses every core)")
+    parser.add_argument("--skip-crew", action="store_true", help="Skip the end-to-end crew runs")
+    parser.add_argument("--crew-repeats", type=int, default=3, help="Timed crew runs per runner, after one untimed warm-up run")
+    parser.add_argument("--rate-limit-rpm", type=float, default=600, help="Requests per minute enforced by the mock OpenAI server")
+    parser.add_argument("--rate-limit-tpm", type=float, default=200000, help="Tokens per minute enforced by the mock OpenAI server")
+    parser.add_argument("--rate-limit-workers", type=int, default=8, help="Threads calling the mock server at once")
+    parser.add_argument("--rate-limit-requests", type=int, default=10, help="Calls per thread in the rate limit benchmark")
+    parser.add_argument("--skip-rate-limits", action="store_true", help="Skip the mock OpenAI server benchmark")
+    parser.add_argument("--quick", action="store_true", help="Small sizes and no latency, for a smoke test")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<commit>-<time>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare two results files and exit")
+    parser.add_argument("--verbose", action="store_true", help="Show the tools' own output")
+    return parser
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.compare:
+        return compare(*args.compare)
+    if args.quick:
+        args.pages, args.topics, args.queries = [5, 20], [10, 100], 10
+        args.embed_latency_ms = args.embed_per_text_ms = args.chat_latency_ms = args.agent_latency_ms = 0
+        args.rate_limit_rpm, args.rate_limit_workers, args.rate_limit_requests = 300, 4, 6
+
+    report = run_all(args)
+
+    output = args.output
+    if not output:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        output = os.path.join(DEFAULT_RESULTS_DIR, f"{report['meta']['commit'] or 'nogit'}-{stamp}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(report['results'])} results to {output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
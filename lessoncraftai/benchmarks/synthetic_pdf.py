@@ -0,0 +1,66 @@
+from typing import List
+import random
+
+# Vocabulary for filler sentences; subjects double as the unit headings the fake chat model finds
+SUBJECTS = [
+    "Fractions", "Photosynthesis", "Cell Division", "Plate Tectonics", "Linear Equations",
+    "The Water Cycle", "Ancient Rome", "Electric Circuits", "Poetry Analysis", "Probability",
+    "Ecosystems", "World War One", "Chemical Bonds", "Geometry Proofs", "Climate Zones"
+]
+WORDS = (
+    "students will explain describe compare identify analyze evaluate model investigate the a of "
+    "energy system process structure function evidence data pattern change cause effect rate "
+    "measure observe record predict argue claim reasoning vocabulary example practice review"
+).split()
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def page_lines(page_number: int, lines_per_page: int = 45, seed: int = 0) -> List[str]:
+    """Deterministic text for one page, with a unit heading every third page"""
+    rng = random.Random(seed * 100003 + page_number)
+    lines = []
+    if page_number % 3 == 0:
+        unit = page_number // 3 + 1
+        lines.append(f"Unit {unit}: {SUBJECTS[(unit - 1) % len(SUBJECTS)]}")
+        lines.append("Learning objectives:")
+    while len(lines) < lines_per_page:
+        lines.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 14))).capitalize() + ".")
+    return lines
+
+def build_pdf(pages: List[List[str]]) -> bytes:
+    """A minimal, valid PDF with one Helvetica text stream per page"""
+    # Object 1 is the catalog, 2 the page tree, 3 the font; each page then adds a page and a content object
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(pages)} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for page_id, lines in zip(page_ids, pages):
+        text = " T* ".join(f"({_escape(line)}) Tj" for line in lines)
+        stream = f"BT /F1 10 Tf 12 TL 50 800 Td {text} ET".encode("latin-1", "replace")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+def write_synthetic_pdf(path: str, page_count: int, lines_per_page: int = 45, seed: int = 0) -> str:
+    """Write a curriculum-like PDF with `page_count` pages to `path`"""
+    pages = [page_lines(n, lines_per_page, seed) for n in range(page_count)]
+    with open(path, "wb") as f:
+        f.write(build_pdf(pages))
+    return path
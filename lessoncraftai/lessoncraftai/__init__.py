@@ -0,0 +1 @@
+"""Create lesson plans, assessments and resources from curriculum PDFs"""
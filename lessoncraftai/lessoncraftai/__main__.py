@@ -0,0 +1,4 @@
+import sys
+from lessoncraftai.main import main
+
+sys.exit(main())
@@ -0,0 +1,31 @@
+from crewai import Agent
+from lessoncraftai.utils.registry import get_agent_llm
+from lessoncraftai.tools.design_assessments import DesignAssessmentsTool
+
+class AssessmentDesignerAgent:
+    def __init__(self, artifacts=None, sink=None, max_parallel: int = 4, batch_size: int = 1, outputs=None):
+        self.artifacts = artifacts
+        self.sink = sink
+        self.outputs = outputs
+        self.max_parallel = max_parallel
+        self.batch_size = batch_size
+        
+    def build(self):
+        # Create the tool
+        design_assessments_tool = DesignAssessmentsTool(
+            artifacts=self.artifacts,
+            sink=self.sink,
+            max_parallel=self.max_parallel,
+            batch_size=self.batch_size,
+            outputs=self.outputs
+        )
+        
+        # Create and return the agent
+        return Agent(
+            role="Assessment Designer",
+            goal="Create effective assessments to measure student learning and progress",
+            backstory="You are an assessment specialist with expertise in creating various forms of assessment that accurately measure student understanding and progress. You design both formative and summative assessments aligned with learning objectives.",
+            verbose=True,
+            llm=get_agent_llm(),
+            tools=[design_assessments_tool]
+        )
\ No newline at end of file
@@ -0,0 +1,31 @@
+from crewai import Agent
+from lessoncraftai.utils.registry import get_agent_llm
+from lessoncraftai.tools.vectorize_pdf import VectorizePDFTool
+
+class CurriculumIngestorAgent:
+    def __init__(self, pdf_path: str, persist_dir: str, streaming: bool = False, extract_workers: int = 0, chunking: str = "recursive"):
+        self.pdf_path = pdf_path
+        self.persist_dir = persist_dir
+        self.streaming = streaming
+        self.extract_workers = extract_workers
+        self.chunking = chunking
+        
+    def build(self):
+        # Create the tool - pass parameters as keyword arguments
+        vectorize_tool = VectorizePDFTool(
+            pdf_path=self.pdf_path,
+            persist_dir=self.persist_dir,
+            streaming=self.streaming,
+            extract_workers=self.extract_workers,
+            chunking=self.chunking
+        )
+        
+        # Create and return the agent
+        return Agent(
+            role="Curriculum Ingestor",
+            goal="Load and index the curriculum PDF or corpus of PDFs",
+            backstory="You ingest educational curriculum documents and convert them into searchable vector embeddings.",
+            verbose=True,
+            llm=get_agent_llm(),
+            tools=[vectorize_tool]
+        )
\ No newline at end of file
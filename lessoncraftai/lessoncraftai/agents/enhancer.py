@@ -0,0 +1,31 @@
+from crewai import Agent
+from lessoncraftai.utils.registry import get_agent_llm
+from lessoncraftai.tools.enhance_lessons import EnhanceLessonsTool
+
+class EnhancerAgent:
+    def __init__(self, artifacts=None, sink=None, max_parallel: int = 4, batch_size: int = 1, outputs=None):
+        self.artifacts = artifacts
+        self.sink = sink
+        self.outputs = outputs
+        self.max_parallel = max_parallel
+        self.batch_size = batch_size
+        
+    def build(self):
+        # Create the tool
+        enhance_lessons_tool = EnhanceLessonsTool(
+            artifacts=self.artifacts,
+            sink=self.sink,
+            max_parallel=self.max_parallel,
+            batch_size=self.batch_size,
+            outputs=self.outputs
+        )
+        
+        # Create and return the agent
+        return Agent(
+            role="Lesson Enhancer",
+            goal="Enrich lesson plans with supplementary resources and activities",
+            backstory="You are an educational resource specialist who excels at finding and recommending high-quality supplementary materials. You have extensive knowledge of educational websites, videos, interactive tools, and hands-on activities that can enhance learning experiences.",
+            verbose=True,
+            llm=get_agent_llm(),
+            tools=[enhance_lessons_tool]
+        )
\ No newline at end of file
@@ -0,0 +1,31 @@
+from crewai import Agent
+from lessoncraftai.utils.registry import get_agent_llm
+from lessoncraftai.tools.plan_lessons import PlanLessonsTool
+
+class LessonPlannerAgent:
+    def __init__(self, artifacts=None, sink=None, max_parallel: int = 4, batch_size: int = 1, outputs=None):
+        self.artifacts = artifacts
+        self.sink = sink
+        self.outputs = outputs
+        self.max_parallel = max_parallel
+        self.batch_size = batch_size
+        
+    def build(self):
+        # Create the tool
+        plan_lessons_tool = PlanLessonsTool(
+            artifacts=self.artifacts,
+            sink=self.sink,
+            max_parallel=self.max_parallel,
+            batch_size=self.batch_size,
+            outputs=self.outputs
+        )
+        
+        # Create and return the agent
+        return Agent(
+            role="Lesson Planner",
+            goal="Create effective and engaging lesson plans based on curriculum topics",
+            backstory="You are an experienced educator with expertise in instructional design. You create comprehensive lesson plans that incorporate best practices in teaching and learning.",
+            verbose=True,
+            llm=get_agent_llm(),
+            tools=[plan_lessons_tool]
+        )
\ No newline at end of file
@@ -0,0 +1,35 @@
+from crewai import Agent
+from lessoncraftai.utils.registry import get_agent_llm
+from lessoncraftai.tools.analyze_topics import AnalyzeTopicsTool
+
+class TopicAnalyzerAgent:
+    def __init__(self, persist_dir: str, mode: str = "stuff", max_parallel: int = 4, artifacts=None, context_token_budget: int = 3000, retrieval: str = "dense", outputs=None):
+        self.persist_dir = persist_dir
+        self.outputs = outputs
+        self.artifacts = artifacts
+        self.mode = mode
+        self.max_parallel = max_parallel
+        self.context_token_budget = context_token_budget
+        self.retrieval = retrieval
+        
+    def build(self):
+        # Create the tool - pass parameters as keyword arguments
+        analyze_tool = AnalyzeTopicsTool(
+            persist_dir=self.persist_dir,
+            mode=self.mode,
+            max_parallel=self.max_parallel,
+            context_token_budget=self.context_token_budget,
+            retrieval=self.retrieval,
+            artifacts=self.artifacts,
+            outputs=self.outputs
+        )
+        
+        # Create and return the agent
+        return Agent(
+            role="Topic Analyzer",
+            goal="Identify structured topics and learning objectives from the curriculum",
+            backstory="You are an expert in academic planning and curriculum design who extracts relevant topics and learning objectives from educational content.",
+            verbose=True,
+            llm=get_agent_llm(),
+            tools=[analyze_tool]
+        )
\ No newline at end of file
@@ -0,0 +1,157 @@
+from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+import json
+import os
+import re
+import signal
+import subprocess
+import sys
+import time
+
+# Directory holding the lessoncraftai package, so job processes import this copy of it
+PACKAGE_PARENT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def load_jobs(path: str) -> List[Dict[str, Any]]:
+    """Read jobs from a JSON list or a JSON-lines file
+
+    Each job needs `pdf_path` and `output_path`; `id` and `settings` are optional.
+    Settings become environment variables for the job, e.g. {"topic_mode": "map_reduce"}
+    sets LESSONCRAFT_TOPIC_MODE.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    stripped = text.lstrip()
+    if stripped.startswith("["):
+        jobs = json.loads(text)
+    else:
+        jobs = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    seen = set()
+    for index, job in enumerate(jobs):
+        if "pdf_path" not in job or "output_path" not in job:
+            raise ValueError(f"Job {index} must define pdf_path and output_path")
+        job_id = str(job.get("id") or os.path.splitext(os.path.basename(job["pdf_path"]))[0] or index)
+        # Job IDs name directories, so keep them filesystem-safe and unique
+        job_id = re.sub(r"[^A-Za-z0-9_.-]+", "-", job_id)
+        if job_id in seen:
+            job_id = f"{job_id}-{index}"
+        seen.add(job_id)
+        job["id"] = job_id
+        job.setdefault("settings", {})
+    return jobs
+
+def _settings_env(settings: Dict[str, Any]) -> Dict[str, str]:
+    env = {}
+    for key, value in settings.items():
+        name = key.upper()
+        if not name.startswith("LESSONCRAFT_") and name != "OPENAI_API_KEY":
+            name = f"LESSONCRAFT_{name}"
+        env[name] = str(value)
+    return env
+
+class BatchRunner:
+    """Runs one crew kickoff per job in its own process, a bounded number at a time"""
+
+    def __init__(self, workdir: str, workers: int = 2, timeout: float = 1800, retries: int = 1):
+        self.workdir = workdir
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.retries = max(0, retries)
+
+    def _attempt(self, job: Dict[str, Any], log_path: str) -> Dict[str, Any]:
+        # Every job gets its own vector store namespace so jobs never share an index
+        persist_dir = os.path.join(self.workdir, "stores", job["id"])
+        command = [
+            sys.executable, "-m", "lessoncraftai", "run",
+            "--curriculum", job["pdf_path"],
+            "--persist-dir", persist_dir,
+            "--output", job["output_path"]
+        ]
+        env = {**os.environ, **_settings_env(job["settings"])}
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [PACKAGE_PARENT, os.environ.get("PYTHONPATH")]))
+        # With the request scheduler on, jobs share one rate limit budget, so they must share its state
+        env.setdefault("LESSONCRAFT_RATE_LIMIT_STATE", os.path.join(self.workdir, "rate_limits.json"))
+
+        with open(log_path, "a", encoding="utf-8") as log:
+            log.write(f"\n=== attempt started {datetime.now(timezone.utc).isoformat()} ===\n")
+            log.flush()
+            # A new session lets a timeout kill the job together with its worker processes
+            process = subprocess.Popen(
+                command, env=env, stdout=log, stderr=subprocess.STDOUT,
+                start_new_session=True
+            )
+            try:
+                returncode = process.wait(timeout=self.timeout)
+            except subprocess.TimeoutExpired:
+                os.killpg(process.pid, signal.SIGKILL)
+                process.wait()
+                return {"status": "timeout", "error": f"Timed out after {self.timeout}s"}
+
+        if returncode != 0:
+            return {"status": "failed", "error": f"Exited with code {returncode}"}
+        return {"status": "succeeded", "error": None}
+
+    def run_job(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        log_path = os.path.join(self.workdir, "logs", f"{job['id']}.log")
+        started = time.perf_counter()
+        attempts = 0
+        outcome = {}
+        while attempts <= self.retries:
+            attempts += 1
+            outcome = self._attempt(job, log_path)
+            if outcome["status"] == "succeeded":
+                break
+            if attempts <= self.retries:
+                # Back off before retrying so transient API errors can clear
+                time.sleep(min(60, 2 ** attempts))
+
+        record = {
+            "id": job["id"],
+            "pdf_path": job["pdf_path"],
+            "output_path": job["output_path"],
+            "status": outcome["status"],
+            "error": outcome["error"],
+            "attempts": attempts,
+            "duration_s": round(time.perf_counter() - started, 3),
+            "log_path": log_path
+        }
+        # Failed jobs still leave a result file describing what went wrong
+        if outcome["status"] != "succeeded":
+            os.makedirs(os.path.dirname(os.path.abspath(job["output_path"])), exist_ok=True)
+            with open(job["output_path"], "w", encoding="utf-8") as f:
+                json.dump(record, f, indent=2)
+        print(f"[{record['status']}] {job['id']} after {attempts} attempt(s) in {record['duration_s']}s")
+        return record
+
+    def run(self, jobs: List[Dict[str, Any]], summary_path: Optional[str] = None) -> Dict[str, Any]:
+        os.makedirs(os.path.join(self.workdir, "logs"), exist_ok=True)
+        os.makedirs(os.path.join(self.workdir, "stores"), exist_ok=True)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            records = list(pool.map(self.run_job, jobs))
+        elapsed = time.perf_counter() - started
+
+        succeeded = sum(1 for r in records if r["status"] == "succeeded")
+        summary = {
+            "jobs": len(records),
+            "succeeded": succeeded,
+            "failed": sum(1 for r in records if r["status"] == "failed"),
+            "timed_out": sum(1 for r in records if r["status"] == "timeout"),
+            "retries": sum(r["attempts"] - 1 for r in records),
+            "workers": self.workers,
+            "elapsed_s": round(elapsed, 3),
+            "jobs_per_minute": round(succeeded / elapsed * 60, 3) if elapsed > 0 else 0.0,
+            "results": records
+        }
+
+        summary_path = summary_path or os.path.join(self.workdir, "summary.json")
+        with open(summary_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        print(
+            f"Batch finished: {succeeded}/{len(records)} succeeded, {summary['failed']} failed, "
+            f"{summary['timed_out']} timed out in {summary['elapsed_s']}s "
+            f"({summary['jobs_per_minute']} jobs/min). Summary: {summary_path}"
+        )
+        return summary
@@ -0,0 +1,264 @@
+from dotenv import load_dotenv
+import os
+
+from lessoncraftai.utils.artifacts import ASSESSMENTS, ENHANCEMENTS, LESSON_PLANS, TOPICS, ArtifactStore
+from lessoncraftai.utils.dag import DAGScheduler, load_task_graph
+
+# Load environment variables
+load_dotenv()
+
+# Define paths - the curriculum may be a single PDF, a directory or a glob of PDFs
+DEFAULT_CURRICULUM_PATH = "./data/sample_curriculum.pdf"
+DEFAULT_PERSIST_DIR = "./data/vectorstore"
+
+def _crew_config_path() -> str:
+    """LESSONCRAFT_CREW_CONFIG, else the crew.yaml shipped beside this module"""
+    return os.getenv("LESSONCRAFT_CREW_CONFIG") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "crew.yaml")
+
+CREW_CONFIG_PATH = _crew_config_path()
+
+# Artifacts each task's tool must store before the task can be checkpointed
+TASK_ARTIFACTS = {
+    "topic_task": [TOPICS],
+    "lesson_task": [LESSON_PLANS],
+    "assessment_task": [ASSESSMENTS],
+    "enhancer_task": [ENHANCEMENTS],
+}
+
+class LessonCraftCrew:
+    """Agents, tasks and scheduler for one curriculum, built on demand
+
+    crewai, langchain and the OpenAI clients are imported only when build()
+    runs, so importing this module stays cheap.
+    """
+
+    def __init__(self, curriculum_path: str = None, persist_dir: str = None, sink=None, force: bool = False):
+        self.curriculum_path = curriculum_path or os.getenv("LESSONCRAFT_CURRICULUM", DEFAULT_CURRICULUM_PATH)
+        self.persist_dir = persist_dir or os.getenv("LESSONCRAFT_PERSIST_DIR", DEFAULT_PERSIST_DIR)
+        self.task_graph = load_task_graph(CREW_CONFIG_PATH)
+        # Structured results shared between tools, so payloads never pass through the LLM
+        self.artifacts = ArtifactStore()
+        # Optional NDJSONSink that receives each generated record and finished task as it happens
+        self.sink = sink
+        # Finished tasks are checkpointed so a rerun resumes at the first missing one; force recomputes all
+        self.force = force
+        self.checkpoints = None
+        # Per-topic outputs of earlier runs, reused for topics a revised curriculum left unchanged
+        self.topic_outputs = None
+        self.change_report = None
+        self.tasks = None
+        self.crew = None
+        self.scheduler = None
+
+    def build(self) -> "LessonCraftCrew":
+        from crewai import Crew, Task, Process
+
+        # Import agents
+        from lessoncraftai.agents.curriculum_ingestor import CurriculumIngestorAgent
+        from lessoncraftai.agents.topic_analyzer import TopicAnalyzerAgent
+        from lessoncraftai.agents.lesson_planner import LessonPlannerAgent
+        from lessoncraftai.agents.assessment_designer import AssessmentDesignerAgent
+        from lessoncraftai.agents.enhancer import EnhancerAgent
+
+        # Check for OpenAI API Key
+        if not os.getenv("OPENAI_API_KEY"):
+            raise ValueError("OPENAI_API_KEY environment variable is not set!")
+
+        # Ensure directories exist
+        os.makedirs("./data", exist_ok=True)
+        os.makedirs(self.persist_dir, exist_ok=True)
+
+        if os.getenv("LESSONCRAFT_INCREMENTAL", "1") != "0":
+            from lessoncraftai.utils.incremental import TopicOutputStore
+            self.topic_outputs = TopicOutputStore(
+                os.getenv("LESSONCRAFT_TOPIC_OUTPUT_DIR", os.path.join(self.persist_dir, "topic_outputs"))
+            )
+
+        # Initialize agents
+        curriculum_ingestor = CurriculumIngestorAgent(
+            pdf_path=self.curriculum_path,
+            persist_dir=self.persist_dir,
+            chunking=os.getenv("LESSONCRAFT_CHUNKING", "recursive")
+        ).build()
+
+        topic_analyzer = TopicAnalyzerAgent(
+            persist_dir=self.persist_dir,
+            mode=os.getenv("LESSONCRAFT_TOPIC_MODE", "stuff"),
+            max_parallel=int(os.getenv("LESSONCRAFT_TOPIC_PARALLELISM", "4")),
+            context_token_budget=int(os.getenv("LESSONCRAFT_CONTEXT_TOKENS", "3000")),
+            retrieval=os.getenv("LESSONCRAFT_RETRIEVAL_MODE", "dense"),
+            artifacts=self.artifacts,
+            outputs=self.topic_outputs
+        ).build()
+
+        # The generator tools work on topics in concurrent batches
+        fan_out = {
+            "max_parallel": int(os.getenv("LESSONCRAFT_GENERATOR_PARALLELISM", "4")),
+            "batch_size": int(os.getenv("LESSONCRAFT_GENERATOR_BATCH_SIZE", "1")),
+            "outputs": self.topic_outputs,
+        }
+        lesson_planner = LessonPlannerAgent(artifacts=self.artifacts, sink=self.sink, **fan_out).build()
+        assessment_designer = AssessmentDesignerAgent(artifacts=self.artifacts, sink=self.sink, **fan_out).build()
+        enhancer = EnhancerAgent(artifacts=self.artifacts, sink=self.sink, **fan_out).build()
+
+        # Define tasks; their dependencies are declared in crew.yaml
+        curriculum_task = Task(
+            description="Load and vectorize the curriculum file for topic analysis.",
+            expected_output="A confirmation that the curriculum has been properly indexed with details about the number of chunks created.",
+            agent=curriculum_ingestor
+        )
+
+        topic_task = Task(
+            description="Analyze the vectorized curriculum to identify key topics and learning objectives. The curriculum has already been vectorized and is stored in the vector database.",
+            expected_output="A summary of the key topics and learning objectives found in the curriculum, which the tool stores as the 'topics' artifact.",
+            agent=topic_analyzer
+        )
+
+        lesson_task = Task(
+            description="Generate a lesson plan for each topic including time blocks and activities. Use the topics and objectives extracted from the curriculum.",
+            expected_output="Structured lesson plans for each topic, stored as the 'lesson_plans' artifact.",
+            agent=lesson_planner
+        )
+
+        assessment_task = Task(
+            description="Generate quiz and assessment questions based on the lesson plan. Create formative and summative assessments aligned with the learning objectives.",
+            expected_output="Assessments for each lesson, stored as the 'assessments' artifact.",
+            agent=assessment_designer
+        )
+
+        enhancer_task = Task(
+            description="Recommend additional resources (videos, articles) per lesson. Find high-quality supplementary materials that enhance the learning experience.",
+            expected_output="List of external links and resources per topic, stored as the 'enhancements' artifact.",
+            agent=enhancer
+        )
+
+        self.tasks = {
+            "curriculum_task": curriculum_task,
+            "topic_task": topic_task,
+            "lesson_task": lesson_task,
+            "assessment_task": assessment_task,
+            "enhancer_task": enhancer_task,
+        }
+
+        # Wire the dependency graph into the tasks and build a scheduler that runs independent tasks in parallel
+        depends_on = self.task_graph["depends_on"]
+        for name, task in self.tasks.items():
+            task.context = [self.tasks[dep] for dep in depends_on.get(name, [])]
+
+        self._prepare_run()
+
+        # Sequential crew kept for `crewai run` and programmatic use; the scheduler is the default runner
+        self.crew = Crew(
+            agents=[curriculum_ingestor, topic_analyzer, lesson_planner, assessment_designer, enhancer],
+            tasks=list(self.tasks.values()),
+            verbose=True,
+            process=Process.sequential  # This ensures tasks run in the order they're listed
+        )
+        return self
+
+    def _prepare_run(self) -> None:
+        """A fresh checkpointer and scheduler; the curriculum files are hashed again for every run"""
+        depends_on = self.task_graph["depends_on"]
+        self.change_report = None
+        if self.topic_outputs is not None:
+            self.topic_outputs.begin_run(force=self.force)
+        self.checkpoints = None
+        if os.getenv("LESSONCRAFT_CHECKPOINTS", "1") != "0":
+            from lessoncraftai.utils.checkpoints import TaskCheckpointer
+            self.checkpoints = TaskCheckpointer(
+                directory=os.getenv("LESSONCRAFT_CHECKPOINT_DIR", os.path.join(self.persist_dir, "checkpoints")),
+                tasks=self.tasks,
+                depends_on=depends_on,
+                inputs=self._run_inputs(),
+                artifacts=self.artifacts,
+                produces=TASK_ARTIFACTS,
+                is_valid=self._checkpoint_valid,
+                force=self.force
+            )
+
+        self.scheduler = DAGScheduler(
+            tasks=self.tasks,
+            depends_on=depends_on,
+            max_concurrency=int(os.getenv("LESSONCRAFT_MAX_CONCURRENT_TASKS", self.task_graph["max_concurrency"])),
+            on_complete=self._task_completed,
+            checkpoints=self.checkpoints
+        )
+
+    def reset(self, sink=None, force: bool = False) -> "LessonCraftCrew":
+        """Make a built crew ready for another run, keeping its agents, tools and clients
+
+        Artifacts from the previous run are dropped and every tool that streams
+        records is pointed at `sink`.
+        """
+        if self.tasks is None:
+            raise RuntimeError("reset() needs a crew that has been built")
+        self.artifacts.clear()
+        self.sink = sink
+        self.force = force
+        for task in self.tasks.values():
+            for tool in task.agent.tools or []:
+                if "sink" in type(tool).model_fields:
+                    tool.sink = sink
+        self._prepare_run()
+        return self
+
+    def _run_inputs(self):
+        """What the run reads besides task and agent settings: the curriculum files and the models behind the tools"""
+        from lessoncraftai.utils.manifest import hash_sources
+        from lessoncraftai.utils.pdf_extract import resolve_pdf_sources
+        return {
+            "sources": hash_sources(resolve_pdf_sources(self.curriculum_path)),
+            "persist_dir": os.path.abspath(self.persist_dir),
+            "chat_model": os.getenv("LESSONCRAFT_CHAT_MODEL"),
+            "embedding_model": os.getenv("LESSONCRAFT_EMBEDDING_MODEL"),
+            "vector_backend": os.getenv("LESSONCRAFT_VECTOR_BACKEND"),
+        }
+
+    def _checkpoint_valid(self, name):
+        # Ingestion's result lives in the vector store, which must still be there to skip it
+        if name == "curriculum_task":
+            from lessoncraftai.utils.manifest import load_manifest
+            return load_manifest(self.persist_dir) is not None
+        return True
+
+    def _task_completed(self, name, output):
+        if self.sink is not None:
+            resumed = self.checkpoints is not None and name in self.checkpoints.resumed
+            self.sink.emit("task", None, {"task": name, "raw": output.raw, "resumed": resumed})
+
+    def run(self):
+        """Run every task through the dependency-aware scheduler"""
+        if self.scheduler is None:
+            self.build()
+        result = self.scheduler.run()
+        if self.topic_outputs is not None:
+            from lessoncraftai.utils.incremental import format_change_report
+            self.change_report = self.topic_outputs.finish(self.artifacts.get(TOPICS) or [])
+            print(format_change_report(self.change_report))
+            if self.sink is not None:
+                self.sink.emit("change_report", None, self.change_report)
+        return result
+
+_default_crew = None
+
+def get_crew() -> LessonCraftCrew:
+    """The default crew, configured from the environment and built on first use"""
+    global _default_crew
+    if _default_crew is None:
+        _default_crew = LessonCraftCrew().build()
+    return _default_crew
+
+def run():
+    return get_crew().run()
+
+def __getattr__(name):
+    # Keep `from crew import crew` working without building anything at import time
+    if name in ("crew", "scheduler", "tasks"):
+        return getattr(get_crew(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Run the crew if this file is executed directly
+if __name__ == "__main__":
+    result = run()
+    print("\n=== RESULT ===")
+    print(result)
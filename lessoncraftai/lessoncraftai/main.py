@@ -0,0 +1,214 @@
+import argparse
+import json
+import os
+import sys
+
+# Heavy dependencies are imported inside the commands that need them
+
+def _cmd_run(args) -> int:
+    from lessoncraftai.crew import LessonCraftCrew
+    lesson_crew = LessonCraftCrew(curriculum_path=args.curriculum, persist_dir=args.persist_dir, force=args.force)
+
+    if args.dry_run:
+        return _print_plan(lesson_crew)
+
+    if args.stream:
+        from lessoncraftai.utils.ndjson import NDJSONSink
+        lesson_crew.sink = NDJSONSink(args.stream)
+    trace_path = args.trace or os.getenv("LESSONCRAFT_TRACE")
+    if trace_path:
+        from lessoncraftai.utils.tracing import enable_tracing
+        enable_tracing()
+    try:
+        result = lesson_crew.run()
+    finally:
+        if lesson_crew.sink is not None:
+            lesson_crew.sink.close()
+        if trace_path:
+            _write_trace(trace_path, args.trace_format)
+    print("\n=== RESULT ===")
+    print(result)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "tasks": {name: output.raw for name, output in result.outputs.items()},
+                "artifacts": lesson_crew.artifacts.snapshot(),
+                "change_report": lesson_crew.change_report
+            }, f, indent=2)
+        print(f"Wrote task outputs and artifacts to {args.output}")
+    return 0
+
+def _write_trace(path: str, fmt: str) -> None:
+    from lessoncraftai.utils.tracing import disable_tracing, format_summary, summarize_spans, write_trace
+    tracer = disable_tracing()
+    write_trace(path, tracer, fmt)
+    print("\n=== TRACE SUMMARY ===")
+    print(format_summary(summarize_spans(tracer.spans())))
+    print(f"Wrote trace to {path}")
+
+def _print_plan(lesson_crew) -> int:
+    """Show what a run would do without importing crewai or calling any API"""
+    from lessoncraftai.utils.dag import topological_order
+    from lessoncraftai.utils.manifest import load_manifest
+    from lessoncraftai.utils.pdf_extract import resolve_pdf_sources
+
+    sources = resolve_pdf_sources(lesson_crew.curriculum_path)
+    manifest = load_manifest(lesson_crew.persist_dir)
+    depends_on = lesson_crew.task_graph["depends_on"]
+
+    print(f"Curriculum: {lesson_crew.curriculum_path} ({len(sources)} PDF file(s))")
+    print(f"Vector store: {lesson_crew.persist_dir}", end="")
+    print(f" ({manifest.chunk_count} chunks, ingested {manifest.ingested_at})" if manifest else " (not indexed)")
+    print(f"Max concurrent tasks: {lesson_crew.task_graph['max_concurrency']}")
+    for name in topological_order(depends_on):
+        deps = ", ".join(depends_on[name]) or "-"
+        print(f"  {name:<18} after: {deps}")
+    return 0 if sources else 1
+
+def _cmd_batch(args) -> int:
+    from lessoncraftai.batch import BatchRunner, load_jobs
+    runner = BatchRunner(
+        workdir=args.workdir,
+        workers=args.workers,
+        timeout=args.timeout,
+        retries=args.retries
+    )
+    summary = runner.run(load_jobs(args.jobs), summary_path=args.summary)
+    return 0 if summary["succeeded"] == summary["jobs"] else 1
+
+def _cmd_serve(args) -> int:
+    import asyncio
+    from lessoncraftai.service import serve
+    try:
+        asyncio.run(serve(
+            host=args.host,
+            port=args.port,
+            workdir=args.workdir,
+            corpus_root=args.corpus_root,
+            concurrency=args.concurrency,
+            queue_size=args.queue_size,
+            warm=args.warm
+        ))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+def _cmd_import_report(args) -> int:
+    from lessoncraftai.utils.startup import format_report, import_report
+    report = import_report(args.modules or None, top=args.top)
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.max_ms is not None:
+        over = [entry["module"] for entry in report if entry["import_ms"] > args.max_ms]
+        if over:
+            print(f"Import time budget of {args.max_ms}ms exceeded by: {', '.join(over)}")
+            return 1
+    return 0
+
+def _cmd_quantization_report(args) -> int:
+    from lessoncraftai.utils.quantization import format_quantization_report, quantization_report
+    from lessoncraftai.utils.registry import get_vector_store
+    if not os.path.isdir(args.persist_dir):
+        print(f"Vector store not found at {args.persist_dir}")
+        return 1
+    ids, vectors = get_vector_store(args.persist_dir).export_vectors()
+    if not ids:
+        print(f"Vector store at {args.persist_dir} is empty")
+        return 1
+    report = quantization_report(vectors, k=args.k, query_count=args.queries, rerank_factors=(0, args.rerank))
+    print(f"{len(ids)} vectors of dimension {vectors.shape[1]} from {args.persist_dir}")
+    print(format_quantization_report(report))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+def _cmd_search(args) -> int:
+    from lessoncraftai.utils.registry import get_vector_store
+    from lessoncraftai.utils.retrieval import search
+    if not os.path.isdir(args.persist_dir):
+        print(f"Vector store not found at {args.persist_dir}")
+        return 1
+    results = search(get_vector_store(args.persist_dir), args.persist_dir, args.query, k=args.k, mode=args.mode)
+    for rank, result in enumerate(results, start=1):
+        metadata = result["metadata"]
+        print(f"{rank:>2}. {result['score']:.4f}  {os.path.basename(str(metadata.get('source', '')))} p.{metadata.get('page', '?')}")
+        print(f"    {' '.join(result['text'].split())[:200]}")
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="lessoncraftai",
+        description="Create lesson plans, assessments and resources from curriculum PDFs."
+    )
+    commands = parser.add_subparsers(dest="command")
+
+    run_parser = commands.add_parser("run", help="Run the crew on a curriculum (default command)")
+    run_parser.add_argument("--curriculum", help="PDF file, directory or glob (default: LESSONCRAFT_CURRICULUM)")
+    run_parser.add_argument("--persist-dir", help="Vector store directory (default: LESSONCRAFT_PERSIST_DIR)")
+    run_parser.add_argument("--output", help="Write task outputs and structured artifacts to this JSON file")
+    run_parser.add_argument("--stream", metavar="PATH", help="Emit each lesson plan, assessment and enhancement as NDJSON to PATH ('-' for stdout, sending all other output to stderr) as soon as it is produced")
+    run_parser.add_argument("--trace", metavar="PATH", help="Record timing and token spans and write them to PATH (default: LESSONCRAFT_TRACE)")
+    run_parser.add_argument("--trace-format", choices=["json", "chrome"], default="json", help="Spans with a summary, or Chrome trace events for chrome://tracing and Perfetto")
+    run_parser.add_argument("--force", action="store_true", help="Recompute every task instead of resuming from checkpoints")
+    run_parser.add_argument("--dry-run", action="store_true", help="Show the resolved inputs and task graph, then exit")
+    run_parser.set_defaults(func=_cmd_run)
+
+    batch_parser = commands.add_parser("batch", help="Run many curricula, each job in its own process")
+    batch_parser.add_argument("jobs", help="JSON or JSON-lines file of {pdf_path, output_path, settings} jobs")
+    batch_parser.add_argument("--workers", type=int, default=2, help="Jobs run at the same time")
+    batch_parser.add_argument("--timeout", type=float, default=1800, help="Seconds before a job attempt is killed")
+    batch_parser.add_argument("--retries", type=int, default=1, help="Extra attempts for a failed or timed out job")
+    batch_parser.add_argument("--workdir", default="./data/batch", help="Per-job vector stores and logs")
+    batch_parser.add_argument("--summary", help="Summary file (default: <workdir>/summary.json)")
+    batch_parser.set_defaults(func=_cmd_batch)
+
+    serve_parser = commands.add_parser("serve", help="Serve lesson-generation jobs over HTTP from warm agents and indexes")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8080)
+    serve_parser.add_argument("--concurrency", type=int, default=2, help="Jobs run at the same time")
+    serve_parser.add_argument("--queue-size", type=int, default=32, help="Jobs that may wait before submissions are rejected with 503")
+    serve_parser.add_argument("--workdir", default="./data/service", help="Per-curriculum vector stores and job record streams")
+    serve_parser.add_argument("--corpus-root", default="./data", help="Directory that clients' curriculum paths are resolved against and confined to")
+    serve_parser.add_argument("--warm", action="append", metavar="CURRICULUM", help="Build a crew and index for this curriculum, relative to --corpus-root, at startup (repeatable)")
+    serve_parser.set_defaults(func=_cmd_serve)
+
+    report_parser = commands.add_parser("import-report", help="Measure module import times to track startup cost")
+    report_parser.add_argument("modules", nargs="*", help="Modules to import (default: the main entry points)")
+    report_parser.add_argument("--top", type=int, default=5, help="Slowest packages listed per module")
+    report_parser.add_argument("--json", help="Also write the report to this JSON file")
+    report_parser.add_argument("--max-ms", type=float, help="Exit non-zero if any module takes longer to import")
+    report_parser.set_defaults(func=_cmd_import_report)
+
+    search_parser = commands.add_parser("search", help="Search an indexed curriculum; lexical mode runs fully offline")
+    search_parser.add_argument("query", help="Free text or exact codes such as CCSS.MATH.5.NF.A.1")
+    search_parser.add_argument("--persist-dir", default="./data/vectorstore", help="Vector store to search")
+    search_parser.add_argument("--mode", choices=["dense", "lexical", "hybrid"], default="hybrid", help="Embeddings, local BM25, or both fused")
+    search_parser.add_argument("-k", type=int, default=5, help="Number of results")
+    search_parser.set_defaults(func=_cmd_search)
+
+    quant_parser = commands.add_parser("quantization-report", help="Recall vs. size of float16/int8 storage for an existing vector store")
+    quant_parser.add_argument("--persist-dir", default="./data/vectorstore", help="Vector store to evaluate (read with LESSONCRAFT_VECTOR_BACKEND)")
+    quant_parser.add_argument("--k", type=int, default=10, help="Results per query when measuring recall")
+    quant_parser.add_argument("--queries", type=int, default=200, help="Sample queries drawn from the stored chunks")
+    quant_parser.add_argument("--rerank", type=int, default=4, help="Candidate multiplier for the re-ranked rows")
+    quant_parser.add_argument("--json", help="Also write the report to this JSON file")
+    quant_parser.set_defaults(func=_cmd_quantization_report)
+    return parser
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    argv = sys.argv[1:] if argv is None else argv
+    commands = next(action.choices for action in parser._actions if isinstance(action, argparse._SubParsersAction))
+    if not argv or (argv[0] not in commands and argv[0] not in ("-h", "--help")):
+        # `python main.py` and `python main.py --curriculum x.pdf` keep running the crew
+        argv = ["run", *argv]
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,446 @@
+from typing import Any, Dict, List, Optional, Set, Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from http import HTTPStatus
+from urllib.parse import urlsplit
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+
+# Largest request body accepted; job submissions are small JSON objects
+MAX_BODY_BYTES = 64 * 1024
+
+# Names clients may give a vector store; each one is a directory under <workdir>/stores
+_STORE_NAME = re.compile(r"[A-Za-z0-9][A-Za-z0-9_.-]{0,63}")
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+class CrewPool:
+    """Built crews kept warm between jobs, keyed by curriculum and vector store
+
+    A crew serves one job at a time: acquire() hands out an idle crew for the
+    key or builds a new one, and release() keeps it for the next job. At most
+    `max_idle` idle crews are kept, dropping the least recently used.
+    """
+
+    def __init__(self, max_idle: int = 8):
+        self.max_idle = max_idle
+        self.built = 0
+        self.reused = 0
+        self._idle: "OrderedDict[Tuple[str, str], List[Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, curriculum: str, persist_dir: str):
+        with self._lock:
+            crews = self._idle.get((curriculum, persist_dir))
+            if crews:
+                crew = crews.pop()
+                if not crews:
+                    del self._idle[(curriculum, persist_dir)]
+                self.reused += 1
+                return crew
+        from lessoncraftai.crew import LessonCraftCrew
+        crew = LessonCraftCrew(curriculum_path=curriculum, persist_dir=persist_dir).build()
+        with self._lock:
+            self.built += 1
+        return crew
+
+    def release(self, crew) -> None:
+        key = (crew.curriculum_path, crew.persist_dir)
+        with self._lock:
+            self._idle.setdefault(key, []).append(crew)
+            self._idle.move_to_end(key)
+            while self.idle_count() > self.max_idle:
+                oldest = next(iter(self._idle))
+                self._idle[oldest].pop(0)
+                if not self._idle[oldest]:
+                    del self._idle[oldest]
+
+    def idle_count(self) -> int:
+        return sum(len(crews) for crews in self._idle.values())
+
+class Job:
+    """One lesson-generation request, its streamed records and its result"""
+
+    def __init__(self, curriculum: str, persist_dir: str, force: bool = False):
+        self.id = uuid.uuid4().hex[:12]
+        self.curriculum = curriculum
+        self.persist_dir = persist_dir
+        self.force = force
+        self.status = "queued"
+        self.error: Optional[str] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.records: List[Dict[str, Any]] = []
+        self.submitted_at = _now()
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        self._submitted = time.perf_counter()
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+        # Replaced on every change, so a waiting stream wakes up exactly once per change
+        self._changed = asyncio.Event()
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def start(self) -> None:
+        self.status = "running"
+        self.started_at = _now()
+        self._started = time.perf_counter()
+        self._notify()
+
+    def publish(self, record: Dict[str, Any]) -> None:
+        self.records.append(record)
+        self._notify()
+
+    def finish(self, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+        self.status = "failed" if error else "succeeded"
+        self.result = result
+        self.error = error
+        self.finished_at = _now()
+        self._finished = time.perf_counter()
+        self._notify()
+
+    def status_dict(self) -> Dict[str, Any]:
+        queued_until = self._started or time.perf_counter()
+        return {
+            "id": self.id,
+            "status": self.status,
+            "curriculum": self.curriculum,
+            "persist_dir": self.persist_dir,
+            "force": self.force,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "queue_s": round(queued_until - self._submitted, 3),
+            "run_s": round((self._finished or time.perf_counter()) - self._started, 3) if self._started else None,
+            "records": len(self.records),
+            "error": self.error,
+        }
+
+class LessonCraftService:
+    """Asyncio HTTP service that runs lesson-generation jobs on warm crews
+
+    Jobs wait in a queue of at most `queue_size` entries and `concurrency` of
+    them run at once, each on a crew from the CrewPool, so agents, tools, vector
+    stores and API clients are built once per process instead of once per job.
+    Jobs on the same vector store run one after another, because they share its
+    checkpoints and topic outputs. Clients name curricula relative to
+    `corpus_root` and cannot reach files outside it.
+
+        POST /jobs                 {"curriculum": "...", "store": "...", "force": false} -> 202, or 503 when full
+        GET  /jobs                 status of every known job
+        GET  /jobs/<id>            status, queue and run time
+        GET  /jobs/<id>/events     NDJSON stream of the job's records, ending with its final status
+        GET  /jobs/<id>/result     task outputs and artifacts of a finished job
+        GET  /health               queue depth, running jobs and crew pool counts
+    """
+
+    def __init__(
+        self,
+        workdir: str = "./data/service",
+        corpus_root: str = "./data",
+        concurrency: int = 2,
+        queue_size: int = 32,
+        max_idle_crews: int = 8,
+        max_jobs: int = 1000
+    ):
+        self.workdir = workdir
+        self.corpus_root = corpus_root
+        self.concurrency = max(1, concurrency)
+        self.queue_size = max(1, queue_size)
+        self.max_jobs = max_jobs
+        self.pool = CrewPool(max_idle=max(max_idle_crews, self.concurrency))
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self.running = 0
+        self.waiting = 0
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="lessoncraft-job")
+        # Jobs on one vector store share its index, checkpoints and topic outputs, so they run one at a time
+        self._store_locks: Dict[str, asyncio.Lock] = {}
+
+    def default_persist_dir(self, curriculum: str) -> str:
+        """One vector store per curriculum path, so repeated requests reuse its index"""
+        digest = hashlib.sha256(os.path.abspath(curriculum).encode("utf-8")).hexdigest()[:16]
+        return self.store_dir(digest)
+
+    def store_dir(self, name: str) -> str:
+        """The vector store directory for a store name; names never leave <workdir>/stores"""
+        if not isinstance(name, str) or not _STORE_NAME.fullmatch(name):
+            raise ValueError(f"Invalid store name {name!r}: use up to 64 letters, digits, '.', '_' or '-', starting with a letter or digit")
+        return os.path.join(self.workdir, "stores", name)
+
+    def curriculum_path(self, name: str) -> str:
+        """The path of a curriculum named relative to the corpus root; absolute paths and '..' are rejected"""
+        if not isinstance(name, str) or not name.strip():
+            raise ValueError("curriculum is required: a PDF file, directory or glob relative to the corpus root")
+        if os.path.isabs(name) or name.startswith(("/", "\\", "~")) or ".." in re.split(r"[\\/]+", name):
+            raise ValueError(f"Invalid curriculum {name!r}: use a path relative to the corpus root, without '..'")
+        return os.path.join(self.corpus_root, name)
+
+    def resolve_curriculum(self, path: str) -> List[str]:
+        """PDF sources of a curriculum path; raises ValueError if any of them lies outside the corpus root"""
+        from lessoncraftai.utils.pdf_extract import resolve_pdf_sources
+        root = os.path.realpath(self.corpus_root)
+        sources = resolve_pdf_sources(path)
+        # A symlink under the root may still point elsewhere
+        for source in sources:
+            if os.path.commonpath([root, os.path.realpath(source)]) != root:
+                raise ValueError(f"Curriculum {os.path.relpath(path, self.corpus_root)!r} reaches outside the corpus root")
+        return sources
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080, warm: Optional[List[str]] = None) -> str:
+        """Import the crew, build crews for the `warm` curricula, then listen; returns the base URL"""
+        os.makedirs(os.path.join(self.workdir, "jobs"), exist_ok=True)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._preload, warm or [])
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._server = await asyncio.start_server(self._handle, host, port)
+        bound_host, bound_port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{bound_host}:{bound_port}"
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _preload(self, warm: List[str]) -> None:
+        import lessoncraftai.crew  # noqa: F401 - pays for the crewai and langchain imports before the first job
+        for name in warm:
+            curriculum = self.curriculum_path(name)
+            if not self.resolve_curriculum(curriculum):
+                raise ValueError(f"Curriculum PDF not found at: {curriculum}")
+            built = self.pool.acquire(curriculum, self.default_persist_dir(curriculum))
+            try:
+                # No job runs before the service listens, so the store needs no lock here
+                self._ensure_index(built)
+            finally:
+                self.pool.release(built)
+            print(f"Warmed crew and index for {name}")
+
+    def submit(self, curriculum: str, store: Optional[str] = None, force: bool = False) -> Job:
+        """Queue a job; raises ValueError for a bad store name and asyncio.QueueFull when the queue is at capacity"""
+        persist_dir = self.store_dir(store) if store is not None else self.default_persist_dir(curriculum)
+        if self.waiting >= self.queue_size:
+            raise asyncio.QueueFull()
+        job = Job(curriculum, persist_dir, force)
+        self.waiting += 1
+        self.jobs[job.id] = job
+        task = asyncio.create_task(self._run(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        self._forget_old_jobs()
+        return job
+
+    def _forget_old_jobs(self) -> None:
+        for job_id in [job_id for job_id, job in self.jobs.items() if job.done][:max(0, len(self.jobs) - self.max_jobs)]:
+            del self.jobs[job_id]
+
+    async def _run(self, job: Job) -> None:
+        loop = asyncio.get_running_loop()
+        # Wait for the store before taking a slot, so a job behind another on the
+        # same store stays queued and leaves the slot to jobs on other stores
+        async with self._store_lock(job.persist_dir):
+            async with self._slots:
+                self.waiting -= 1
+                job.start()
+                self.running += 1
+                try:
+                    result = await loop.run_in_executor(self._executor, self._run_job, job, loop)
+                    job.finish(result=result)
+                except Exception as e:
+                    job.finish(error=f"{type(e).__name__}: {str(e)}")
+                finally:
+                    self.running -= 1
+        print(f"[{job.status}] job {job.id} in {job.status_dict()['run_s']}s")
+
+    def _run_job(self, job: Job, loop: asyncio.AbstractEventLoop) -> Dict[str, Any]:
+        """Run one job on a warm crew; called on an executor thread"""
+        from lessoncraftai.utils.ndjson import NDJSONSink
+        sink = NDJSONSink(os.path.join(self.workdir, "jobs", f"{job.id}.ndjson"))
+        sink.subscribe(lambda record: loop.call_soon_threadsafe(job.publish, record))
+        lesson_crew = self.pool.acquire(job.curriculum, job.persist_dir)
+        try:
+            lesson_crew.reset(sink=sink, force=job.force)
+            self._ensure_index(lesson_crew)
+            result = lesson_crew.run()
+            return {
+                "tasks": {name: output.raw for name, output in result.outputs.items()},
+                "artifacts": lesson_crew.artifacts.snapshot(),
+                "change_report": lesson_crew.change_report,
+            }
+        finally:
+            sink.close()
+            self.pool.release(lesson_crew)
+
+    def _store_lock(self, persist_dir: str) -> asyncio.Lock:
+        return self._store_locks.setdefault(os.path.abspath(persist_dir), asyncio.Lock())
+
+    def _ensure_index(self, lesson_crew) -> None:
+        """Ingest the curriculum outside the crew; no other job may be using the store
+
+        The ingestion task that follows then only confirms the store is up to date.
+        """
+        from lessoncraftai.utils.manifest import load_manifest
+        ingestor = lesson_crew.tasks["curriculum_task"].agent.tools[0]
+        message = ingestor.run()
+        if load_manifest(lesson_crew.persist_dir) is None:
+            raise RuntimeError(message)
+
+    def health(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for job in self.jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "status": "ok",
+            "queued": self.waiting,
+            "running": self.running,
+            "concurrency": self.concurrency,
+            "queue_size": self.queue_size,
+            "jobs": counts,
+            "crews": {"built": self.pool.built, "reused": self.pool.reused, "idle": self.pool.idle_count()},
+        }
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await reader.readline()
+            if not request_line:
+                return
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            length = int(headers.get("content-length") or 0)
+            if length > MAX_BODY_BYTES:
+                return await self._send(writer, 413, {"error": f"Request body is larger than {MAX_BODY_BYTES} bytes"})
+            body = await reader.readexactly(length) if length else b""
+            await self._route(method.upper(), urlsplit(target).path.rstrip("/"), body, writer)
+        except (ValueError, asyncio.IncompleteReadError):
+            await self._send(writer, 400, {"error": "Malformed HTTP request"})
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter) -> None:
+        parts = [part for part in path.split("/") if part]
+        if method == "GET" and parts == ["health"]:
+            return await self._send(writer, 200, self.health())
+        if parts == ["jobs"] and method == "POST":
+            return await self._submit(body, writer)
+        if parts == ["jobs"] and method == "GET":
+            return await self._send(writer, 200, {"jobs": [job.status_dict() for job in self.jobs.values()]})
+        if len(parts) in (2, 3) and parts[0] == "jobs" and method == "GET":
+            job = self.jobs.get(parts[1])
+            if job is None:
+                return await self._send(writer, 404, {"error": f"Unknown job {parts[1]}"})
+            view = parts[2] if len(parts) == 3 else "status"
+            if view == "status":
+                return await self._send(writer, 200, job.status_dict())
+            if view == "events":
+                return await self._stream(job, writer)
+            if view == "result":
+                if job.status != "succeeded":
+                    return await self._send(writer, 409, job.status_dict())
+                return await self._send(writer, 200, {**job.status_dict(), **job.result})
+        await self._send(writer, 404, {"error": f"No route for {method} {path or '/'}"})
+
+    async def _submit(self, body: bytes, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = json.loads(body or b"{}")
+            if not isinstance(request, dict):
+                raise ValueError("expected a JSON object")
+        except ValueError as e:
+            return await self._send(writer, 400, {"error": f"Invalid job request: {str(e)}"})
+        if "persist_dir" in request:
+            return await self._send(writer, 400, {"error": "persist_dir is not accepted; name a vector store with \"store\" instead"})
+        try:
+            curriculum = self.curriculum_path(request.get("curriculum"))
+            # Globs and directories may take a while to expand, so keep them off the event loop
+            sources = await asyncio.get_running_loop().run_in_executor(None, self.resolve_curriculum, curriculum)
+            if not sources:
+                return await self._send(writer, 400, {"error": f"Curriculum PDF not found at: {request['curriculum']}"})
+            job = self.submit(curriculum, request.get("store"), bool(request.get("force", False)))
+        except ValueError as e:
+            return await self._send(writer, 400, {"error": str(e)})
+        except asyncio.QueueFull:
+            return await self._send(writer, 503, {"error": f"Job queue is full ({self.queue_size} jobs waiting)"}, {"Retry-After": "1"})
+        await self._send(writer, 202, job.status_dict(), {"Location": f"/jobs/{job.id}"})
+
+    async def _stream(self, job: Job, writer: asyncio.StreamWriter) -> None:
+        """Replay the job's records, follow new ones, and end with a final status record"""
+        writer.write(self._head(200, {"Content-Type": "application/x-ndjson"}))
+        sent = 0
+        while True:
+            changed = job._changed
+            while sent < len(job.records):
+                writer.write((json.dumps(job.records[sent], default=str) + "\n").encode("utf-8"))
+                sent += 1
+            if job.done:
+                final = {"seq": sent + 1, "kind": "job", "topic": None, "emitted_at": _now(), "data": job.status_dict()}
+                writer.write((json.dumps(final) + "\n").encode("utf-8"))
+                await writer.drain()
+                return
+            await writer.drain()
+            await changed.wait()
+
+    @staticmethod
+    def _head(status: int, headers: Dict[str, str]) -> bytes:
+        lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}", "Connection: close"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def _send(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        payload: Dict[str, Any],
+        headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        data = json.dumps(payload, default=str).encode("utf-8")
+        writer.write(self._head(status, {
+            "Content-Type": "application/json",
+            "Content-Length": str(len(data)),
+            **(headers or {})
+        }) + data)
+        await writer.drain()
+
+async def serve(
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    workdir: str = "./data/service",
+    corpus_root: str = "./data",
+    concurrency: int = 2,
+    queue_size: int = 32,
+    warm: Optional[List[str]] = None
+) -> None:
+    """Run the service until cancelled (Ctrl+C)"""
+    service = LessonCraftService(workdir=workdir, corpus_root=corpus_root, concurrency=concurrency, queue_size=queue_size)
+    url = await service.start(host, port, warm=warm)
+    print(f"LessonCraft service listening on {url} ({concurrency} concurrent jobs, queue of {queue_size})")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await service.stop()
@@ -0,0 +1,269 @@
+from typing import Dict, Any, Optional
+from crewai.tools import BaseTool
+from concurrent.futures import ThreadPoolExecutor
+import os
+import json
+from pydantic import Field, BaseModel
+from lessoncraftai.utils.artifacts import TOPICS, summarize
+from lessoncraftai.utils.context_packing import pack_context
+from lessoncraftai.utils.llm_cache import make_key
+from lessoncraftai.utils.manifest import indexed_chunk_count
+from lessoncraftai.utils.outline import load_outline, section_chunk_ids, topic_sections
+from lessoncraftai.utils.registry import get_chat_model, get_response_cache, get_vector_store
+from lessoncraftai.utils.retrieval import retrieve
+from lessoncraftai.utils.tokens import count_tokens, group_by_tokens
+from lessoncraftai.utils.tracing import current_span, span, traced, tracing_enabled
+from lessoncraftai.utils.topics import add_source_hashes, attribute_sources, merge_topics, parse_topic_list
+
+TOPIC_MODES = ("stuff", "map_reduce", "outline")
+
+# Prompt used for both the single "stuff" call and each map-reduce group
+TOPIC_PROMPT = (
+    "Based ONLY on the curriculum documents provided in the context, extract the key topics and their "
+    "associated learning objectives. Do not hallucinate or add information not present in the documents. "
+    "If a topic doesn't have clear objectives, just include what you can find. "
+    "\n\nFormat your response as a valid JSON list with this structure:\n"
+    "[{\"topic\": \"Topic Name\", \"objectives\": [\"Objective 1\", \"Objective 2\"]}, ...]\n\n"
+    "If you cannot find any clear topics or objectives, respond with an empty array: []"
+)
+
+# Prompt used per outline section, where the topic itself comes from the curriculum headings
+OBJECTIVES_PROMPT = (
+    "Based ONLY on the curriculum section provided in the context, list the learning objectives it covers. "
+    "Do not hallucinate or add information not present in the section. "
+    "\n\nFormat your response as a valid JSON list of strings:\n"
+    "[\"Objective 1\", \"Objective 2\"]\n\n"
+    "If the section has no clear objectives, respond with an empty array: []"
+)
+
+# Define a schema for the input
+class AnalyzeTopicsToolSchema(BaseModel):
+    arguments: Optional[Dict[str, Any]] = Field(default={}, description="Optional arguments for the tool")
+
+class AnalyzeTopicsTool(BaseTool):
+    name: str = "AnalyzeTopics"
+    description: str = "Analyzes the curriculum to extract key topics and learning objectives"
+    
+    # Define fields that the class will use
+    persist_dir: str = Field(description="Directory containing the vector database")
+    mode: str = Field(default="stuff", description="'stuff' for one retrieval call, 'map_reduce' to cover every chunk, 'outline' for topics from the section outline")
+    max_parallel: int = Field(default=4, description="Concurrent LLM calls in map_reduce and outline modes")
+    group_token_budget: int = Field(default=3000, description="Maximum curriculum tokens per map_reduce group or outline section")
+    context_token_budget: int = Field(default=3000, description="Maximum curriculum tokens sent in stuff mode")
+    fetch_k: int = Field(default=30, description="Chunks retrieved as candidates for the stuff mode context")
+    mmr_lambda: float = Field(default=0.5, description="Relevance vs. diversity trade-off when packing context (1.0 = relevance only)")
+    retrieval: str = Field(default="dense", description="'dense' (embeddings), 'lexical' (local BM25, no embedding call) or 'hybrid' (both, rank-fused)")
+    retrieval_query: Optional[str] = Field(default=None, description="Query used to retrieve context in stuff mode; defaults to the topic prompt")
+    artifacts: Optional[Any] = Field(default=None, description="ArtifactStore shared with the other tools in this run")
+    outputs: Optional[Any] = Field(default=None, description="TopicOutputStore of the previous run, whose objectives are reused for unchanged outline sections")
+    
+    # Define the input schema
+    args_schema: type[BaseModel] = AnalyzeTopicsToolSchema
+    
+    @traced("tool")
+    def _run(self, arguments: Dict[str, Any] = None) -> str:
+        """Required implementation of the _run method from BaseTool"""
+        print(f"Running analyze_topics with arguments: {arguments}")
+        
+        # Check if vector store exists
+        if not os.path.exists(self.persist_dir):
+            return f"Error: Vector store not found at {self.persist_dir}. Please run the VectorizePDF tool first."
+        
+        try:
+            if self.mode not in TOPIC_MODES:
+                raise ValueError(f"Unknown topic mode: {self.mode}. Expected one of: {', '.join(TOPIC_MODES)}")
+            
+            vectordb = get_vector_store(self.persist_dir)
+            
+            # Get document count from the ingest manifest or a count-only query
+            chunk_count = indexed_chunk_count(self.persist_dir, vectordb)
+            if not chunk_count:
+                return "Error: Vector store exists but appears to be empty. Please rerun the curriculum ingestor."
+            
+            print(f"Vector store loaded with {chunk_count} documents")
+            current_span().set(chunks=chunk_count, mode=self.mode)
+            
+            if self.mode == "map_reduce":
+                topics = self._map_reduce(vectordb)
+                print(f"Successfully extracted {len(topics)} topics")
+                return self._publish(topics)
+            
+            if self.mode == "outline":
+                sections = load_outline(self.persist_dir)
+                if not sections:
+                    return (
+                        f"Error: No curriculum outline in {self.persist_dir}. "
+                        "Please rerun the VectorizePDF tool with section chunking."
+                    )
+                topics = self._from_outline(vectordb, sections)
+                print(f"Successfully extracted {len(topics)} topics from the outline")
+                return self._publish(topics)
+            
+            # Retrieve a wide candidate set, then pack diverse passages into the token budget
+            print("Querying the vector store...")
+            query_vector, candidates = retrieve(
+                vectordb, self.persist_dir, self.retrieval_query or TOPIC_PROMPT, self.fetch_k, self.retrieval
+            )
+            packed = pack_context(query_vector, candidates, self.context_token_budget, mmr_lambda=self.mmr_lambda)
+            context = packed["text"]
+            print(
+                f"Packed {packed['chunks']} of {packed['candidates']} retrieved chunks into "
+                f"{packed['selected']} passages ({packed['tokens']} tokens, {packed['duplicates']} near-duplicates dropped)"
+            )
+            current_span().set(context_tokens=packed["tokens"], context_chunks=packed["chunks"])
+            
+            llm = get_chat_model(temperature=0.2)
+            
+            # Try to validate and format the JSON
+            try:
+                parsed_result = self._extract_topics(llm, context)
+            except ValueError as e:
+                return f"Error: {e}"
+            
+            # Record which of the packed chunks each topic came from
+            packed_ids = set(packed["ids"])
+            texts = {c["id"]: c["text"] for c in candidates if c.get("id") in packed_ids}
+            topics = [t for t in parsed_result if isinstance(t, dict) and t.get("topic")]
+            add_source_hashes(attribute_sources(topics, list(texts.items())), texts)
+            
+            print(f"Successfully extracted {len(topics)} topics")
+            return self._publish(topics)
+                
+        except Exception as e:
+            return f"Error analyzing topics: {str(e)}"
+    
+    def _publish(self, topics) -> str:
+        """Hand topics to downstream tools through the artifact store when there is one"""
+        topics = [t for t in topics if isinstance(t, dict) and t.get("topic")]
+        if self.artifacts is not None:
+            self.artifacts.put(TOPICS, topics)
+            return summarize(TOPICS, topics)
+        return json.dumps(topics, indent=2)
+    
+    def _map_reduce(self, vectordb):
+        """Extract topics from every chunk in token-bounded groups, then merge them"""
+        # Order chunks as they appear in the curriculum
+        index = sorted(
+            vectordb.metadata_index(),
+            key=lambda row: (
+                str(row[1].get("source", "")),
+                row[1].get("page", 0),
+                row[1].get("chunk_index", 0),
+                row[0]
+            )
+        )
+        ids = [doc_id for doc_id, _ in index]
+        docs = vectordb.get_documents(ids)
+        groups = group_by_tokens([doc.page_content for doc in docs], self.group_token_budget)
+        print(f"Extracting topics from {len(docs)} chunks in {len(groups)} groups")
+        
+        llm = get_chat_model(temperature=0.2)
+        
+        parent = current_span()
+        
+        def extract(group):
+            context = "\n\n".join(docs[i].page_content for i in group)
+            try:
+                topics = [t for t in self._extract_topics(llm, context, parent=parent) if isinstance(t, dict) and t.get("topic")]
+                return attribute_sources(topics, [(docs[i].metadata["id"], docs[i].page_content) for i in group])
+            except Exception as e:
+                # One bad group should not lose the topics found elsewhere
+                print(f"Skipping group of {len(group)} chunks: {e}")
+                return []
+        
+        with ThreadPoolExecutor(max_workers=max(1, self.max_parallel)) as pool:
+            partial_topics = list(pool.map(extract, groups))
+        
+        return add_source_hashes(merge_topics(partial_topics), {doc.metadata["id"]: doc.page_content for doc in docs})
+    
+    def _from_outline(self, vectordb, sections):
+        """One topic per outline section; the LLM only fills in each section's objectives"""
+        chosen = topic_sections(sections)
+        print(f"Building {len(chosen)} topics from an outline of {len(sections)} sections")
+        
+        llm = get_chat_model(temperature=0.2)
+        
+        parent = current_span()
+        
+        def fill(section):
+            docs = vectordb.get_documents(section_chunk_ids(sections, section))
+            texts = {doc.metadata["id"]: doc.page_content for doc in docs}
+            topic = {"topic": section["title"], "source_chunks": list(texts)}
+            add_source_hashes([topic], texts)
+            
+            # A section whose text is unchanged keeps the objectives found last time
+            previous = self.outputs.previous_topic(section["title"]) if self.outputs is not None else None
+            if previous is not None and previous.get("source_hash") == topic["source_hash"]:
+                return {"topic": section["title"], "objectives": previous["objectives"], **topic}
+            
+            groups = group_by_tokens([doc.page_content for doc in docs], self.group_token_budget)
+            objectives = []
+            if groups:
+                # Sections longer than the budget are read from their start, where objectives are usually stated
+                context = "\n\n".join(docs[i].page_content for i in groups[0])
+                try:
+                    objectives = self._extract_objectives(llm, section["title"], context, parent=parent)
+                except Exception as e:
+                    # The topic is still known from the heading
+                    print(f"No objectives for section {section['title']}: {e}")
+            return {"topic": section["title"], "objectives": objectives, **topic}
+        
+        with ThreadPoolExecutor(max_workers=max(1, self.max_parallel)) as pool:
+            return list(pool.map(fill, chosen))
+    
+    def _extract_objectives(self, llm, title: str, context: str, parent=None):
+        """Ask the LLM for the objectives of one section, answering from the response cache when possible"""
+        model = getattr(llm, "model_name", "")
+        prompt = f"{OBJECTIVES_PROMPT}\n\nSection: {title}\n\nCurriculum section:\n{context}"
+        with span("llm", "objective_extraction", parent=parent, model=model, section=title) as s:
+            if tracing_enabled():
+                s.set(prompt_tokens=count_tokens(prompt))
+            
+            cache = get_response_cache()
+            result = None
+            if cache is not None:
+                key = make_key(model, getattr(llm, "temperature", None), OBJECTIVES_PROMPT, f"{title}\n{context}")
+                result = cache.get(key)
+                if result is not None:
+                    s.set(cache_hits=1)
+            
+            fresh = result is None
+            if fresh:
+                result = llm.invoke(prompt).content
+                if tracing_enabled():
+                    s.set(completion_tokens=count_tokens(result))
+            objectives = [str(o).strip() for o in parse_topic_list(result) if isinstance(o, (str, int, float)) and str(o).strip()]
+            
+            # Only cache responses that parsed, so a bad answer is retried next run
+            if fresh and cache is not None:
+                cache.put(key, model, result)
+            return objectives
+    
+    def _extract_topics(self, llm, context: str, parent=None):
+        """Ask the LLM for the topics in `context`, answering from the response cache when possible"""
+        model = getattr(llm, "model_name", "")
+        prompt = f"{TOPIC_PROMPT}\n\nCurriculum documents:\n{context}"
+        with span("llm", "topic_extraction", parent=parent, model=model) as s:
+            if tracing_enabled():
+                s.set(prompt_tokens=count_tokens(prompt))
+            
+            cache = get_response_cache()
+            if cache is not None:
+                key = make_key(model, getattr(llm, "temperature", None), TOPIC_PROMPT, context)
+                cached = cache.get(key)
+                if cached is not None:
+                    s.set(cache_hits=1)
+                    return parse_topic_list(cached)
+            
+            result = llm.invoke(prompt).content
+            if tracing_enabled():
+                s.set(completion_tokens=count_tokens(result))
+            try:
+                topics = parse_topic_list(result)
+            except ValueError as e:
+                raise ValueError(f"{e}. Raw result: {result}")
+            
+            # Only cache responses that parsed, so a bad answer is retried next run
+            if cache is not None:
+                cache.put(key, model, result)
+            return topics
\ No newline at end of file
@@ -0,0 +1,93 @@
+from typing import Dict, Any, Optional
+from crewai.tools import BaseTool
+from pydantic import Field, BaseModel
+from lessoncraftai.utils.artifacts import LESSON_PLANS, ASSESSMENTS
+from lessoncraftai.utils.fanout import run_generator
+from lessoncraftai.utils.tracing import traced
+
+# Define a schema for the input
+class DesignAssessmentsToolSchema(BaseModel):
+    arguments: Optional[Dict[str, Any]] = Field(default={}, description="Optional arguments for the tool")
+
+class DesignAssessmentsTool(BaseTool):
+    name: str = "DesignAssessments"
+    description: str = "Create assessments based on lesson plans"
+    
+    # Define fields that the class will use
+    artifacts: Optional[Any] = Field(default=None, description="ArtifactStore shared with the other tools in this run")
+    sink: Optional[Any] = Field(default=None, description="NDJSONSink that receives each record as it is produced")
+    max_parallel: int = Field(default=4, description="Batches of topics generated at the same time")
+    batch_size: int = Field(default=1, description="Topics per work unit")
+    outputs: Optional[Any] = Field(default=None, description="TopicOutputStore whose outputs are reused for unchanged topics")
+    
+    # Define the input schema
+    args_schema: type[BaseModel] = DesignAssessmentsToolSchema
+    
+    @traced("tool")
+    def _run(self, arguments: Dict[str, Any] = None) -> str:
+        """Required implementation of the _run method from BaseTool"""
+        print(f"Running design_assessments with arguments: {arguments}")
+        
+        # Default lesson plans if none provided
+        default_lesson_plans = [{"topic": "Sample Topic", "objectives": ["Sample Objective"]}]
+        
+        return run_generator(self, arguments, LESSON_PLANS, ASSESSMENTS, "assessment", self._design_assessment, default_lesson_plans)
+    
+    def _design_assessment(self, plan: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the assessment for one lesson plan"""
+        topic_name = plan.get("topic", "Unknown Topic")
+        objectives = plan.get("objectives", ["Understand the topic"])
+        
+        # Create an assessment structure
+        assessment = {
+            "topic": topic_name,
+            "objectives": objectives,
+            "formative_assessment": {
+                "exit_ticket": {
+                    "questions": [
+                        {
+                            "type": "short_answer",
+                            "question": f"What is one thing you learned about {topic_name} today?"
+                        },
+                        {
+                            "type": "multiple_choice",
+                            "question": "How confident are you with today's material?",
+                            "options": [
+                                "Very confident",
+                                "Somewhat confident",
+                                "Slightly confused",
+                                "Very confused"
+                            ]
+                        }
+                    ]
+                }
+            },
+            "summative_assessment": {
+                "quiz": {
+                    "questions": [
+                        {
+                            "type": "multiple_choice",
+                            "question": f"Which of the following best describes {topic_name}?",
+                            "options": [
+                                f"Correct description of {topic_name}",
+                                "Incorrect option 1",
+                                "Incorrect option 2",
+                                "Incorrect option 3"
+                            ],
+                            "correct_answer": 0
+                        },
+                        {
+                            "type": "short_answer",
+                            "question": f"Explain the importance of {topic_name}.",
+                            "sample_answer": f"{topic_name} is important because..."
+                        },
+                        {
+                            "type": "true_false",
+                            "question": f"{topic_name} is a fundamental concept in this field.",
+                            "correct_answer": True
+                        }
+                    ]
+                }
+            }
+        }
+        return assessment
@@ -0,0 +1,85 @@
+from typing import Dict, Any, Optional
+from crewai.tools import BaseTool
+from pydantic import Field, BaseModel
+from lessoncraftai.utils.artifacts import LESSON_PLANS, ENHANCEMENTS
+from lessoncraftai.utils.fanout import run_generator
+from lessoncraftai.utils.tracing import traced
+
+# Define a schema for the input
+class EnhanceLessonsToolSchema(BaseModel):
+    arguments: Optional[Dict[str, Any]] = Field(default={}, description="Optional arguments for the tool")
+
+class EnhanceLessonsTool(BaseTool):
+    name: str = "EnhanceLessons"
+    description: str = "Recommend additional resources for lesson plans"
+    
+    # Define fields that the class will use
+    artifacts: Optional[Any] = Field(default=None, description="ArtifactStore shared with the other tools in this run")
+    sink: Optional[Any] = Field(default=None, description="NDJSONSink that receives each record as it is produced")
+    max_parallel: int = Field(default=4, description="Batches of topics generated at the same time")
+    batch_size: int = Field(default=1, description="Topics per work unit")
+    outputs: Optional[Any] = Field(default=None, description="TopicOutputStore whose outputs are reused for unchanged topics")
+    
+    # Define the input schema
+    args_schema: type[BaseModel] = EnhanceLessonsToolSchema
+    
+    @traced("tool")
+    def _run(self, arguments: Dict[str, Any] = None) -> str:
+        """Required implementation of the _run method from BaseTool"""
+        print(f"Running enhance_lessons with arguments: {arguments}")
+        
+        # Default lesson plans if none provided
+        default_lesson_plans = [{"topic": "Sample Topic", "objectives": ["Sample Objective"]}]
+        
+        return run_generator(self, arguments, LESSON_PLANS, ENHANCEMENTS, "enhancement", self._enhance_lesson, default_lesson_plans)
+    
+    def _enhance_lesson(self, plan: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the resource recommendations for one lesson plan"""
+        topic_name = plan.get("topic", "Unknown Topic")
+        objectives = plan.get("objectives", ["Understand the topic"])
+        
+        # Create a clean version of the topic name for URLs
+        clean_topic = topic_name.lower().replace(' ', '-')
+        
+        # Create an enhancement structure
+        enhancement = {
+            "topic": topic_name,
+            "objectives": objectives,
+            "videos": [
+                {
+                    "title": f"Introduction to {topic_name}",
+                    "url": f"https://www.youtube.com/results?search_query={clean_topic}+introduction",
+                    "description": f"An engaging introduction to {topic_name} for beginners."
+                },
+                {
+                    "title": f"{topic_name} Explained",
+                    "url": f"https://www.khanacademy.org/search?q={clean_topic}",
+                    "description": f"Detailed explanation of {topic_name} with helpful visuals."
+                }
+            ],
+            "articles": [
+                {
+                    "title": f"Understanding {topic_name}",
+                    "url": f"https://www.britannica.com/search?query={clean_topic}",
+                    "description": f"Comprehensive article about {topic_name} from Encyclopedia Britannica."
+                },
+                {
+                    "title": f"{topic_name} in Practice",
+                    "url": f"https://scholar.google.com/scholar?q={clean_topic}",
+                    "description": f"Academic papers related to {topic_name} for in-depth study."
+                }
+            ],
+            "interactive_resources": [
+                {
+                    "title": f"{topic_name} Interactive Quiz",
+                    "url": f"https://quizlet.com/search?query={clean_topic}&type=sets",
+                    "description": f"Interactive quizzes to test knowledge of {topic_name}."
+                },
+                {
+                    "title": f"{topic_name} Simulation",
+                    "url": f"https://phet.colorado.edu/en/search?q={clean_topic}",
+                    "description": f"Interactive simulations related to {topic_name} concepts."
+                }
+            ]
+        }
+        return enhancement
@@ -0,0 +1,302 @@
+from typing import Dict, Any, Optional
+from crewai.tools import BaseTool
+from langchain_community.document_loaders import PyPDFLoader
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+import hashlib
+import os
+from pydantic import Field, BaseModel
+from lessoncraftai.utils.bm25 import BM25Builder, BM25Index, bm25_path
+from lessoncraftai.utils.manifest import IngestManifest, hash_sources, indexed_chunk_count, load_manifest, remove_manifest, write_manifest
+from lessoncraftai.utils.outline import OutlineBuilder, outline_path, remove_outline
+from lessoncraftai.utils.pdf_extract import iter_pages, resolve_pdf_sources
+from lessoncraftai.utils.registry import get_embeddings, get_vector_store, vector_backend
+from lessoncraftai.utils.streaming import BackgroundWriter, prefetch, windowed
+from lessoncraftai.utils.tracing import current_span, traced
+
+# How pages are cut into chunks: by size alone, or along detected section headings first
+CHUNKING_MODES = ("recursive", "sections")
+
+# Define a schema for the input
+class VectorizePDFToolSchema(BaseModel):
+    arguments: Optional[Dict[str, Any]] = Field(default={}, description="Optional arguments for the tool")
+
+def _hash_text(text: str) -> str:
+    """Return a stable content hash for a page or chunk"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+class VectorizePDFTool(BaseTool):
+    name: str = "VectorizePDF"
+    description: str = "Loads and vectorizes a PDF document, or a directory or glob of PDFs, for later retrieval and querying"
+    
+    # Define fields that the class will use
+    pdf_path: str = Field(description="Path to the PDF file, or a directory or glob pattern of PDF files")
+    persist_dir: str = Field(description="Directory to store the vector database")
+    streaming: bool = Field(default=False, description="Read, embed and store the PDF in fixed-size windows")
+    window_size: int = Field(default=256, description="Chunks per window in streaming mode")
+    chunk_size: int = Field(default=500, description="Characters per chunk")
+    chunk_overlap: int = Field(default=50, description="Characters shared by neighbouring chunks")
+    extract_workers: int = Field(default=0, description="Processes used for page extraction; 0 uses every core, 1 extracts in-process")
+    chunking: str = Field(default="recursive", description="'recursive' splits pages by size, 'sections' splits at headings first and writes an outline index")
+    
+    # Define the input schema
+    args_schema: type[BaseModel] = VectorizePDFToolSchema
+    
+    @traced("tool")
+    def _run(self, arguments: Dict[str, Any] = None) -> str:
+        """Required implementation of the _run method from BaseTool"""
+        print(f"Running vectorize_pdf with arguments: {arguments}")
+        
+        # Make sure vectorstore directory exists
+        os.makedirs(self.persist_dir, exist_ok=True)
+        
+        # Verify file extension
+        if os.path.isfile(self.pdf_path) and not self.pdf_path.lower().endswith('.pdf'):
+            return f"File at {self.pdf_path} is not a PDF file."
+        
+        if self.chunking not in CHUNKING_MODES:
+            return f"Unknown chunking mode: {self.chunking}. Expected one of: {', '.join(CHUNKING_MODES)}"
+
+        # Check if the PDF file, directory or glob matches anything
+        sources = resolve_pdf_sources(self.pdf_path)
+        if not sources:
+            return f"Curriculum PDF not found at: {self.pdf_path}"
+
+        # Skip ingestion entirely when the manifest shows these exact inputs are indexed
+        try:
+            embeddings = get_embeddings()
+            source_hashes = hash_sources(sources)
+        except Exception as e:
+            return f"Error preparing ingestion: {str(e)}"
+        manifest = load_manifest(self.persist_dir)
+        outline_ready = self.chunking != "sections" or os.path.exists(outline_path(self.persist_dir))
+        if outline_ready and manifest and manifest.matches(
+            source_hashes, self.chunk_size, self.chunk_overlap, embeddings.model, vector_backend(), self.chunking
+        ):
+            print(f"Vector store at {self.persist_dir} is up to date with {self.pdf_path}.")
+            if not os.path.exists(bm25_path(self.persist_dir)):
+                try:
+                    self._build_lexical_index_from_store()
+                except Exception as e:
+                    return f"Error building the BM25 index: {str(e)}"
+            return (
+                f"Curriculum is already indexed in {self.persist_dir} with {manifest.chunk_count} chunks "
+                f"(unchanged since {manifest.ingested_at})."
+            )
+
+        if self.streaming:
+            return self._run_streaming(sources, source_hashes, embeddings)
+
+        try:
+            print(f"Loading {len(sources)} PDF file(s) from {self.pdf_path}")
+            pages = list(self._load_pages(sources))
+            print(f"Loaded {len(pages)} pages from PDF")
+        except ImportError:
+            return "The pypdf package is not installed. Please install it with 'pip install pypdf'."
+        except Exception as e:
+            return f"Error loading PDF: {str(e)}"
+
+        if not pages:
+            return "No content found in the curriculum PDF. Please check the file."
+
+        try:
+            splitter = RecursiveCharacterTextSplitter(chunk_size=self.chunk_size, chunk_overlap=self.chunk_overlap)
+            outline = OutlineBuilder() if self.chunking == "sections" else None
+            pairs = list(self._iter_chunks(pages, splitter, outline))
+            docs = [doc for doc, _ in pairs]
+            ids = [doc_id for _, doc_id in pairs]
+            print(f"Split into {len(docs)} chunks")
+        except Exception as e:
+            return f"Error splitting documents: {str(e)}"
+
+        if not docs:
+            return "PDF loaded, but no documents could be chunked."
+
+        try:
+            vectordb = get_vector_store(self.persist_dir)
+            
+            # Diff the chunk IDs against what is already stored
+            existing_ids = set(vectordb.ids())
+            wanted_ids = set(ids)
+            new_docs = [doc for doc, doc_id in zip(docs, ids) if doc_id not in existing_ids]
+            new_ids = [doc_id for doc_id in ids if doc_id not in existing_ids]
+            orphaned_ids = sorted(existing_ids - wanted_ids)
+            kept = len(wanted_ids & existing_ids)
+            
+            # The manifest is only valid once the collection matches it again
+            remove_manifest(self.persist_dir)
+            
+            if orphaned_ids:
+                print(f"Removing {len(orphaned_ids)} orphaned chunks")
+                vectordb.delete(ids=orphaned_ids)
+            
+            if new_docs:
+                print(f"Embedding {len(new_docs)} new or changed chunks into {self.persist_dir}")
+                vectordb.add_documents(documents=new_docs, ids=new_ids)
+            
+            vectordb.persist()
+            
+            # Keyword index over the same chunk IDs, for lexical and hybrid retrieval
+            lexical = BM25Index()
+            lexical.add_many((doc_id, doc.page_content) for doc, doc_id in pairs)
+            lexical.save(self.persist_dir)
+            self._save_outline(outline)
+            
+            self._write_manifest(source_hashes, len(wanted_ids), embeddings)
+            print("Vectorstore updated and persisted successfully")
+            current_span().set(pages=len(pages), chunks=len(docs), added=len(new_ids), kept=kept, removed=len(orphaned_ids))
+        except Exception as e:
+            return f"Error updating vector store: {str(e)}"
+
+        return (
+            f"Curriculum indexed successfully with {len(docs)} chunks from {self.pdf_path} "
+            f"(added {len(new_ids)}, kept {kept}, removed {len(orphaned_ids)})"
+        )
+    
+    def _load_pages(self, sources):
+        """Lazily read pages from every source PDF, in a process pool unless disabled"""
+        if self.extract_workers == 1:
+            for source in sources:
+                yield from PyPDFLoader(source).lazy_load()
+        else:
+            yield from iter_pages(sources, workers=self.extract_workers or None)
+    
+    def _run_streaming(self, sources, source_hashes, embeddings) -> str:
+        """Ingest the PDF through a bounded extract -> embed -> write pipeline"""
+        lexical = None
+        try:
+            vectordb = get_vector_store(self.persist_dir)
+            existing_ids = set(vectordb.ids())
+            remove_manifest(self.persist_dir)
+            seen_ids = set()
+            added = 0
+            # Postings spill to disk as they accumulate, so the keyword index stays bounded too
+            lexical = BM25Builder(self.persist_dir)
+            
+            # Pages are read lazily and chunked on a background thread
+            print(f"Streaming PDF from {self.pdf_path} in windows of {self.window_size} chunks")
+            splitter = RecursiveCharacterTextSplitter(chunk_size=self.chunk_size, chunk_overlap=self.chunk_overlap)
+            pages = self._load_pages(sources)
+            outline = OutlineBuilder() if self.chunking == "sections" else None
+            windows = prefetch(windowed(self._iter_chunks(pages, splitter, outline), self.window_size))
+            
+            # Writes to the collection overlap with embedding of the next window
+            writer = BackgroundWriter(lambda batch: vectordb.upsert(**batch))
+            try:
+                for window in windows:
+                    fresh = []
+                    for doc, doc_id in window:
+                        if doc_id in seen_ids:
+                            continue
+                        if doc_id not in existing_ids:
+                            fresh.append((doc, doc_id))
+                        seen_ids.add(doc_id)
+                        lexical.add(doc_id, doc.page_content)
+                    if not fresh:
+                        continue
+                    texts = [doc.page_content for doc, _ in fresh]
+                    writer.submit({
+                        "ids": [doc_id for _, doc_id in fresh],
+                        "embeddings": embeddings.embed_documents(texts),
+                        "documents": texts,
+                        "metadatas": [doc.metadata for doc, _ in fresh]
+                    })
+                    added += len(fresh)
+            finally:
+                writer.close()
+            
+            if not seen_ids:
+                return "PDF loaded, but no documents could be chunked."
+            
+            orphaned_ids = sorted(existing_ids - seen_ids)
+            if orphaned_ids:
+                print(f"Removing {len(orphaned_ids)} orphaned chunks")
+                vectordb.delete(ids=orphaned_ids)
+            vectordb.persist()
+            lexical.save()
+            self._save_outline(outline)
+            self._write_manifest(source_hashes, len(seen_ids), embeddings)
+            print("Vectorstore updated and persisted successfully")
+            current_span().set(chunks=len(seen_ids), added=added, kept=len(seen_ids) - added, removed=len(orphaned_ids))
+        except ImportError:
+            return "The pypdf package is not installed. Please install it with 'pip install pypdf'."
+        except Exception as e:
+            return f"Error streaming curriculum into vector store: {str(e)}"
+        finally:
+            if lexical is not None:
+                lexical.close()
+        
+        return (
+            f"Curriculum indexed successfully with {len(seen_ids)} chunks from {self.pdf_path} "
+            f"(added {added}, kept {len(seen_ids) - added}, removed {len(orphaned_ids)})"
+        )
+    
+    def _build_lexical_index_from_store(self):
+        """Build the BM25 index for a store ingested before the index existed, without re-embedding"""
+        vectordb = get_vector_store(self.persist_dir)
+        ids = [doc_id for doc_id, _ in vectordb.metadata_index()]
+        lexical = BM25Index()
+        lexical.add_many((doc.metadata["id"], doc.page_content) for doc in vectordb.get_documents(ids))
+        lexical.save(self.persist_dir)
+        print(f"Built BM25 index over {len(lexical)} existing chunks")
+    
+    def _write_manifest(self, source_hashes, chunk_count, embeddings):
+        """Record what was ingested so later runs can skip work and check readiness cheaply"""
+        write_manifest(self.persist_dir, IngestManifest(
+            sources=source_hashes,
+            chunk_count=chunk_count,
+            chunk_size=self.chunk_size,
+            chunk_overlap=self.chunk_overlap,
+            embedding_model=embeddings.model,
+            vector_backend=vector_backend(),
+            chunking=self.chunking
+        ))
+    
+    def _save_outline(self, outline):
+        """Persist the section outline, or drop a stale one when chunking by size"""
+        if outline is None:
+            remove_outline(self.persist_dir)
+            return
+        outline.save(self.persist_dir)
+        print(f"Saved curriculum outline with {len(outline.sections)} sections")
+    
+    def _iter_chunks(self, pages, splitter, outline=None):
+        """Split pages into chunks, yielding each chunk with a content-derived ID
+        
+        The ID depends only on the resolved source file, the chunk's text and how
+        often that text already occurred in the file, so a relative path or a page
+        inserted near the front leaves every other chunk's ID unchanged. The page
+        number is kept as metadata only. With an outline, each page is first cut
+        at its section headings so no chunk spans two sections, and every chunk
+        ID is recorded on its section.
+        """
+        seen = {}
+        for page in pages:
+            page_hash = _hash_text(page.page_content)
+            segments = outline.split_page(page) if outline is not None else [page]
+            chunk_index = 0
+            for chunk in splitter.split_documents(segments):
+                chunk_hash = _hash_text(chunk.page_content)
+                source = os.path.realpath(chunk.metadata.get("source", self.pdf_path))
+                # Identical chunks in the same file need distinct IDs
+                occurrence = seen.get((source, chunk_hash), 0)
+                seen[(source, chunk_hash)] = occurrence + 1
+                chunk.metadata["page_hash"] = page_hash
+                chunk.metadata["chunk_hash"] = chunk_hash
+                chunk.metadata["chunk_index"] = chunk_index
+                chunk_index += 1
+                chunk_id = _hash_text(f"{source}:{chunk_hash}:{occurrence}")
+                if outline is not None:
+                    outline.add_chunk(chunk.metadata["section_id"], chunk_id)
+                yield chunk, chunk_id
+    
+    def _vector_store_has_content(self) -> bool:
+        """Check if the vector store exists and has content"""
+        try:
+            if not os.path.isdir(self.persist_dir):
+                return False
+            
+            # Prefer the manifest; otherwise ask the configured store for a count only
+            return indexed_chunk_count(self.persist_dir, get_vector_store(self.persist_dir)) > 0
+        except Exception as e:
+            print(f"Error checking vector store: {e}")
+            return False
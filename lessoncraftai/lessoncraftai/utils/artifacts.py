@@ -0,0 +1,74 @@
+from typing import Any, Dict, List, Optional
+from lessoncraftai.utils.topics import parse_topic_list
+import copy
+import threading
+
+# Artifact names, in the order the crew produces them
+TOPICS = "topics"
+LESSON_PLANS = "lesson_plans"
+ASSESSMENTS = "assessments"
+ENHANCEMENTS = "enhancements"
+ARTIFACT_NAMES = (TOPICS, LESSON_PLANS, ASSESSMENTS, ENHANCEMENTS)
+
+class ArtifactStore:
+    """Thread-safe hand-off of structured task results between tools in one run
+
+    Every artifact is a list of dicts keyed by "topic", so tools can read
+    upstream results directly instead of having the LLM re-transcribe them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._artifacts: Dict[str, List[Dict[str, Any]]] = {}
+
+    def put(self, name: str, items: List[Dict[str, Any]]) -> None:
+        if name not in ARTIFACT_NAMES:
+            raise ValueError(f"Unknown artifact '{name}'. Expected one of: {', '.join(ARTIFACT_NAMES)}")
+        if not isinstance(items, list) or not all(isinstance(i, dict) and i.get("topic") for i in items):
+            raise TypeError(f"Artifact '{name}' must be a list of dicts with a 'topic' key")
+        with self._lock:
+            self._artifacts[name] = copy.deepcopy(items)
+
+    def get(self, name: str) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            items = self._artifacts.get(name)
+            return copy.deepcopy(items) if items is not None else None
+
+    def snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+        with self._lock:
+            return copy.deepcopy(self._artifacts)
+
+    def clear(self) -> None:
+        """Drop every artifact, so the tools holding this store can serve another run"""
+        with self._lock:
+            self._artifacts.clear()
+
+def read_upstream(
+    artifacts: Optional[ArtifactStore],
+    name: str,
+    arguments: Any,
+    default: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Items from the upstream artifact, else parsed from the tool arguments, else the default"""
+    if artifacts is not None:
+        items = artifacts.get(name)
+        if items:
+            print(f"Read {len(items)} items from artifact '{name}'")
+            return items
+
+    if arguments:
+        try:
+            items = parse_topic_list(str(arguments))
+            if items and all(isinstance(item, dict) for item in items):
+                return items
+        except ValueError:
+            pass
+
+    print(f"Warning: no '{name}' artifact or JSON list in the tool arguments; using default input")
+    return default
+
+def summarize(name: str, items: List[Dict[str, Any]]) -> str:
+    """Short tool result that points at the stored artifact instead of repeating it"""
+    topics = ", ".join(str(item.get("topic")) for item in items[:20])
+    more = f" and {len(items) - 20} more" if len(items) > 20 else ""
+    return f"Stored {len(items)} {name.replace('_', ' ')} as artifact '{name}' for topics: {topics}{more}"
@@ -0,0 +1,182 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from collections import Counter
+import heapq
+import itertools
+import json
+import math
+import os
+import re
+import shutil
+import tempfile
+
+BM25_FILE = "bm25_index.json"
+
+# Postings BM25Builder holds in memory before it spills them to a sorted run file
+SPILL_POSTINGS = 500_000
+
+# Words joined by ".", "-", "_" or "/" stay one token, so codes like CCSS.MATH.5.NF.A.1 match exactly
+_TOKEN = re.compile(r"[a-z0-9]+(?:[.\-_/][a-z0-9]+)*")
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens; compound codes are kept whole and also split into their parts"""
+    tokens = []
+    for match in _TOKEN.finditer(text.lower()):
+        token = match.group(0)
+        tokens.append(token)
+        if not token.isalnum():
+            tokens.extend(part for part in re.split(r"[.\-_/]", token) if part)
+    return tokens
+
+def bm25_path(persist_dir: str) -> str:
+    return os.path.join(persist_dir, BM25_FILE)
+
+class BM25Index:
+    """Okapi BM25 over chunk texts, keyed by the same chunk IDs as the vector store"""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.ids: List[str] = []
+        self.lengths: List[int] = []
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+
+    def add(self, doc_id: str, text: str) -> None:
+        row = len(self.ids)
+        counts = Counter(tokenize(text))
+        self.ids.append(doc_id)
+        self.lengths.append(sum(counts.values()))
+        for term, tf in counts.items():
+            self.postings.setdefault(term, []).append((row, tf))
+
+    def add_many(self, pairs: Iterable[Tuple[str, str]]) -> None:
+        for doc_id, text in pairs:
+            self.add(doc_id, text)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+        """Best k (chunk ID, score) pairs for `query`, highest score first"""
+        if not self.ids:
+            return []
+        n = len(self.ids)
+        average = sum(self.lengths) / n or 1.0
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for row, tf in postings:
+                norm = tf + self.k1 * (1 - self.b + self.b * self.lengths[row] / average)
+                scores[row] = scores.get(row, 0.0) + idf * tf * (self.k1 + 1) / norm
+        best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [(self.ids[row], score) for row, score in best]
+
+    def save(self, persist_dir: str) -> None:
+        """Atomically replace the persisted index"""
+        _write_index(persist_dir, self.k1, self.b, self.ids, self.lengths, iter(self.postings.items()))
+
+class BM25Builder:
+    """Writes the same index as BM25Index.save() for a corpus too large to hold its postings
+
+    Postings are spilled to a temporary run file, sorted by term, whenever
+    `max_postings` of them are pending, and save() merges the runs term by term
+    straight into the index file. Only chunk IDs and lengths stay in memory.
+    """
+
+    def __init__(self, persist_dir: str, k1: float = 1.5, b: float = 0.75, max_postings: int = SPILL_POSTINGS):
+        self.persist_dir = persist_dir
+        self.k1 = k1
+        self.b = b
+        self.max_postings = max_postings
+        self.ids: List[str] = []
+        self.lengths: List[int] = []
+        self._pending: Dict[str, List[Tuple[int, int]]] = {}
+        self._pending_count = 0
+        os.makedirs(persist_dir, exist_ok=True)
+        self._run_dir = tempfile.mkdtemp(dir=persist_dir, prefix=".bm25-runs-")
+        self._runs: List[str] = []
+
+    def add(self, doc_id: str, text: str) -> None:
+        row = len(self.ids)
+        counts = Counter(tokenize(text))
+        self.ids.append(doc_id)
+        self.lengths.append(sum(counts.values()))
+        for term, tf in counts.items():
+            self._pending.setdefault(term, []).append((row, tf))
+        self._pending_count += len(counts)
+        if self._pending_count >= self.max_postings:
+            self._spill()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _spill(self) -> None:
+        if not self._pending:
+            return
+        path = os.path.join(self._run_dir, f"run-{len(self._runs)}.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            for term in sorted(self._pending):
+                f.write(json.dumps([term, self._pending[term]]) + "\n")
+        self._runs.append(path)
+        self._pending = {}
+        self._pending_count = 0
+
+    def save(self) -> None:
+        """Merge every run into the persisted index, then remove the runs"""
+        self._spill()
+        files = [open(path, "r", encoding="utf-8") for path in self._runs]
+        try:
+            # Runs hold increasing rows, and merge() keeps run order for equal terms
+            entries = heapq.merge(*((json.loads(line) for line in f) for f in files), key=lambda entry: entry[0])
+            postings = (
+                (term, [posting for _, part in group for posting in part])
+                for term, group in itertools.groupby(entries, key=lambda entry: entry[0])
+            )
+            _write_index(self.persist_dir, self.k1, self.b, self.ids, self.lengths, postings)
+        finally:
+            for f in files:
+                f.close()
+            self.close()
+
+    def close(self) -> None:
+        shutil.rmtree(self._run_dir, ignore_errors=True)
+
+def _write_index(
+    persist_dir: str,
+    k1: float,
+    b: float,
+    ids: List[str],
+    lengths: List[int],
+    postings: Iterator[Tuple[str, List[Tuple[int, int]]]]
+) -> None:
+    """Write the index file term by term, so postings never have to be in memory at once"""
+    os.makedirs(persist_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=persist_dir, prefix=".bm25-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(f'{{"k1": {json.dumps(k1)}, "b": {json.dumps(b)}, "ids": {json.dumps(ids)}, "lengths": {json.dumps(lengths)}, "postings": {{')
+            for position, (term, term_postings) in enumerate(postings):
+                f.write(("" if position == 0 else ", ") + f"{json.dumps(term)}: {json.dumps(term_postings)}")
+            f.write("}}")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, bm25_path(persist_dir))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def load_bm25(persist_dir: str) -> Optional[BM25Index]:
+    """The persisted index for a vector store, or None if it has not been built"""
+    try:
+        with open(bm25_path(persist_dir), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    index = BM25Index(k1=data["k1"], b=data["b"])
+    index.ids = data["ids"]
+    index.lengths = data["lengths"]
+    index.postings = {term: [tuple(p) for p in postings] for term, postings in data["postings"].items()}
+    return index
@@ -0,0 +1,30 @@
+from typing import Any
+from lessoncraftai.utils.llm_cache import make_key
+from lessoncraftai.utils.llm_wrapper import WrappedLLM
+from lessoncraftai.utils.tracing import current_span
+import json
+
+class CachedLLM(WrappedLLM):
+    """Agent LLM that answers repeated plain-text calls from the response cache
+
+    Calls that offer tools are always sent to the wrapped LLM, because their
+    result may be a function call rather than text.
+    """
+
+    cache: Any
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, **kwargs):
+        if tools or available_functions:
+            return self._forward(messages, tools, callbacks, available_functions, **kwargs)
+
+        prompt = messages if isinstance(messages, str) else json.dumps(messages, sort_keys=True, default=str)
+        key = make_key(self.model, self.temperature, prompt)
+        cached = self.cache.get(key)
+        if cached is not None:
+            current_span().add("cache_hits")
+            return cached
+
+        response = self._forward(messages, tools, callbacks, available_functions, **kwargs)
+        if isinstance(response, str):
+            self.cache.put(key, self.model, response)
+        return response
@@ -0,0 +1,155 @@
+from typing import Any, Callable, Dict, List, Optional
+from datetime import datetime, timezone
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+# Tool fields that hold run-scoped objects or only change how fast results are produced
+_RUNTIME_FIELDS = ("artifacts", "sink", "outputs", "max_parallel", "batch_size")
+
+def fingerprint(value: Any) -> str:
+    """SHA-256 of a JSON rendering of `value`, stable across runs and key order"""
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+def tool_config(tool) -> Dict[str, Any]:
+    """The settings of a tool that change what it produces"""
+    from crewai.tools import BaseTool
+    fields = [f for f in type(tool).model_fields if f not in BaseTool.model_fields and f not in _RUNTIME_FIELDS]
+    return {"name": tool.name, "fields": {f: getattr(tool, f) for f in fields}}
+
+def task_config(task) -> Dict[str, Any]:
+    """Everything about a task and its agent that changes what the task produces"""
+    agent = task.agent
+    llm = getattr(agent, "llm", None)
+    tools = [tool_config(tool) for tool in getattr(agent, "tools", None) or []]
+    return {
+        "description": task.description,
+        "expected_output": task.expected_output,
+        "agent": {
+            "role": agent.role,
+            "goal": agent.goal,
+            "backstory": agent.backstory,
+            "model": getattr(llm, "model", None),
+        },
+        "tools": tools,
+    }
+
+class TaskCheckpointer:
+    """Saves each finished task's output and artifacts, and restores them on a rerun
+
+    A task's key hashes the run inputs, its task_config() and the fingerprints of
+    the tasks it depends on, so changing a prompt, a tool setting or an upstream
+    result invalidates that task and everything downstream of it. A checkpoint is
+    only written when every artifact the task should produce exists and
+    `is_valid(name)` agrees, and only restored under the same conditions.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        tasks: Dict[str, Any],
+        depends_on: Dict[str, List[str]],
+        inputs: Dict[str, Any],
+        artifacts=None,
+        produces: Optional[Dict[str, List[str]]] = None,
+        is_valid: Optional[Callable[[str], bool]] = None,
+        force: bool = False
+    ):
+        self.directory = directory
+        self.tasks = tasks
+        self.depends_on = depends_on
+        self.inputs = inputs
+        self.artifacts = artifacts
+        self.produces = produces or {}
+        self.is_valid = is_valid or (lambda name: True)
+        self.force = force
+        self.resumed: List[str] = []
+        self._fingerprints: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.json")
+
+    def key(self, name: str) -> str:
+        with self._lock:
+            upstream = {dep: self._fingerprints[dep] for dep in self.depends_on.get(name, [])}
+        return fingerprint({"inputs": self.inputs, "task": task_config(self.tasks[name]), "upstream": upstream})
+
+    def restore(self, name: str) -> Optional[Any]:
+        """The checkpointed output of `name`, with its artifacts restored, or None to run it"""
+        if self.force:
+            return None
+        key = self.key(name)
+        try:
+            with open(self.path(name), "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except FileNotFoundError:
+            return None
+        except ValueError as e:
+            print(f"Ignoring unreadable checkpoint for {name}: {e}")
+            return None
+        if record.get("key") != key:
+            print(f"Checkpoint for {name} is out of date")
+            return None
+        saved = record.get("artifacts") or {}
+        if any(not saved.get(artifact) for artifact in self.produces.get(name, [])) or not self.is_valid(name):
+            return None
+
+        if self.artifacts is not None:
+            for artifact, items in saved.items():
+                self.artifacts.put(artifact, items)
+        with self._lock:
+            self._fingerprints[name] = record["fingerprint"]
+            self.resumed.append(name)
+
+        from crewai.tasks.task_output import TaskOutput
+        task = self.tasks[name]
+        return TaskOutput(
+            description=task.description,
+            expected_output=task.expected_output,
+            raw=record["raw"],
+            agent=task.agent.role
+        )
+
+    def save(self, name: str, output: Any) -> None:
+        """Checkpoint a finished task, unless its results are incomplete"""
+        key = self.key(name)
+        saved = {}
+        for artifact in self.produces.get(name, []):
+            items = self.artifacts.get(artifact) if self.artifacts is not None else None
+            if items:
+                saved[artifact] = items
+        record = {
+            "task": name,
+            "key": key,
+            "fingerprint": fingerprint({"key": key, "raw": output.raw, "artifacts": saved}),
+            "raw": output.raw,
+            "artifacts": saved,
+            "saved_at": datetime.now(timezone.utc).isoformat(),
+        }
+        # Downstream keys depend on this result whether or not it is kept
+        with self._lock:
+            self._fingerprints[name] = record["fingerprint"]
+
+        missing = [artifact for artifact in self.produces.get(name, []) if artifact not in saved]
+        if missing:
+            print(f"Not checkpointing {name}: artifact '{missing[0]}' was not produced")
+            return
+        if not self.is_valid(name):
+            print(f"Not checkpointing {name}: its results could not be verified")
+            return
+
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=f".{name}-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(record, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path(name))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
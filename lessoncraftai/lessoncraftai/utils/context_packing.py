@@ -0,0 +1,120 @@
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+from lessoncraftai.utils.tokens import DEFAULT_TOKEN_MODEL, count_tokens
+
+class Passage:
+    """One or more adjacent chunks of the same page, stitched into a single piece of context"""
+
+    def __init__(self, text: str, metadata: Dict[str, Any], vector: np.ndarray, score: float):
+        self.text = text
+        self.metadata = metadata
+        self.vector = vector
+        self.score = score
+        self.chunk_count = 1
+        self.tokens = 0
+        self.ids: List[str] = []
+
+    @property
+    def position(self):
+        return (
+            str(self.metadata.get("source", "")),
+            self.metadata.get("page", 0),
+            self.metadata.get("chunk_index", 0)
+        )
+
+def _normalize(vector: np.ndarray) -> np.ndarray:
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+def stitch(left: str, right: str, max_overlap: int = 200) -> str:
+    """Join two neighbouring chunks, keeping the text they share only once"""
+    for size in range(min(len(left), len(right), max_overlap), 0, -1):
+        if left.endswith(right[:size]):
+            return left + right[size:]
+    return f"{left} {right}"
+
+def merge_adjacent(passages: List[Passage], max_overlap: int = 200) -> List[Passage]:
+    """Merge retrieved chunks that follow each other on the same page"""
+    merged: List[Passage] = []
+    for passage in sorted(passages, key=lambda p: p.position):
+        previous = merged[-1] if merged else None
+        if (
+            previous is not None
+            and previous.position[:2] == passage.position[:2]
+            and passage.position[2] == previous.metadata.get("last_chunk_index", previous.position[2]) + 1
+        ):
+            previous.text = stitch(previous.text, passage.text, max_overlap)
+            previous.vector = _normalize(previous.vector * previous.chunk_count + passage.vector)
+            previous.score = max(previous.score, passage.score)
+            previous.chunk_count += 1
+            previous.ids.extend(passage.ids)
+            previous.metadata["last_chunk_index"] = passage.position[2]
+            continue
+        merged.append(passage)
+    return merged
+
+def pack_context(
+    query_vector: Optional[Sequence[float]],
+    candidates: List[Dict[str, Any]],
+    token_budget: int,
+    mmr_lambda: float = 0.5,
+    duplicate_threshold: float = 0.95,
+    max_overlap: int = 200,
+    model: str = DEFAULT_TOKEN_MODEL
+) -> Dict[str, Any]:
+    """Pick diverse, non-redundant passages from `candidates` that fit `token_budget`
+
+    Each candidate is {"text", "metadata", "vector"} plus an optional "score" that
+    replaces similarity to `query_vector` as its relevance (needed when
+    `query_vector` is None, e.g. for lexical retrieval). Adjacent chunks are merged first,
+    then passages are chosen greedily by maximal marginal relevance: relevance to the
+    query minus `1 - mmr_lambda` times similarity to what was already chosen. Passages
+    nearly identical to a chosen one are dropped, and ones that would overflow the
+    budget are skipped in favour of smaller ones. The result keeps document order.
+    """
+    query = _normalize(np.asarray(query_vector, dtype=np.float32)) if query_vector is not None else None
+    passages = []
+    for candidate in candidates:
+        vector = _normalize(np.asarray(candidate["vector"], dtype=np.float32))
+        relevance = candidate["score"] if candidate.get("score") is not None else float(vector @ query)
+        passage = Passage(candidate["text"], dict(candidate.get("metadata") or {}), vector, relevance)
+        if candidate.get("id"):
+            passage.ids.append(candidate["id"])
+        passages.append(passage)
+    passages = merge_adjacent(passages, max_overlap)
+    for passage in passages:
+        passage.tokens = count_tokens(passage.text, model)
+
+    selected: List[Passage] = []
+    remaining = list(passages)
+    used = 0
+    duplicates = 0
+    while remaining:
+        best: Optional[Passage] = None
+        best_score = -np.inf
+        for passage in remaining:
+            redundancy = max((float(passage.vector @ chosen.vector) for chosen in selected), default=0.0)
+            score = mmr_lambda * passage.score - (1 - mmr_lambda) * redundancy
+            if score > best_score:
+                best, best_score = passage, score
+        remaining.remove(best)
+
+        if selected and max(float(best.vector @ chosen.vector) for chosen in selected) >= duplicate_threshold:
+            duplicates += 1
+            continue
+        if used + best.tokens > token_budget:
+            continue
+        selected.append(best)
+        used += best.tokens
+
+    selected.sort(key=lambda p: p.position)
+    return {
+        "text": "\n\n".join(p.text for p in selected),
+        "tokens": used,
+        "candidates": len(candidates),
+        "passages": len(passages),
+        "selected": len(selected),
+        "chunks": sum(p.chunk_count for p in selected),
+        "ids": [chunk_id for p in selected for chunk_id in p.ids],
+        "duplicates": duplicates,
+    }
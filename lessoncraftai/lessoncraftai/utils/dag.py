@@ -0,0 +1,121 @@
+from typing import Any, Callable, Dict, List, Optional
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import yaml
+from lessoncraftai.utils.tracing import span
+
+def load_task_graph(path: str) -> Dict[str, Any]:
+    """Read the `tasks` dependency graph and `scheduler` settings from crew.yaml"""
+    with open(path, "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f) or {}
+    tasks = config.get("tasks") or {}
+    return {
+        "depends_on": {name: list((spec or {}).get("depends_on") or []) for name, spec in tasks.items()},
+        "max_concurrency": int((config.get("scheduler") or {}).get("max_concurrency", 1))
+    }
+
+def topological_order(depends_on: Dict[str, List[str]]) -> List[str]:
+    """Order task names so dependencies come first, breaking ties by declaration order"""
+    for name, deps in depends_on.items():
+        for dep in deps:
+            if dep not in depends_on:
+                raise ValueError(f"Task '{name}' depends on unknown task '{dep}'")
+    order = []
+    done = set()
+    while len(order) < len(depends_on):
+        ready = [n for n in depends_on if n not in done and all(d in done for d in depends_on[n])]
+        if not ready:
+            cycle = sorted(n for n in depends_on if n not in done)
+            raise ValueError(f"Task graph has a dependency cycle among: {', '.join(cycle)}")
+        order.extend(ready)
+        done.update(ready)
+    return order
+
+class GraphResult:
+    """Outputs of a scheduled run, always listed in task declaration order"""
+
+    def __init__(self, outputs: Dict[str, Any]):
+        self.outputs = outputs
+
+    @property
+    def tasks_output(self) -> List[Any]:
+        return list(self.outputs.values())
+
+    @property
+    def raw(self) -> str:
+        return "\n\n".join(f"## {name}\n{output.raw}" for name, output in self.outputs.items())
+
+    def __str__(self) -> str:
+        return self.raw
+
+class DAGScheduler:
+    """Runs crew tasks as soon as their dependencies finish, up to max_concurrency at once"""
+
+    def __init__(
+        self,
+        tasks: Dict[str, Any],
+        depends_on: Dict[str, List[str]],
+        max_concurrency: int = 1,
+        on_complete: Optional[Callable[[str, Any], None]] = None,
+        checkpoints=None
+    ):
+        missing = [name for name in depends_on if name not in tasks]
+        if missing:
+            raise ValueError(f"crew.yaml lists tasks that are not defined: {', '.join(missing)}")
+        self.tasks = tasks
+        self.depends_on = {name: depends_on.get(name, []) for name in tasks}
+        self.order = topological_order(self.depends_on)
+        self.max_concurrency = max(1, max_concurrency)
+        self.on_complete = on_complete
+        # Optional TaskCheckpointer; finished tasks are restored from it instead of rerun
+        self.checkpoints = checkpoints
+
+    def _context(self, name: str, outputs: Dict[str, Any]) -> Optional[str]:
+        deps = self.depends_on[name]
+        if not deps:
+            return None
+        return "\n\n".join(outputs[dep].raw for dep in deps)
+
+    def _execute(self, name: str, context: Optional[str]) -> Any:
+        task = self.tasks[name]
+        with span("task", name, agent=getattr(task.agent, "role", None)) as s:
+            if self.checkpoints is not None:
+                output = self.checkpoints.restore(name)
+                if output is not None:
+                    print(f"Resumed task {name} from its checkpoint")
+                    s.set(resumed=True)
+                    return output
+            print(f"Starting task {name}")
+            output = task.execute_sync(agent=task.agent, context=context)
+            if self.checkpoints is not None:
+                self.checkpoints.save(name, output)
+            return output
+
+    def run(self) -> GraphResult:
+        outputs = {}
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            while len(outputs) < len(self.order):
+                # Submit every ready task in a stable order while there is capacity
+                for name in self.order:
+                    if len(running) >= self.max_concurrency:
+                        break
+                    if name in outputs or name in running.values():
+                        continue
+                    if all(dep in outputs for dep in self.depends_on[name]):
+                        future = pool.submit(self._execute, name, self._context(name, outputs))
+                        running[future] = name
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        outputs[name] = future.result()
+                    except Exception:
+                        for other in running:
+                            other.cancel()
+                        raise
+                    print(f"Finished task {name}")
+                    if self.on_complete is not None:
+                        self.on_complete(name, outputs[name])
+
+        return GraphResult({name: outputs[name] for name in self.tasks})
@@ -0,0 +1,226 @@
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from array import array
+from langchain_core.embeddings import Embeddings
+from lessoncraftai.utils.tracing import span, tracing_enabled
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+
+# Defaults for the embedding layer, overridable through the environment
+DEFAULT_BACKEND = "openai"
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_CONCURRENCY = 4
+DEFAULT_CACHE_DIR = "./data/embedding_cache"
+DEFAULT_CACHE_MAX_MB = 512
+
+def text_hash(text: str) -> str:
+    """Return the cache key component for a piece of text"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+class LocalHashEmbeddings(Embeddings):
+    """Deterministic, offline embeddings built from hashed word features"""
+
+    def __init__(self, dimensions: int = 256):
+        self.dimensions = dimensions
+        self.model = f"local-hash-{dimensions}"
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimensions
+        for token in re.findall(r"\w+", text.lower()):
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            # Use one bit of the hash as the sign so collisions tend to cancel out
+            vector[value % self.dimensions] += 1.0 if value & (1 << 63) else -1.0
+        norm = math.sqrt(sum(v * v for v in vector))
+        if norm == 0:
+            return vector
+        return [v / norm for v in vector]
+
+class EmbeddingCache:
+    """Disk-backed embedding cache keyed by (model, text hash) with LRU size eviction"""
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            os.path.join(cache_dir, "embeddings.sqlite3"),
+            check_same_thread=False
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "model TEXT NOT NULL, text_hash TEXT NOT NULL, vector BLOB NOT NULL, "
+            "size INTEGER NOT NULL, last_access REAL NOT NULL, "
+            "PRIMARY KEY (model, text_hash))"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_last_access ON embeddings (last_access)"
+        )
+        self._conn.commit()
+
+    def get_many(self, model: str, hashes: List[str]) -> Dict[str, List[float]]:
+        """Return cached vectors for the given text hashes, refreshing their access time"""
+        found = {}
+        now = time.time()
+        with self._lock:
+            # Stay well below SQLite's bound parameter limit
+            for start in range(0, len(hashes), 500):
+                batch = hashes[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model, *batch]
+                ).fetchall()
+                for row_hash, blob in rows:
+                    found[row_hash] = array("f", blob).tolist()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_access = ? WHERE model = ? AND text_hash = ?",
+                    [(now, model, row_hash) for row_hash, _ in rows]
+                )
+            self._conn.commit()
+        return found
+
+    def put_many(self, model: str, vectors: Dict[str, List[float]]) -> None:
+        """Store vectors and evict the least recently used entries beyond the size limit"""
+        now = time.time()
+        rows = []
+        for row_hash, vector in vectors.items():
+            blob = array("f", vector).tobytes()
+            rows.append((model, row_hash, blob, len(blob), now))
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM embeddings").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        stale = []
+        for model, row_hash, size in self._conn.execute(
+            "SELECT model, text_hash, size FROM embeddings ORDER BY last_access"
+        ):
+            if total <= self.max_bytes:
+                break
+            stale.append((model, row_hash))
+            total -= size
+        self._conn.executemany(
+            "DELETE FROM embeddings WHERE model = ? AND text_hash = ?", stale
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+class BatchedEmbeddings(Embeddings):
+    """Embeds texts in fixed-size batches with bounded concurrency and a shared cache"""
+
+    def __init__(
+        self,
+        backend: Embeddings,
+        model: str,
+        cache: Optional[EmbeddingCache] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_concurrency: int = DEFAULT_CONCURRENCY,
+        scheduler=None
+    ):
+        self.backend = backend
+        self.model = model
+        self.cache = cache
+        self.batch_size = max(1, batch_size)
+        self.max_concurrency = max(1, max_concurrency)
+        # Optional RequestScheduler that paces batches against the provider's rate limits
+        self.scheduler = scheduler
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        with span("embedding", self.model, texts=len(texts)) as s:
+            hashes = [text_hash(text) for text in texts]
+            vectors = self.cache.get_many(self.model, list(set(hashes))) if self.cache else {}
+            s.set(cache_hits=len(vectors))
+
+            # Embed each distinct uncached text once
+            missing = {}
+            for row_hash, text in zip(hashes, texts):
+                if row_hash not in vectors:
+                    missing.setdefault(row_hash, text)
+            if missing:
+                missing_hashes = list(missing)
+                batches = [
+                    missing_hashes[start:start + self.batch_size]
+                    for start in range(0, len(missing_hashes), self.batch_size)
+                ]
+                s.set(batches=len(batches))
+                with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as pool:
+                    results = pool.map(lambda batch: self._embed_batch([missing[h] for h in batch], s), batches)
+                    fresh = {}
+                    for batch, batch_vectors in zip(batches, results):
+                        fresh.update(zip(batch, batch_vectors))
+                if self.cache:
+                    self.cache.put_many(self.model, fresh)
+                vectors.update(fresh)
+
+            return [vectors[row_hash] for row_hash in hashes]
+
+    def _embed_batch(self, texts: List[str], parent) -> List[List[float]]:
+        # Runs on a pool thread, so the parent span is passed in rather than inherited
+        with span("embedding", "batch", parent=parent, texts=len(texts)) as s:
+            if tracing_enabled():
+                from lessoncraftai.utils.tokens import count_tokens
+                s.set(tokens=sum(count_tokens(text) for text in texts))
+            if self.scheduler is not None:
+                from lessoncraftai.utils.tokens import count_tokens
+                tokens = sum(count_tokens(text) for text in texts)
+                return self.scheduler.call(self.model, lambda: self.backend.embed_documents(texts), tokens)
+            return self.backend.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+def build_embeddings(scheduler=None) -> BatchedEmbeddings:
+    """Build the embedding layer from LESSONCRAFT_* environment settings
+
+    API requests go through `scheduler` when one is given, which then owns retries.
+    """
+    backend_name = os.getenv("LESSONCRAFT_EMBEDDING_BACKEND", DEFAULT_BACKEND).lower()
+    if backend_name == "local":
+        backend = LocalHashEmbeddings()
+        model = backend.model
+        scheduler = None
+    elif backend_name == "openai":
+        from langchain_community.embeddings import OpenAIEmbeddings
+        model = os.getenv("LESSONCRAFT_EMBEDDING_MODEL", "text-embedding-ada-002")
+        backend = OpenAIEmbeddings(model=model, **({"max_retries": 0} if scheduler is not None else {}))
+    else:
+        raise ValueError(f"Unknown embedding backend: {backend_name}")
+
+    cache = None
+    cache_max_mb = int(os.getenv("LESSONCRAFT_EMBED_CACHE_MAX_MB", DEFAULT_CACHE_MAX_MB))
+    if cache_max_mb > 0:
+        cache = EmbeddingCache(
+            os.getenv("LESSONCRAFT_EMBED_CACHE_DIR", DEFAULT_CACHE_DIR),
+            cache_max_mb * 1024 * 1024
+        )
+
+    return BatchedEmbeddings(
+        backend=backend,
+        model=model,
+        cache=cache,
+        batch_size=int(os.getenv("LESSONCRAFT_EMBED_BATCH_SIZE", DEFAULT_BATCH_SIZE)),
+        max_concurrency=int(os.getenv("LESSONCRAFT_EMBED_CONCURRENCY", DEFAULT_CONCURRENCY)),
+        scheduler=scheduler
+    )
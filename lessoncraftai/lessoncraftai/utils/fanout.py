@@ -0,0 +1,147 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import json
+from lessoncraftai.utils.artifacts import TOPICS, read_upstream, summarize
+from lessoncraftai.utils.checkpoints import tool_config
+from lessoncraftai.utils.streaming import windowed
+from lessoncraftai.utils.tracing import current_span, span
+
+def fan_out(
+    items: List[Dict[str, Any]],
+    work: Callable[[Dict[str, Any]], Dict[str, Any]],
+    name: str,
+    max_parallel: int = 4,
+    batch_size: int = 1,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Apply `work` to every topic in batches of `batch_size`, `max_parallel` batches at once
+
+    Returns the results in the order of `items` and a failure record
+    ({"topic", "error", "index"}) for each topic whose `work` raised, so one bad
+    topic never loses the others. `on_result` sees each result as soon as it exists.
+    """
+    batches = list(windowed(list(enumerate(items)), max(1, batch_size)))
+    parent = current_span()
+
+    def run_batch(batch):
+        outcomes = []
+        with span("fanout", name, parent=parent, topics=len(batch)) as s:
+            for index, item in batch:
+                try:
+                    result = work(item)
+                except Exception as e:
+                    print(f"{name} failed for topic {item.get('topic')}: {e}")
+                    s.add("failures")
+                    outcomes.append((None, {
+                        "topic": item.get("topic", "Unknown Topic"),
+                        "error": f"{type(e).__name__}: {str(e)}",
+                        "index": index,
+                    }))
+                    continue
+                if on_result is not None:
+                    on_result(result)
+                outcomes.append((result, None))
+        return outcomes
+
+    if len(batches) <= 1 or max_parallel <= 1:
+        per_batch = [run_batch(batch) for batch in batches]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_parallel, len(batches))) as pool:
+            per_batch = list(pool.map(run_batch, batches))
+
+    results = [result for outcomes in per_batch for result, _ in outcomes if result is not None]
+    failures = [failure for outcomes in per_batch for _, failure in outcomes if failure is not None]
+    return results, failures
+
+def describe_failures(failures: List[Dict[str, Any]]) -> str:
+    """Suffix for a tool result naming the topics that could not be generated"""
+    if not failures:
+        return ""
+    topics = ", ".join(f"{f['topic']} ({f['error']})" for f in failures[:5])
+    more = f" and {len(failures) - 5} more" if len(failures) > 5 else ""
+    return f"; {len(failures)} topics failed: {topics}{more}"
+
+def generate(
+    items: List[Dict[str, Any]],
+    work: Callable[[Dict[str, Any]], Dict[str, Any]],
+    stage: str,
+    name: str,
+    outputs: Optional[Any] = None,
+    config: Optional[Dict[str, Any]] = None,
+    topics: Optional[List[Dict[str, Any]]] = None,
+    max_parallel: int = 4,
+    batch_size: int = 1,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """fan_out() over the items whose output in the TopicOutputStore `outputs` cannot be reused, merged back in order"""
+    if outputs is None:
+        return fan_out(items, work, name, max_parallel=max_parallel, batch_size=batch_size, on_result=on_result)
+
+    keys, reused = outputs.split(stage, items, config or {}, topics)
+    if on_result is not None:
+        for index in sorted(reused):
+            on_result(reused[index])
+    pending = [index for index in range(len(items)) if index not in reused]
+    generated, failures = fan_out(
+        [items[index] for index in pending], work, name,
+        max_parallel=max_parallel, batch_size=batch_size, on_result=on_result
+    )
+
+    # fan_out() keeps order and leaves failed items out, so walk the pending items alongside it
+    failed = {failure["index"] for failure in failures}
+    produced = iter(generated)
+    fresh = {index: next(produced) for position, index in enumerate(pending) if position not in failed}
+    for failure in failures:
+        failure["index"] = pending[failure["index"]]
+
+    results = []
+    stored = {}
+    for index in range(len(items)):
+        result = reused.get(index, fresh.get(index))
+        if result is not None:
+            results.append(result)
+            stored[keys[index]] = result
+    outputs.save(stage, stored, reused=len(reused), generated=len(fresh), failed=[f["topic"] for f in failures])
+    print(f"Reused {len(reused)} stored {stage.replace('_', ' ')} and generated {len(fresh)}")
+    return results, failures
+
+def run_generator(
+    tool: Any,
+    arguments: Any,
+    upstream: str,
+    produced: str,
+    kind: str,
+    work: Callable[[Dict[str, Any]], Dict[str, Any]],
+    default: List[Dict[str, Any]]
+) -> str:
+    """Shared `_run` of the per-topic generator tools: `work` builds the `kind` record for one upstream item
+
+    `tool` provides the artifacts, sink, outputs, max_parallel and batch_size
+    fields. The records are stored as the `produced` artifact when the tool has
+    an ArtifactStore, otherwise returned as JSON.
+    """
+    # Read the upstream artifact, fan out per topic (reusing the stored output of
+    # topics unchanged since an earlier run), stream records and failures, and
+    # store the result so the tool returns a summary instead of the records
+    items = read_upstream(tool.artifacts, upstream, arguments, default)
+    topics = items if upstream == TOPICS else (tool.artifacts.get(TOPICS) if tool.artifacts is not None else None)
+    sink = tool.sink
+    results, failures = generate(
+        items, work, produced, tool.name,
+        outputs=tool.outputs,
+        config=tool_config(tool) if tool.outputs is not None else None,
+        topics=topics,
+        max_parallel=tool.max_parallel,
+        batch_size=tool.batch_size,
+        on_result=(lambda record: sink.emit(kind, record["topic"], record)) if sink is not None else None
+    )
+    if sink is not None:
+        for failure in failures:
+            sink.emit("error", failure["topic"], {"stage": kind, "error": failure["error"]})
+    if not results:
+        return f"Error generating {produced.replace('_', ' ')}: all {len(items)} topics failed{describe_failures(failures)}"
+
+    if tool.artifacts is not None:
+        tool.artifacts.put(produced, results)
+        return summarize(produced, results) + describe_failures(failures)
+    return json.dumps(results, indent=2)
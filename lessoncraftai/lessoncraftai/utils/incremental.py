@@ -0,0 +1,160 @@
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timezone
+import json
+import os
+import tempfile
+import threading
+from lessoncraftai.utils.artifacts import ARTIFACT_NAMES
+from lessoncraftai.utils.checkpoints import fingerprint
+from lessoncraftai.utils.topics import topic_id
+
+# Topic fields that say where a topic's sources are, not what they contain
+_LOCATION_FIELDS = ("source_chunks",)
+
+TOPIC_INDEX_FILE = "topics.json"
+CHANGE_REPORT_FILE = "change_report.json"
+
+def topic_key(topic: Dict[str, Any]) -> str:
+    """Fingerprint of a topic's name, objectives and source content"""
+    return fingerprint({
+        "topic": topic_id(topic.get("topic", "")),
+        "objectives": topic.get("objectives") or [],
+        "source_hash": topic.get("source_hash"),
+    })
+
+def _write_json(path: str, value: Any) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".topic-outputs-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(value, f, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def _read_json(path: str) -> Optional[Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except ValueError as e:
+        print(f"Ignoring unreadable {path}: {e}")
+        return None
+
+class TopicOutputStore:
+    """Per-topic results of earlier runs, so a revised curriculum only regenerates what changed
+
+    Each generator stage stores its outputs keyed by the stage, the tool's
+    settings, the fingerprint of the topic they belong to (name, objectives
+    and the hash of its source chunks) and the input item itself. An output is
+    reused when all of these match; anything else is generated again. At the
+    end of a successful run, finish() compares the topics with the previous
+    run's and writes a change report.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self.begin_run()
+
+    def begin_run(self, force: bool = False) -> None:
+        """Load the previous run's topics; with `force` nothing is reused"""
+        self.force = force
+        index = _read_json(os.path.join(self.directory, TOPIC_INDEX_FILE)) or {}
+        self.previous: Dict[str, Dict[str, Any]] = index.get("topics") or {}
+        self.previous_run: Optional[str] = index.get("saved_at")
+        with self._lock:
+            self.stages: Dict[str, Dict[str, Any]] = {}
+
+    def previous_topic(self, name: str) -> Optional[Dict[str, Any]]:
+        """The previous run's record of a topic, unless this run recomputes everything"""
+        if self.force:
+            return None
+        return self.previous.get(topic_id(name))
+
+    def split(
+        self,
+        stage: str,
+        items: List[Dict[str, Any]],
+        config: Dict[str, Any],
+        topics: Optional[List[Dict[str, Any]]] = None
+    ) -> Tuple[List[str], Dict[int, Dict[str, Any]]]:
+        """Keys for `items` and, by position, the stored outputs that can be reused"""
+        topic_keys = {topic_id(topic.get("topic", "")): topic_key(topic) for topic in topics or []}
+        stored = {} if self.force else (_read_json(self._path(stage)) or {}).get("outputs") or {}
+        keys = []
+        reused = {}
+        for index, item in enumerate(items):
+            key = fingerprint({
+                "stage": stage,
+                "config": config,
+                "topic": topic_keys.get(topic_id(item.get("topic", ""))),
+                "input": {k: v for k, v in item.items() if k not in _LOCATION_FIELDS},
+            })
+            keys.append(key)
+            if key in stored:
+                reused[index] = stored[key]
+        return keys, reused
+
+    def save(self, stage: str, outputs: Dict[str, Dict[str, Any]], reused: int, generated: int, failed: List[str]) -> None:
+        """Keep this run's outputs for `stage`, dropping those of topics that are gone"""
+        _write_json(self._path(stage), {"saved_at": datetime.now(timezone.utc).isoformat(), "outputs": outputs})
+        with self._lock:
+            self.stages[stage] = {"reused": reused, "generated": generated, "failed": failed}
+
+    def finish(self, topics: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Compare `topics` with the previous run's, write the change report and remember them"""
+        current = {
+            topic_id(topic["topic"]): {
+                "topic": topic["topic"],
+                "key": topic_key(topic),
+                "objectives": topic.get("objectives") or [],
+                "source_hash": topic.get("source_hash"),
+                "source_chunks": topic.get("source_chunks") or [],
+            }
+            for topic in topics if topic.get("topic")
+        }
+        changes: Dict[str, List[Any]] = {"added": [], "changed": [], "removed": [], "unchanged": []}
+        for key, entry in current.items():
+            before = self.previous.get(key)
+            if before is None:
+                changes["added"].append(entry["topic"])
+            elif before.get("key") == entry["key"]:
+                changes["unchanged"].append(entry["topic"])
+            else:
+                fields = [name for name in ("objectives", "source_hash") if before.get(name) != entry[name]]
+                changes["changed"].append({
+                    "topic": entry["topic"],
+                    "changed": ["sources" if name == "source_hash" else name for name in fields] or ["name"],
+                })
+        changes["removed"] = [entry["topic"] for key, entry in self.previous.items() if key not in current]
+
+        with self._lock:
+            stages = {name: self.stages[name] for name in ARTIFACT_NAMES if name in self.stages}
+        report = {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "previous_run": self.previous_run,
+            "topics": changes,
+            "stages": stages,
+        }
+        _write_json(os.path.join(self.directory, CHANGE_REPORT_FILE), report)
+        _write_json(os.path.join(self.directory, TOPIC_INDEX_FILE), {"saved_at": report["generated_at"], "topics": current})
+        return report
+
+    def _path(self, stage: str) -> str:
+        return os.path.join(self.directory, f"{stage}.json")
+
+def format_change_report(report: Dict[str, Any]) -> str:
+    topics = report["topics"]
+    lines = [
+        f"Topics: {len(topics['added'])} added, {len(topics['changed'])} changed, "
+        f"{len(topics['removed'])} removed, {len(topics['unchanged'])} unchanged"
+        + (" (first run)" if report["previous_run"] is None else f" since {report['previous_run']}")
+    ]
+    for stage, stats in report["stages"].items():
+        failed = f", {len(stats['failed'])} failed" if stats["failed"] else ""
+        lines.append(f"  {stage}: {stats['generated']} generated, {stats['reused']} reused{failed}")
+    return "\n".join(lines)
@@ -0,0 +1,122 @@
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Defaults for the opt-in response cache, overridable through the environment
+DEFAULT_CACHE_DIR = "./data/llm_cache"
+DEFAULT_TTL_HOURS = 168
+DEFAULT_MAX_ENTRIES = 10000
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def make_key(model: str, temperature: Optional[float], prompt: str, context: str = "") -> str:
+    """Cache key from the model settings and the hashes of the prompt and retrieved context"""
+    return _sha256(json.dumps([model, temperature, _sha256(prompt), _sha256(context)]))
+
+class ResponseCache:
+    """Disk-backed LLM response cache with LRU and TTL eviction and hit/miss counters"""
+
+    def __init__(self, cache_dir: str, ttl_seconds: float, max_entries: int):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            os.path.join(cache_dir, "responses.sqlite3"),
+            check_same_thread=False
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, model TEXT NOT NULL, response TEXT NOT NULL, "
+            "created_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                self._bump("misses")
+            else:
+                self.hits += 1
+                self._bump("hits")
+                self._conn.execute(
+                    "UPDATE responses SET last_access = ? WHERE key = ?", (now, key)
+                )
+            self._conn.commit()
+        return row[0] if row is not None else None
+
+    def put(self, key: str, model: str, response: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, model, response, now, now)
+            )
+            # Drop expired entries, then the least recently used beyond the size limit
+            self._conn.execute(
+                "DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def _bump(self, name: str) -> None:
+        self._conn.execute(
+            "INSERT INTO stats (name, value) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,)
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counts for this process and across all runs sharing the cache"""
+        with self._lock:
+            totals = dict(self._conn.execute("SELECT name, value FROM stats").fetchall())
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "total_hits": totals.get("hits", 0),
+            "total_misses": totals.get("misses", 0),
+            "entries": entries
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+def build_response_cache() -> Optional[ResponseCache]:
+    """Build the response cache if LESSONCRAFT_LLM_CACHE is enabled, else None"""
+    if os.getenv("LESSONCRAFT_LLM_CACHE", "").lower() not in ("1", "true", "yes"):
+        return None
+    return ResponseCache(
+        os.getenv("LESSONCRAFT_LLM_CACHE_DIR", DEFAULT_CACHE_DIR),
+        float(os.getenv("LESSONCRAFT_LLM_CACHE_TTL_HOURS", DEFAULT_TTL_HOURS)) * 3600,
+        int(os.getenv("LESSONCRAFT_LLM_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+    )
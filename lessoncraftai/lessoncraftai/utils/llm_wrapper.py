@@ -0,0 +1,25 @@
+from typing import Any
+from crewai import BaseLLM
+
+class WrappedLLM(BaseLLM):
+    """Agent LLM that delegates to `inner`; subclasses override call() and reach it through _forward()"""
+
+    inner: Any
+
+    def _forward(self, messages, tools=None, callbacks=None, available_functions=None, **kwargs):
+        # Agents set stop words on the LLM they were given; pass them through
+        if self.stop:
+            self.inner.stop = self.stop
+        return self.inner.call(messages, tools, callbacks, available_functions, **kwargs)
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, **kwargs):
+        return self._forward(messages, tools, callbacks, available_functions, **kwargs)
+
+    def supports_function_calling(self) -> bool:
+        return self.inner.supports_function_calling()
+
+    def supports_stop_words(self) -> bool:
+        return self.inner.supports_stop_words()
+
+    def get_context_window_size(self) -> int:
+        return self.inner.get_context_window_size()
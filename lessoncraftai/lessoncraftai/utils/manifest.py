@@ -0,0 +1,93 @@
+from typing import Dict, List, Optional
+from datetime import datetime, timezone
+from pydantic import BaseModel, Field
+import hashlib
+import json
+import os
+import tempfile
+
+MANIFEST_FILE = "ingest_manifest.json"
+
+class IngestManifest(BaseModel):
+    """Summary of the last successful ingest into a vector store"""
+    sources: Dict[str, str] = Field(description="Source PDF path -> SHA-256 of the file")
+    chunk_count: int = Field(description="Number of chunks stored in the collection")
+    chunk_size: int
+    chunk_overlap: int
+    embedding_model: str
+    vector_backend: str = Field(default="chroma", description="Vector store implementation the chunks were written to")
+    chunking: str = Field(default="recursive", description="How pages were cut into chunks")
+    ingested_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+
+    def matches(
+        self,
+        sources: Dict[str, str],
+        chunk_size: int,
+        chunk_overlap: int,
+        embedding_model: str,
+        vector_backend: str = "chroma",
+        chunking: str = "recursive"
+    ) -> bool:
+        """Whether an ingest with these inputs would reproduce this manifest"""
+        return (
+            self.chunk_count > 0
+            and self.sources == sources
+            and self.chunk_size == chunk_size
+            and self.chunk_overlap == chunk_overlap
+            and self.embedding_model == embedding_model
+            and self.vector_backend == vector_backend
+            and self.chunking == chunking
+        )
+
+def manifest_path(persist_dir: str) -> str:
+    return os.path.join(persist_dir, MANIFEST_FILE)
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def hash_sources(paths: List[str]) -> Dict[str, str]:
+    return {path: file_sha256(path) for path in paths}
+
+def load_manifest(persist_dir: str) -> Optional[IngestManifest]:
+    """Read the manifest for a vector store, or None if it is missing or unreadable"""
+    try:
+        with open(manifest_path(persist_dir), "r", encoding="utf-8") as f:
+            return IngestManifest.model_validate(json.load(f))
+    except (OSError, ValueError) as e:
+        if not isinstance(e, FileNotFoundError):
+            print(f"Ignoring unreadable ingest manifest: {e}")
+        return None
+
+def write_manifest(persist_dir: str, manifest: IngestManifest) -> None:
+    """Atomically replace the manifest so readers never see a partial file"""
+    os.makedirs(persist_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=persist_dir, prefix=".manifest-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(manifest.model_dump(), f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, manifest_path(persist_dir))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def remove_manifest(persist_dir: str) -> None:
+    try:
+        os.remove(manifest_path(persist_dir))
+    except FileNotFoundError:
+        pass
+
+def indexed_chunk_count(persist_dir: str, handle=None) -> int:
+    """Number of indexed chunks from the manifest, falling back to a count-only query"""
+    manifest = load_manifest(persist_dir)
+    if manifest is not None and (handle is None or manifest.vector_backend == handle.backend):
+        return manifest.chunk_count
+    if handle is None:
+        return 0
+    return handle.count()
@@ -0,0 +1,100 @@
+from typing import Any, Callable, Dict, Iterator, Optional
+from datetime import datetime, timezone
+import json
+import os
+import sys
+import threading
+import time
+
+def _take_stdout():
+    """A private copy of stdout for the records (and whether to close it), with stdout moved to stderr"""
+    sys.stdout.flush()
+    try:
+        fd = sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        # No real descriptor (e.g. captured output): only Python-level prints can be moved
+        stream = sys.stdout
+        sys.stdout = sys.stderr
+        return stream, False
+    stream = os.fdopen(os.dup(fd), "w", encoding="utf-8")
+    os.dup2(sys.stderr.fileno(), fd)
+    return stream, True
+
+class NDJSONSink:
+    """Writes one JSON record per line and flushes it, so consumers can tail the output
+
+    Use path "-" for stdout. Records look like
+    {"seq": 3, "kind": "lesson_plan", "topic": "Fractions", "emitted_at": "...", "data": {...}}.
+    With "-" the sink keeps stdout to itself: everything else the process prints
+    from then on, including logs of crewai and other libraries, goes to stderr.
+    """
+
+    def __init__(self, path: str = "-", append: bool = False):
+        self.path = path
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._listeners = []
+        if path == "-":
+            self._file, self._owns_file = _take_stdout()
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._file = open(path, "a" if append else "w", encoding="utf-8")
+            self._owns_file = True
+
+    def subscribe(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """Also hand every record to `listener` (called under the sink's lock, keep it quick)"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def emit(self, kind: str, topic: Optional[str], data: Any) -> Dict[str, Any]:
+        with self._lock:
+            self._seq += 1
+            record = {
+                "seq": self._seq,
+                "kind": kind,
+                "topic": topic,
+                "emitted_at": datetime.now(timezone.utc).isoformat(),
+                "data": data
+            }
+            self._file.write(json.dumps(record, default=str) + "\n")
+            self._file.flush()
+            for listener in self._listeners:
+                listener(record)
+        return record
+
+    def close(self) -> None:
+        with self._lock:
+            if self._owns_file and not self._file.closed:
+                self._file.close()
+
+def tail_ndjson(
+    path: str,
+    follow: bool = False,
+    poll_interval: float = 0.2,
+    stop: Optional[threading.Event] = None
+) -> Iterator[Dict[str, Any]]:
+    """Yield records from an NDJSON file, optionally waiting for new ones like `tail -f`
+
+    A line is only yielded once it is complete, so a record being written is never
+    returned half-finished.
+    """
+    while follow and not os.path.exists(path):
+        if stop is not None and stop.is_set():
+            return
+        time.sleep(poll_interval)
+
+    with open(path, "r", encoding="utf-8") as f:
+        partial = ""
+        while True:
+            line = f.readline()
+            if line:
+                partial += line
+                if not partial.endswith("\n"):
+                    continue
+                if partial.strip():
+                    yield json.loads(partial)
+                partial = ""
+                continue
+            if not follow or (stop is not None and stop.is_set()):
+                return
+            time.sleep(poll_interval)
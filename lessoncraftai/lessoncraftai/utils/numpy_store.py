@@ -0,0 +1,366 @@
+from typing import Any, Dict, List, Optional, Tuple
+from langchain_core.embeddings import Embeddings
+from lessoncraftai.utils.quantization import DTYPES, dequantize, quantize, scores, top_k
+from lessoncraftai.utils.tracing import span, tracing_enabled
+import json
+import numpy as np
+import os
+import tempfile
+import threading
+
+INDEX_FILE = "vector_index.json"
+
+def _write_json_atomic(path: str, payload: Dict[str, Any]) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".index-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+class NumpyVectorStore:
+    """Vector store kept as one float32 matrix in a memory-mapped file, searched with NumPy
+
+    Vectors are L2-normalized on write, so a query is a single matrix-vector
+    product. The matrix file is opened read-only with np.memmap, so opening is
+    cheap and processes reading the same store share its pages through the OS
+    page cache. Chunk IDs, texts and metadata live in vector_index.json, which
+    records how many rows of the matrix are valid; rows appended after the last
+    persist() are ignored (and truncated) if the process dies before it.
+
+    Vectors can be stored as float16, or as int8 with one float32 scale per row,
+    to cut the scanned matrix by 2x or ~4x. A quantized store created with
+    `rerank` set also keeps a float32 copy of every row in a sidecar memmap, and
+    the top k*rerank candidates of a search are rescored from it. Only those
+    rows of the sidecar are read, so the memory a search touches stays small,
+    but the store takes more disk than float32 alone. A store keeps the dtype,
+    and whether it has the sidecar, it was created with.
+
+    Same interface as VectorStoreHandle, selected with LESSONCRAFT_VECTOR_BACKEND=numpy.
+    """
+
+    backend = "numpy"
+
+    def __init__(self, persist_dir: str, embeddings: Embeddings, dtype: str = "float32", rerank: int = 0):
+        if dtype not in DTYPES:
+            raise ValueError(f"Unknown vector dtype: {dtype}. Expected one of: {', '.join(DTYPES)}")
+        self.persist_dir = persist_dir
+        self.embeddings = embeddings
+        self.dtype = dtype
+        self.rerank = rerank
+        self.lock = threading.RLock()
+        os.makedirs(persist_dir, exist_ok=True)
+
+        self._ids: List[str] = []
+        self._documents: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        self._alive: List[bool] = []
+        self._dim: Optional[int] = None
+        self._generation = 0
+        self._rows = 0
+        self._matrix: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+        self._exact: Optional[np.ndarray] = None
+        self._has_exact = rerank > 0 and dtype != "float32"
+        self._appended: List[np.ndarray] = []
+        self._positions: Optional[Dict[str, int]] = None
+        self._dirty = False
+        self._load()
+
+    # Loading and persistence
+
+    def _index_path(self) -> str:
+        return os.path.join(self.persist_dir, INDEX_FILE)
+
+    def _vectors_path(self, generation: int) -> str:
+        return os.path.join(self.persist_dir, f"vectors-{generation}.{self.dtype}")
+
+    def _scales_path(self, generation: int) -> str:
+        return os.path.join(self.persist_dir, f"scales-{generation}.float32")
+
+    def _exact_path(self, generation: int) -> str:
+        return os.path.join(self.persist_dir, f"exact-{generation}.float32")
+
+    def _load(self) -> None:
+        try:
+            with open(self._index_path(), "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            return
+        self._ids = index["ids"]
+        self._documents = index["documents"]
+        self._metadatas = index["metadatas"]
+        self._alive = [True] * len(self._ids)
+        self._dim = index["dim"]
+        self._generation = index["generation"]
+        stored_dtype = index.get("dtype", "float32")
+        if stored_dtype != self.dtype:
+            print(f"Vector store at {self.persist_dir} holds {stored_dtype} vectors; using {stored_dtype} instead of {self.dtype}")
+            self.dtype = stored_dtype
+        self._has_exact = index.get("exact_vectors", False)
+        if self.rerank and self.dtype != "float32" and not self._has_exact:
+            print(f"Vector store at {self.persist_dir} has no full-precision vectors to re-rank with; re-ingest with LESSONCRAFT_VECTOR_RERANK set")
+        self._rows = len(self._ids)
+        self._open_matrix()
+
+    def _open_matrix(self) -> None:
+        if self._rows and self._dim:
+            self._matrix = np.memmap(
+                self._vectors_path(self._generation), dtype=self.dtype, mode="r", shape=(self._rows, self._dim)
+            )
+            self._scales = None
+            if self.dtype == "int8":
+                self._scales = np.memmap(self._scales_path(self._generation), dtype=np.float32, mode="r", shape=(self._rows,))
+            self._exact = None
+            if self._has_exact:
+                self._exact = np.memmap(
+                    self._exact_path(self._generation), dtype=np.float32, mode="r", shape=(self._rows, self._dim)
+                )
+        else:
+            self._matrix = None
+            self._scales = None
+            self._exact = None
+
+    def _position(self, doc_id: str) -> Optional[int]:
+        if self._positions is None:
+            self._positions = {doc_id: row for row, doc_id in enumerate(self._ids) if self._alive[row]}
+        return self._positions.get(doc_id)
+
+    def _vectors(self, rows=None, exact: bool = False) -> Optional[np.ndarray]:
+        """Rows as float32 (every row by default), including ones appended since the last persist()
+
+        With `exact`, rows come from the full-precision sidecar when the store has one.
+        """
+        stored = 0 if self._matrix is None else len(self._matrix)
+        if rows is None:
+            rows = range(stored + sum(len(block) for block in self._appended))
+        rows = np.asarray(rows, dtype=np.int64)
+        out = np.empty((len(rows), self._dim or 0), dtype=np.float32)
+        in_store = rows < stored
+        if in_store.any():
+            picked = rows[in_store]
+            if exact and self._exact is not None:
+                out[in_store] = self._exact[picked]
+            else:
+                out[in_store] = dequantize(self._matrix[picked], None if self._scales is None else self._scales[picked])
+        if (~in_store).any():
+            pending = np.concatenate(self._appended)
+            out[~in_store] = pending[rows[~in_store] - stored]
+        return out
+
+    def _scores(self, queries: np.ndarray) -> np.ndarray:
+        """Approximate scores of every row for each query, without dequantizing the whole matrix"""
+        parts = []
+        if self._matrix is not None:
+            parts.append(scores(queries, self._matrix, self._scales))
+        if self._appended:
+            parts.append(queries @ np.concatenate(self._appended).T)
+        return np.concatenate(parts, axis=1) if len(parts) > 1 else parts[0]
+
+    def persist(self) -> None:
+        """Write pending rows and the index; compacts the matrix when rows were deleted"""
+        with self.lock:
+            if not self._dirty:
+                return
+            if all(self._alive):
+                if self._appended:
+                    self._append_rows(np.concatenate(self._appended))
+            else:
+                keep = [row for row, alive in enumerate(self._alive) if alive]
+                vectors = self._vectors(keep, exact=True)
+                self._ids = [self._ids[row] for row in keep]
+                self._documents = [self._documents[row] for row in keep]
+                self._metadatas = [self._metadatas[row] for row in keep]
+                self._alive = [True] * len(keep)
+                self._generation += 1
+                self._rows = 0
+                self._append_rows(vectors)
+
+            self._rows = len(self._ids)
+            _write_json_atomic(self._index_path(), {
+                "dim": self._dim,
+                "dtype": self.dtype,
+                "exact_vectors": self._has_exact,
+                "generation": self._generation,
+                "ids": self._ids,
+                "documents": self._documents,
+                "metadatas": self._metadatas,
+            })
+            current = {
+                os.path.basename(path(self._generation))
+                for path in (self._vectors_path, self._scales_path, self._exact_path)
+            }
+            for name in os.listdir(self.persist_dir):
+                if name.startswith(("vectors-", "scales-", "exact-")) and name not in current:
+                    os.remove(os.path.join(self.persist_dir, name))
+            self._appended = []
+            self._positions = None
+            self._dirty = False
+            self._open_matrix()
+
+    def _append_rows(self, matrix: np.ndarray) -> None:
+        """Append float32 rows to the current generation's files, first dropping rows a crashed process left behind"""
+        dim = self._dim or 0
+        data, row_scales = quantize(matrix, self.dtype)
+        files = [(self._vectors_path(self._generation), np.dtype(self.dtype).itemsize * dim, data)]
+        if row_scales is not None:
+            files.append((self._scales_path(self._generation), 4, row_scales))
+        if self._has_exact:
+            files.append((self._exact_path(self._generation), 4 * dim, np.asarray(matrix, dtype=np.float32)))
+        handles = []
+        try:
+            for path, row_bytes, rows in files:
+                f = open(path, "ab")
+                f.truncate(self._rows * row_bytes)
+                handles.append(f)
+                f.write(np.ascontiguousarray(rows).tobytes())
+            for f in handles:
+                f.flush()
+                os.fsync(f.fileno())
+        finally:
+            for f in handles:
+                f.close()
+
+    # Reads
+
+    def count(self) -> int:
+        return sum(self._alive)
+
+    def ids(self) -> List[str]:
+        with span("vector", "ids") as s:
+            ids = [doc_id for doc_id, alive in zip(self._ids, self._alive) if alive]
+            s.set(chunks=len(ids))
+            return ids
+
+    def metadata_index(self) -> List[Tuple[str, Dict[str, Any]]]:
+        return [
+            (doc_id, dict(metadata))
+            for doc_id, metadata, alive in zip(self._ids, self._metadatas, self._alive) if alive
+        ]
+
+    def get_documents(self, ids: List[str]) -> List[Any]:
+        from langchain_core.documents import Document
+        docs = []
+        for doc_id in ids:
+            row = self._position(doc_id)
+            if row is not None:
+                docs.append(Document(page_content=self._documents[row], metadata={**self._metadatas[row], "id": doc_id}))
+        return docs
+
+    def get_candidates(self, ids: List[str]) -> List[Dict[str, Any]]:
+        """Chunks by ID as {"id", "text", "metadata", "vector"}, in the order requested"""
+        rows = [row for row in (self._position(doc_id) for doc_id in ids) if row is not None]
+        if not rows:
+            return []
+        return [
+            {"id": self._ids[row], "text": self._documents[row], "metadata": dict(self._metadatas[row]), "vector": vector.tolist()}
+            for row, vector in zip(rows, self._vectors(rows))
+        ]
+
+    def export_vectors(self) -> Tuple[List[str], np.ndarray]:
+        """IDs and float32 vectors of every live chunk"""
+        rows = [row for row, alive in enumerate(self._alive) if alive]
+        return [self._ids[row] for row in rows], self._vectors(rows)
+
+    def _top_k(self, queries: np.ndarray, k: int) -> List[List[Tuple[int, float]]]:
+        """Row indexes and scores of the k best live rows for each query row"""
+        k = min(k, self.count())
+        if k <= 0:
+            return [[] for _ in range(len(queries))]
+        row_scores = self._scores(queries)
+        if not all(self._alive):
+            row_scores[:, ~np.asarray(self._alive)] = -np.inf
+
+        if not self.rerank or not self._has_exact:
+            top = top_k(row_scores, k)
+            return [[(int(i), float(s[i])) for i in t] for s, t in zip(row_scores, top)]
+
+        # Rescore a wider candidate set with the full-precision rows of the sidecar
+        candidates = top_k(row_scores, min(k * self.rerank, self.count()))
+        results = []
+        for query, rows in zip(queries, candidates):
+            exact = self._vectors(rows, exact=True) @ query
+            order = np.argsort(-exact)[:k]
+            results.append([(int(rows[i]), float(exact[i])) for i in order])
+        return results
+
+    def _normalized(self, vectors) -> np.ndarray:
+        matrix = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def search_batch(self, queries: List[str], k: int = 4) -> List[List[Any]]:
+        """Top-k Documents for several queries with one embedding call and one matrix product"""
+        from langchain_core.documents import Document
+        query_matrix = self._normalized(self.embeddings.embed_documents(queries))
+        with span("vector", "search_batch", k=k, queries=len(queries)):
+            hits = self._top_k(query_matrix, k)
+        return [
+            [
+                Document(page_content=self._documents[row], metadata={**self._metadatas[row], "id": self._ids[row], "score": score})
+                for row, score in row_hits
+            ]
+            for row_hits in hits
+        ]
+
+    def similarity_search(self, query: str, k: int = 4) -> List[Any]:
+        with span("vector", "similarity_search", k=k) as s:
+            if tracing_enabled():
+                from lessoncraftai.utils.tokens import count_tokens
+                s.set(tokens=count_tokens(query))
+            docs = self.search_batch([query], k)[0]
+            s.set(chunks=len(docs))
+            return docs
+
+    def search_with_vectors(self, query: str, k: int = 30) -> Tuple[List[float], List[Dict[str, Any]]]:
+        query_vector = self.embeddings.embed_query(query)
+        with span("vector", "search_with_vectors", k=k) as s:
+            hits = self._top_k(self._normalized([query_vector]), k)[0]
+            vectors = self._vectors([row for row, _ in hits])
+            candidates = [
+                {"id": self._ids[row], "text": self._documents[row], "metadata": dict(self._metadatas[row]), "vector": vector.tolist()}
+                for (row, _), vector in zip(hits, vectors)
+            ]
+            s.set(chunks=len(candidates))
+            return query_vector, candidates
+
+    # Writes
+
+    def upsert(self, ids: List[str], embeddings, documents: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        with self.lock, span("vector", "upsert", chunks=len(ids)):
+            matrix = self._normalized(embeddings)
+            if self._dim is None:
+                self._dim = int(matrix.shape[1])
+            elif matrix.shape[1] != self._dim:
+                raise ValueError(f"Embedding dimension {matrix.shape[1]} does not match the index dimension {self._dim}")
+            for doc_id in ids:
+                row = self._position(doc_id)
+                if row is not None:
+                    self._alive[row] = False
+            for doc_id, text, metadata in zip(ids, documents, metadatas):
+                self._positions[doc_id] = len(self._ids)
+                self._ids.append(doc_id)
+                self._documents.append(text)
+                self._metadatas.append(dict(metadata or {}))
+                self._alive.append(True)
+            self._appended.append(matrix)
+            self._dirty = True
+
+    def add_documents(self, documents, ids: List[str]) -> None:
+        texts = [doc.page_content for doc in documents]
+        self.upsert(ids, self.embeddings.embed_documents(texts), texts, [doc.metadata for doc in documents])
+
+    def delete(self, ids: List[str]) -> None:
+        with self.lock, span("vector", "delete", chunks=len(ids)):
+            for doc_id in ids:
+                row = self._position(doc_id)
+                if row is not None:
+                    self._alive[row] = False
+                    del self._positions[doc_id]
+            self._dirty = True
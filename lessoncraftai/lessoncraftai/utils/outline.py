@@ -0,0 +1,192 @@
+from typing import Any, Dict, List, Optional
+import hashlib
+import json
+import os
+import re
+import tempfile
+
+OUTLINE_FILE = "outline.json"
+
+# Heading keywords and the outline level they open
+_KEYWORD_LEVELS = {
+    "part": 1, "unit": 1, "chapter": 1, "module": 1, "strand": 1, "domain": 1,
+    "lesson": 2, "section": 2, "topic": 2, "cluster": 2,
+}
+# Only the keyword ignores case, so "lesson a student..." or "part i of..." stay prose
+_KEYWORD_HEADING = re.compile(
+    r"^(?P<kind>(?i:" + "|".join(_KEYWORD_LEVELS) + r"))\s+(?P<number>[0-9]+(?:\.[0-9]+)*|[IVXLC]+|[A-Z])\b[\s:.\-–—]*(?P<title>.*)$"
+)
+# "2.3 Comparing Fractions" or "4. Measurement" - the level is the depth of the numbering.
+# A bare number needs a trailing "." or ")", and years like "2020 Edition" never match
+_NUMBERED_HEADING = re.compile(r"^(?P<number>[0-9]{1,3}(?:\.[0-9]{1,3}){0,3})(?P<end>[.)]?)\s+(?P<title>[A-Z][^.!?]{2,80})$")
+# Standard codes such as "CCSS.MATH.5.NF.A.1" or "Standard HS-LS1-1: ..."
+_STANDARD_HEADING = re.compile(r"^(?:standard\s+)?(?P<number>[A-Z]{2,}[A-Z0-9]*(?:[.\-][A-Z0-9]+){2,})\b[\s:.\-]*(?P<title>.*)$")
+# Short lines in capitals, e.g. "NUMBER AND OPERATIONS"
+_CAPS_HEADING = re.compile(r"^(?=.*[A-Z]{3})[A-Z0-9 &,'\-:]{4,60}$")
+
+STANDARD_LEVEL = 3
+
+def outline_path(persist_dir: str) -> str:
+    return os.path.join(persist_dir, OUTLINE_FILE)
+
+def detect_heading(line: str) -> Optional[Dict[str, Any]]:
+    """Classify one line of page text as a heading, returning its level, kind, number and title"""
+    line = line.strip()
+    if not line or len(line) > 120:
+        return None
+
+    match = _KEYWORD_HEADING.match(line)
+    if match and (match.group("title") or len(line) < 20) and not line.endswith((".", ",", ";")):
+        kind = match.group("kind").lower()
+        return {"level": _KEYWORD_LEVELS[kind], "kind": kind, "number": match.group("number"), "title": line}
+
+    match = _STANDARD_HEADING.match(line)
+    if match:
+        return {"level": STANDARD_LEVEL, "kind": "standard", "number": match.group("number"), "title": line}
+
+    match = _NUMBERED_HEADING.match(line)
+    if match and ("." in match.group("number") or match.group("end")):
+        depth = match.group("number").count(".") + 1
+        return {"level": depth, "kind": "numbered", "number": match.group("number"), "title": line}
+
+    if _CAPS_HEADING.match(line) and len(line.split()) <= 8:
+        return {"level": 1, "kind": "caps", "number": None, "title": line.title()}
+    return None
+
+class OutlineBuilder:
+    """Splits pages at detected headings and records the section hierarchy as it goes
+
+    Pages must arrive in document order. Each returned segment is the part of a
+    page that belongs to one section, carrying the page's metadata plus
+    section_id, section_title and section_path, so chunks never cross a heading.
+    """
+
+    def __init__(self):
+        self.sections: List[Dict[str, Any]] = []
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._stack: List[Dict[str, Any]] = []
+        self._seen: Dict[str, int] = {}
+        self._current: Optional[Dict[str, Any]] = None
+        self._source: Optional[str] = None
+        # Page on which each capitals line of the current source first appeared
+        self._caps_pages: Dict[str, Any] = {}
+
+    def _open(self, heading: Dict[str, Any], source: str, page: int) -> Dict[str, Any]:
+        while self._stack and self._stack[-1]["level"] >= heading["level"]:
+            self._stack.pop()
+        key = f"{source}:{heading['title']}"
+        occurrence = self._seen.get(key, 0)
+        self._seen[key] = occurrence + 1
+        section = {
+            "id": hashlib.sha256(f"{key}:{occurrence}".encode("utf-8")).hexdigest()[:16],
+            "title": heading["title"],
+            "number": heading["number"],
+            "kind": heading["kind"],
+            "level": heading["level"],
+            "parent_id": self._stack[-1]["id"] if self._stack else None,
+            "path": " > ".join([s["title"] for s in self._stack] + [heading["title"]]),
+            "source": source,
+            "page_start": page,
+            "page_end": page,
+            "chunk_ids": [],
+        }
+        self._stack.append(section)
+        self.sections.append(section)
+        self._by_id[section["id"]] = section
+        self._current = section
+        return section
+
+    def split_page(self, page) -> List[Any]:
+        from langchain_core.documents import Document
+        source = str(page.metadata.get("source", ""))
+        page_number = page.metadata.get("page", 0)
+        if source != self._source:
+            # Every source file starts a fresh hierarchy
+            self._source = source
+            self._stack = []
+            self._current = None
+            self._caps_pages = {}
+
+        segments = []
+        lines: List[str] = []
+
+        def flush():
+            text = "\n".join(lines).strip()
+            if not text:
+                return
+            if self._current is None:
+                self._open({"level": 0, "kind": "front_matter", "number": None, "title": "Front matter"}, source, page_number)
+            section = self._current
+            section["page_end"] = page_number
+            segments.append(Document(page_content=text, metadata={
+                **page.metadata,
+                "section_id": section["id"],
+                "section_title": section["title"],
+                "section_path": section["path"],
+            }))
+
+        for line in page.page_content.splitlines():
+            heading = detect_heading(line)
+            if heading is not None and heading["kind"] == "caps":
+                if self._caps_pages.setdefault(line.strip(), page_number) != page_number:
+                    # A running header or footer such as "GRADE 5 MATHEMATICS" repeated from an earlier page
+                    continue
+            if heading is not None:
+                flush()
+                lines = []
+                self._open(heading, source, page_number)
+            lines.append(line)
+        flush()
+        return segments
+
+    def add_chunk(self, section_id: str, chunk_id: str) -> None:
+        section = self._by_id.get(section_id)
+        if section is not None:
+            section["chunk_ids"].append(chunk_id)
+
+    def save(self, persist_dir: str) -> None:
+        """Atomically replace the persisted outline"""
+        os.makedirs(persist_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=persist_dir, prefix=".outline-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"sections": self.sections}, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, outline_path(persist_dir))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+def load_outline(persist_dir: str) -> Optional[List[Dict[str, Any]]]:
+    """Sections of the persisted outline, or None if the store was not chunked by section"""
+    try:
+        with open(outline_path(persist_dir), "r", encoding="utf-8") as f:
+            return json.load(f)["sections"]
+    except FileNotFoundError:
+        return None
+
+def remove_outline(persist_dir: str) -> None:
+    try:
+        os.remove(outline_path(persist_dir))
+    except FileNotFoundError:
+        pass
+
+def topic_sections(sections: List[Dict[str, Any]], level: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Sections that become topics: those at `level`, or at the shallowest level with at least two sections"""
+    if level is None:
+        levels = sorted({s["level"] for s in sections if s["level"] > 0})
+        level = next((l for l in levels if sum(1 for s in sections if s["level"] == l) >= 2), levels[0] if levels else 0)
+    chosen = [s for s in sections if s["level"] == level]
+    return chosen or [s for s in sections if s["chunk_ids"]]
+
+def section_chunk_ids(sections: List[Dict[str, Any]], section: Dict[str, Any]) -> List[str]:
+    """Chunk IDs of a section and all of its subsections, in document order"""
+    wanted = {section["id"]}
+    ids = []
+    for s in sections:
+        if s["id"] in wanted or s["parent_id"] in wanted:
+            wanted.add(s["id"])
+            ids.extend(s["chunk_ids"])
+    return ids
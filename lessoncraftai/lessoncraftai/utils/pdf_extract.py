@@ -0,0 +1,67 @@
+from typing import Iterator, List, Optional, Tuple
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import glob
+import os
+
+def resolve_pdf_sources(spec: str) -> List[str]:
+    """Expand a PDF path, directory or glob pattern into a sorted list of PDF files"""
+    if os.path.isdir(spec):
+        paths = glob.glob(os.path.join(spec, "**", "*"), recursive=True)
+    elif glob.has_magic(spec):
+        paths = glob.glob(spec, recursive=True)
+    else:
+        return [spec] if os.path.isfile(spec) else []
+    return sorted(path for path in paths if os.path.isfile(path) and path.lower().endswith(".pdf"))
+
+def _page_count(path: str) -> int:
+    from pypdf import PdfReader
+    return len(PdfReader(path).pages)
+
+def _extract_range(path: str, start: int, stop: int) -> List[Tuple[int, str]]:
+    """Extract the text of pages [start, stop) from one PDF; runs in a worker process"""
+    from pypdf import PdfReader
+    reader = PdfReader(path)
+    return [(number, reader.pages[number].extract_text() or "") for number in range(start, stop)]
+
+def iter_pages(
+    paths: List[str],
+    workers: Optional[int] = None,
+    pages_per_task: int = 16
+) -> Iterator["Document"]:
+    """Yield page Documents for every PDF in `paths`, extracting page ranges in a process pool
+
+    Pages come back in file and page order. Only a bounded number of ranges are
+    in flight at once, so memory does not grow with corpus size.
+    """
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        counts = dict(zip(paths, pool.map(_page_count, paths)))
+        tasks = (
+            (path, start, min(start + pages_per_task, counts[path]))
+            for path in paths
+            for start in range(0, counts[path], pages_per_task)
+        )
+
+        pending = deque()
+        for task in tasks:
+            pending.append((task, pool.submit(_extract_range, *task)))
+            if len(pending) < workers * 2:
+                continue
+            yield from _to_documents(*pending.popleft(), counts)
+        while pending:
+            yield from _to_documents(*pending.popleft(), counts)
+
+def _to_documents(task, future, counts):
+    from langchain_core.documents import Document
+    path = task[0]
+    for number, text in future.result():
+        yield Document(
+            page_content=text,
+            metadata={
+                "source": path,
+                "source_file": os.path.basename(path),
+                "page": number,
+                "total_pages": counts[path]
+            }
+        )
@@ -0,0 +1,117 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import time
+
+# Storage types for NumpyVectorStore, largest first
+DTYPES = ("float32", "float16", "int8")
+
+# Rows dequantized at a time when scoring, so int8 search never materializes a full float32 copy
+SCORE_BLOCK_ROWS = 65536
+
+def quantize(matrix: np.ndarray, dtype: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Encode float32 rows as `dtype`; int8 also returns one float32 scale per row"""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if dtype == "float32":
+        return matrix, None
+    if dtype == "float16":
+        return matrix.astype(np.float16), None
+    if dtype == "int8":
+        scales = np.abs(matrix).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        data = np.clip(np.rint(matrix / scales[:, None]), -127, 127).astype(np.int8)
+        return data, scales.astype(np.float32)
+    raise ValueError(f"Unknown vector dtype: {dtype}. Expected one of: {', '.join(DTYPES)}")
+
+def dequantize(data: np.ndarray, scales: Optional[np.ndarray] = None) -> np.ndarray:
+    matrix = np.asarray(data, dtype=np.float32)
+    return matrix * scales[:, None] if scales is not None else matrix
+
+def scores(queries: np.ndarray, data: np.ndarray, scales: Optional[np.ndarray] = None) -> np.ndarray:
+    """Dot products of float32 `queries` with every stored row, dequantizing block by block"""
+    out = np.empty((len(queries), len(data)), dtype=np.float32)
+    for start in range(0, len(data), SCORE_BLOCK_ROWS):
+        block = slice(start, start + SCORE_BLOCK_ROWS)
+        out[:, block] = queries @ np.asarray(data[block], dtype=np.float32).T
+        if scales is not None:
+            out[:, block] *= scales[block]
+    return out
+
+def bytes_per_vector(dim: int, dtype: str) -> int:
+    return dim * np.dtype(dtype).itemsize + (4 if dtype == "int8" else 0)
+
+def top_k(score_matrix: np.ndarray, k: int) -> np.ndarray:
+    """Column indexes of the k best scores per row, best first"""
+    k = min(k, score_matrix.shape[1])
+    top = np.argpartition(-score_matrix, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(score_matrix, top, axis=1), axis=1)
+    return np.take_along_axis(top, order, axis=1)
+
+def quantization_report(
+    vectors: np.ndarray,
+    k: int = 10,
+    query_count: int = 200,
+    rerank_factors: Sequence[int] = (0, 4),
+    seed: int = 0
+) -> List[Dict[str, Any]]:
+    """Recall@k and size of every storage type against exact float32 search over `vectors`
+
+    Queries are stored vectors chosen at random, with a little noise so they do not
+    match their own row exactly. Re-ranking rescores the top k*factor candidates
+    with the float32 vectors, as NumpyVectorStore does from its float32 sidecar.
+    `bytes` is the matrix every search scans; `disk_bytes` adds that sidecar, so a
+    re-ranked store saves search memory but takes more disk than plain float32.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    vectors = vectors / norms
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(len(vectors), size=min(query_count, len(vectors)), replace=False)
+    queries = vectors[rows] + rng.normal(0, 0.05, size=(len(rows), vectors.shape[1])).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+    exact = top_k(queries @ vectors.T, k)
+    float32_bytes = bytes_per_vector(vectors.shape[1], "float32") * len(vectors)
+    report = []
+    for dtype in DTYPES:
+        data, scales = quantize(vectors, dtype)
+        for factor in rerank_factors:
+            if dtype == "float32" and factor:
+                continue
+            start = time.perf_counter()
+            approx_scores = scores(queries, data, scales)
+            if factor:
+                candidates = top_k(approx_scores, k * factor)
+                exact_scores = np.einsum("qd,qcd->qc", queries, vectors[candidates])
+                found = np.take_along_axis(candidates, top_k(exact_scores, k), axis=1)
+            else:
+                found = top_k(approx_scores, k)
+            elapsed = time.perf_counter() - start
+            hits = sum(len(set(e) & set(f)) for e, f in zip(exact.tolist(), found.tolist()))
+            size = bytes_per_vector(vectors.shape[1], dtype) * len(vectors)
+            disk = size + (float32_bytes if factor else 0)
+            report.append({
+                "dtype": dtype,
+                "rerank_factor": factor,
+                "vectors": len(vectors),
+                "dim": int(vectors.shape[1]),
+                "bytes": size,
+                "disk_bytes": disk,
+                "compression": round(float32_bytes / size, 2),
+                "disk_compression": round(float32_bytes / disk, 2),
+                f"recall_at_{k}": round(hits / exact.size, 4),
+                "query_ms": round(elapsed / len(queries) * 1000, 3),
+            })
+    return report
+
+def format_quantization_report(report: List[Dict[str, Any]]) -> str:
+    recall_key = next(key for key in report[0] if key.startswith("recall_at_"))
+    lines = [f"{'dtype':<8} {'rerank':>6} {'scanned':>12} {'ratio':>6} {'on disk':>12} {'ratio':>6} {recall_key:>12} {'ms/query':>9}"]
+    for row in report:
+        rerank = f"x{row['rerank_factor']}" if row["rerank_factor"] else "-"
+        lines.append(
+            f"{row['dtype']:<8} {rerank:>6} {row['bytes'] / 1024:>10.1f}KB {row['compression']:>6} "
+            f"{row['disk_bytes'] / 1024:>10.1f}KB {row['disk_compression']:>6} "
+            f"{row[recall_key]:>12.4f} {row['query_ms']:>9.3f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,336 @@
+from typing import Any, Callable, Dict, Optional
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from lessoncraftai.utils.tracing import span
+import json
+import os
+import random
+import threading
+import time
+
+# Defaults for the request scheduler, overridable through the environment
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_MAX_RETRIES = 6
+# A full bucket holds this many seconds of a limit, so requests are paced rather than sent in one burst
+BURST_SECONDS = 1.0
+# Buckets refill at this share of the configured limits, leaving room for timing jitter between client and server
+HEADROOM = 0.95
+# Tokens charged for a chat completion on top of its prompt, since OpenAI counts the reply too
+COMPLETION_TOKEN_ALLOWANCE = 512
+MAX_BACKOFF_SECONDS = 60.0
+
+_TRANSIENT_ERRORS = ("APIConnectionError", "APITimeoutError", "InternalServerError", "ServiceUnavailableError", "Timeout")
+
+def parse_limits(spec: str) -> Dict[str, Dict[str, float]]:
+    """Per-model limits from "model=rpm/tpm" pairs separated by commas; "*" sets the default
+
+    For example "gpt-4o-mini=500/200000,text-embedding-ada-002=3000/1000000,*=60/40000".
+    Either number may be 0 or empty for no limit.
+    """
+    limits = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        model, _, values = item.partition("=")
+        rpm, _, tpm = values.partition("/")
+        try:
+            limits[model.strip()] = {"rpm": float(rpm or 0), "tpm": float(tpm or 0)}
+        except ValueError:
+            raise ValueError(f"Invalid rate limit '{item.strip()}'. Expected model=rpm/tpm")
+    return limits
+
+def _status(error: BaseException) -> Optional[int]:
+    for obj in (error, getattr(error, "response", None)):
+        status = getattr(obj, "status_code", None)
+        if isinstance(status, int):
+            return status
+    return None
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    return _status(error) == 429 or type(error).__name__ == "RateLimitError"
+
+def is_transient_error(error: BaseException) -> bool:
+    status = _status(error)
+    return (status is not None and status >= 500) or type(error).__name__ in _TRANSIENT_ERRORS
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Seconds to wait from the Retry-After (or retry-after-ms) header of a failed response, if it has one"""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+def _reserve(state: Dict[str, Any], model: str, rpm: float, tpm: float, tokens: int, now: float) -> float:
+    """Take one request and `tokens` from the model's buckets, returning how long to wait before sending
+
+    Buckets may go negative: a reservation is granted at once and the caller waits
+    until refill covers it, so requests are served in arrival order.
+    """
+    entry = state.setdefault(model, {
+        "requests": rpm * HEADROOM * BURST_SECONDS / 60,
+        "tokens": tpm * HEADROOM * BURST_SECONDS / 60,
+        "updated": now,
+        "blocked_until": 0.0
+    })
+    elapsed = max(0.0, now - entry["updated"])
+    entry["updated"] = now
+    wait = max(0.0, entry["blocked_until"] - now)
+    for name, limit, amount in (("requests", rpm, 1), ("tokens", tpm, tokens)):
+        if not limit:
+            continue
+        per_second = limit * HEADROOM / 60
+        level = min(per_second * BURST_SECONDS, entry[name] + elapsed * per_second) - amount
+        entry[name] = level
+        if level < 0:
+            wait = max(wait, -level / per_second)
+    return wait
+
+def _block(state: Dict[str, Any], model: str, until: float) -> None:
+    entry = state.setdefault(model, {"requests": 0.0, "tokens": 0.0, "updated": time.time(), "blocked_until": 0.0})
+    entry["blocked_until"] = max(entry["blocked_until"], until)
+
+def _blocked_for(state: Dict[str, Any], model: str, now: float) -> float:
+    entry = state.get(model)
+    return max(0.0, entry["blocked_until"] - now) if entry else 0.0
+
+class _LocalState:
+    """Bucket levels shared by the threads of this process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state: Dict[str, Any] = {}
+
+    def update(self, fn: Callable[[Dict[str, Any]], Any]) -> Any:
+        with self._lock:
+            return fn(self._state)
+
+class _FileState:
+    """Bucket levels in a JSON file shared by every process pointed at it, updated under an exclusive lock"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def update(self, fn: Callable[[Dict[str, Any]], Any]) -> Any:
+        import fcntl
+        with self._lock, open(self.path, "a+", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                try:
+                    state = json.loads(f.read() or "{}")
+                except ValueError:
+                    state = {}
+                result = fn(state)
+                f.seek(0)
+                f.truncate()
+                json.dump(state, f)
+                f.flush()
+                return result
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+class _ModelLimiter:
+    """Adaptive concurrency and counters for one model in this process"""
+
+    def __init__(self, model: str, rpm: float, tpm: float, max_concurrency: int):
+        self.model = model
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_concurrency = max_concurrency
+        self.limit = float(max_concurrency)
+        self.in_flight = 0
+        self.queued = 0
+        # Requests sent before the last decrease saw the old limit, so their 429s do not cut it again
+        self.last_decrease = -1.0
+        self.cond = threading.Condition()
+        self.stats = {
+            "requests": 0, "throttled": 0, "retries": 0, "failures": 0,
+            "max_queued": 0, "wait_seconds": 0.0, "max_wait_seconds": 0.0,
+        }
+
+class RequestScheduler:
+    """Shared gate for OpenAI calls: token buckets per model plus adaptive concurrency
+
+    Each model gets a requests/min and a tokens/min bucket (unlimited when not
+    configured). Concurrency per model starts at `max_concurrency`, grows by
+    about one slot per window of successful calls and halves on a 429, and a
+    Retry-After header pauses every caller of that model until it passes.
+    Rate-limited and transient errors are retried up to `max_retries` times.
+    With `state_path`, bucket levels and pauses are shared between processes.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, Dict[str, float]]] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        state_path: Optional[str] = None
+    ):
+        self.limits = limits or {}
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max(0, max_retries)
+        self._state = _FileState(state_path) if state_path else _LocalState()
+        self._limiters: Dict[str, _ModelLimiter] = {}
+        self._lock = threading.Lock()
+
+    def _limiter(self, model: str) -> _ModelLimiter:
+        with self._lock:
+            limiter = self._limiters.get(model)
+            if limiter is None:
+                limits = self.limits.get(model) or self.limits.get("*") or {}
+                limiter = _ModelLimiter(model, limits.get("rpm", 0), limits.get("tpm", 0), self.max_concurrency)
+                self._limiters[model] = limiter
+            return limiter
+
+    def call(self, model: str, fn: Callable[[], Any], tokens: int = 0) -> Any:
+        """Run `fn` once the model's limits allow a request of `tokens` tokens, retrying 429s and transient errors"""
+        limiter = self._limiter(model)
+        for attempt in range(self.max_retries + 1):
+            self._acquire(limiter, tokens)
+            sent = time.monotonic()
+            try:
+                result = fn()
+            except Exception as e:
+                throttled = is_rate_limit_error(e)
+                if not (throttled or is_transient_error(e)) or attempt == self.max_retries:
+                    self._release(limiter, "failed", sent)
+                    raise
+                delay = retry_after(e) if throttled else None
+                if delay is None:
+                    delay = min(MAX_BACKOFF_SECONDS, 2 ** attempt) * random.uniform(0.5, 1.0)
+                self._release(limiter, "throttled" if throttled else "retried", sent)
+                print(f"{model}: {'rate limited' if throttled else type(e).__name__}, retrying in {delay:.1f}s")
+                if throttled:
+                    # Everyone calling this model waits, not only this request
+                    until = time.time() + delay
+                    self._state.update(lambda state: _block(state, model, until))
+                else:
+                    time.sleep(delay)
+                continue
+            self._release(limiter, "ok", sent)
+            return result
+
+    def _acquire(self, limiter: _ModelLimiter, tokens: int) -> None:
+        start = time.monotonic()
+        with span("rate_limit", limiter.model, tokens=tokens) as s:
+            with limiter.cond:
+                limiter.queued += 1
+                limiter.stats["max_queued"] = max(limiter.stats["max_queued"], limiter.queued)
+                s.set(queued=limiter.queued)
+                while limiter.in_flight >= max(1, int(limiter.limit)):
+                    limiter.cond.wait()
+                limiter.in_flight += 1
+            try:
+                wait = self._state.update(
+                    lambda state: _reserve(state, limiter.model, limiter.rpm, limiter.tpm, tokens, time.time())
+                )
+                # A 429 elsewhere may have paused the model while this request waited
+                while wait > 0:
+                    time.sleep(wait)
+                    wait = self._state.update(lambda state: _blocked_for(state, limiter.model, time.time()))
+            except BaseException:
+                # The request is never sent, so hand its slot back instead of shrinking concurrency for good
+                with limiter.cond:
+                    limiter.in_flight -= 1
+                    limiter.cond.notify_all()
+                raise
+            finally:
+                waited = time.monotonic() - start
+                with limiter.cond:
+                    limiter.queued -= 1
+                    limiter.stats["wait_seconds"] += waited
+                    limiter.stats["max_wait_seconds"] = max(limiter.stats["max_wait_seconds"], waited)
+                s.set(wait_ms=round(waited * 1000, 3))
+
+    def _release(self, limiter: _ModelLimiter, outcome: str, sent: float) -> None:
+        with limiter.cond:
+            limiter.in_flight -= 1
+            limiter.stats["requests"] += 1
+            if outcome == "ok":
+                # Additive increase: about one more slot after a full window of successes
+                limiter.limit = min(limiter.max_concurrency, limiter.limit + 1 / limiter.limit)
+            elif outcome == "throttled":
+                limiter.stats["throttled"] += 1
+                limiter.stats["retries"] += 1
+                # Multiplicative decrease, once per round of requests that saw the same limit
+                if sent > limiter.last_decrease:
+                    limiter.limit = max(1.0, limiter.limit / 2)
+                    limiter.last_decrease = time.monotonic()
+            elif outcome == "retried":
+                limiter.stats["retries"] += 1
+            else:
+                limiter.stats["failures"] += 1
+            limiter.cond.notify_all()
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Queue depth, wait times, concurrency and outcome counts per model"""
+        with self._lock:
+            limiters = list(self._limiters.values())
+        report = {}
+        for limiter in limiters:
+            with limiter.cond:
+                stats = dict(limiter.stats)
+                report[limiter.model] = {
+                    "rpm": limiter.rpm,
+                    "tpm": limiter.tpm,
+                    "concurrency_limit": round(limiter.limit, 2),
+                    "in_flight": limiter.in_flight,
+                    "queued": limiter.queued,
+                    **stats,
+                    "wait_seconds": round(stats["wait_seconds"], 3),
+                    "mean_wait_ms": round(stats["wait_seconds"] / stats["requests"] * 1000, 3) if stats["requests"] else 0.0,
+                    "max_wait_seconds": round(stats["max_wait_seconds"], 3),
+                }
+        return report
+
+def format_metrics(metrics: Dict[str, Dict[str, Any]]) -> str:
+    lines = [f"{'model':<28} {'requests':>8} {'429s':>6} {'fails':>6} {'max queue':>9} {'mean wait':>10} {'max wait':>9} {'limit':>6}"]
+    for model, row in metrics.items():
+        lines.append(
+            f"{model[:28]:<28} {row['requests']:>8} {row['throttled']:>6} {row['failures']:>6} {row['max_queued']:>9} "
+            f"{row['mean_wait_ms']:>8.1f}ms {row['max_wait_seconds']:>8.2f}s {row['concurrency_limit']:>6}"
+        )
+    return "\n".join(lines)
+
+class RateLimitedChatModel:
+    """ChatOpenAI wrapper that sends every invoke() through the request scheduler
+
+    Everything else, such as model_name and temperature, is read from the wrapped client.
+    """
+
+    def __init__(self, llm: Any, scheduler: RequestScheduler):
+        self.llm = llm
+        self.scheduler = scheduler
+
+    def invoke(self, prompt: Any, *args, **kwargs) -> Any:
+        from lessoncraftai.utils.tokens import count_tokens
+        tokens = count_tokens(str(prompt)) + COMPLETION_TOKEN_ALLOWANCE
+        model = getattr(self.llm, "model_name", "") or "chat"
+        return self.scheduler.call(model, lambda: self.llm.invoke(prompt, *args, **kwargs), tokens)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.llm, name)
+
+def build_request_scheduler() -> Optional[RequestScheduler]:
+    """Build the scheduler from LESSONCRAFT_* environment settings, or None unless LESSONCRAFT_RATE_LIMIT=1"""
+    if os.getenv("LESSONCRAFT_RATE_LIMIT", "").lower() not in ("1", "true", "yes"):
+        return None
+    return RequestScheduler(
+        limits=parse_limits(os.getenv("LESSONCRAFT_RATE_LIMITS", "")),
+        max_concurrency=int(os.getenv("LESSONCRAFT_MAX_CONCURRENT_REQUESTS", DEFAULT_MAX_CONCURRENCY)),
+        max_retries=int(os.getenv("LESSONCRAFT_RATE_LIMIT_RETRIES", DEFAULT_MAX_RETRIES)),
+        state_path=os.getenv("LESSONCRAFT_RATE_LIMIT_STATE") or None
+    )
@@ -0,0 +1,18 @@
+from typing import Any
+from lessoncraftai.utils.llm_wrapper import WrappedLLM
+from lessoncraftai.utils.rate_limit import COMPLETION_TOKEN_ALLOWANCE
+from lessoncraftai.utils.tokens import count_tokens
+import json
+
+class RateLimitedLLM(WrappedLLM):
+    """Agent LLM that sends every call through the shared request scheduler"""
+
+    scheduler: Any
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, **kwargs):
+        prompt = messages if isinstance(messages, str) else json.dumps(messages, default=str)
+        return self.scheduler.call(
+            self.model,
+            lambda: self._forward(messages, tools, callbacks, available_functions, **kwargs),
+            count_tokens(prompt) + COMPLETION_TOKEN_ALLOWANCE
+        )
@@ -0,0 +1,344 @@
+from typing import Any, Dict, List, Optional, Tuple
+from langchain_core.embeddings import Embeddings
+from lessoncraftai.utils.embeddings import BatchedEmbeddings, build_embeddings
+from lessoncraftai.utils.llm_cache import ResponseCache, build_response_cache
+from lessoncraftai.utils.rate_limit import RateLimitedChatModel, RequestScheduler, build_request_scheduler, format_metrics
+from lessoncraftai.utils.tracing import span, tracing_enabled
+import atexit
+import os
+import threading
+
+# Vector store implementations, chosen with LESSONCRAFT_VECTOR_BACKEND
+VECTOR_BACKENDS = ("chroma", "numpy")
+
+# Process-wide handles, created on first use and shared by every tool
+_lock = threading.Lock()
+_embeddings: Optional[BatchedEmbeddings] = None
+_stores: Dict[Tuple[str, str], Any] = {}
+_chat_models: Dict[Tuple[str, float], Any] = {}
+_response_cache: Optional[ResponseCache] = None
+_response_cache_loaded = False
+_request_scheduler: Optional[RequestScheduler] = None
+_request_scheduler_loaded = False
+# Backends installed with use_backends(), which take precedence over the environment
+_chat_model_override: Any = None
+_agent_llm_override: Any = None
+
+class VectorStoreHandle:
+    """Shared access to one persisted Chroma collection
+
+    Mutations are serialized through a per-store lock; queries go straight to
+    the client, which is safe to use from several threads.
+    """
+
+    backend = "chroma"
+
+    def __init__(self, persist_dir: str, embeddings: BatchedEmbeddings):
+        self.persist_dir = persist_dir
+        self.embeddings = embeddings
+        self.lock = threading.RLock()
+        from langchain_community.vectorstores import Chroma
+        self.store = Chroma(persist_directory=persist_dir, embedding_function=embeddings)
+
+    def count(self) -> int:
+        return self.store._collection.count()
+
+    def ids(self) -> List[str]:
+        """All chunk IDs in the collection, without documents, metadata or vectors"""
+        with span("vector", "ids") as s:
+            ids = self.store.get(include=[])["ids"]
+            s.set(chunks=len(ids))
+            return ids
+
+    def metadata_index(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """(id, metadata) for every chunk, without documents or vectors"""
+        with span("vector", "metadata_index") as s:
+            rows = self.store.get(include=["metadatas"])
+            s.set(chunks=len(rows["ids"]))
+            return list(zip(rows["ids"], rows["metadatas"]))
+
+    def get_documents(self, ids: List[str]) -> List[Any]:
+        """Fetch chunks by ID, returned in the order requested"""
+        from langchain_core.documents import Document
+        with span("vector", "get_documents", chunks=len(ids)):
+            rows = self.store.get(ids=ids, include=["documents", "metadatas"])
+        by_id = {
+            doc_id: Document(page_content=text, metadata={**(metadata or {}), "id": doc_id})
+            for doc_id, text, metadata in zip(rows["ids"], rows["documents"], rows["metadatas"])
+        }
+        return [by_id[doc_id] for doc_id in ids if doc_id in by_id]
+
+    def similarity_search(self, query: str, k: int = 4) -> List[Any]:
+        with span("vector", "similarity_search", k=k) as s:
+            if tracing_enabled():
+                from lessoncraftai.utils.tokens import count_tokens
+                s.set(tokens=count_tokens(query))
+            docs = self.store.similarity_search(query, k=k)
+            s.set(chunks=len(docs))
+            return docs
+
+    def get_candidates(self, ids: List[str]) -> List[Dict[str, Any]]:
+        """Chunks by ID as {"id", "text", "metadata", "vector"}, in the order requested"""
+        if not ids:
+            return []
+        with span("vector", "get_candidates", chunks=len(ids)):
+            rows = self.store.get(ids=ids, include=["documents", "metadatas", "embeddings"])
+        by_id = {
+            doc_id: {"id": doc_id, "text": text, "metadata": metadata or {}, "vector": vector}
+            for doc_id, text, metadata, vector in zip(rows["ids"], rows["documents"], rows["metadatas"], rows["embeddings"])
+        }
+        return [by_id[doc_id] for doc_id in ids if doc_id in by_id]
+
+    def export_vectors(self):
+        """IDs and float32 vectors of every chunk"""
+        import numpy as np
+        rows = self.store.get(include=["embeddings"])
+        return rows["ids"], np.asarray(rows["embeddings"], dtype=np.float32)
+
+    def search_with_vectors(self, query: str, k: int = 30) -> Tuple[List[float], List[Dict[str, Any]]]:
+        """Embed `query` and return it with the top-k chunks as {"id", "text", "metadata", "vector"}"""
+        query_vector = self.embeddings.embed_query(query)
+        with span("vector", "search_with_vectors", k=k) as s:
+            rows = self.store._collection.query(
+                query_embeddings=[query_vector],
+                n_results=k,
+                include=["documents", "metadatas", "embeddings"]
+            )
+            candidates = [
+                {"id": doc_id, "text": text, "metadata": metadata or {}, "vector": vector}
+                for doc_id, text, metadata, vector in zip(
+                    rows["ids"][0], rows["documents"][0], rows["metadatas"][0], rows["embeddings"][0]
+                )
+            ]
+            s.set(chunks=len(candidates))
+            return query_vector, candidates
+
+    def add_documents(self, documents, ids: List[str]) -> None:
+        with self.lock, span("vector", "add_documents", chunks=len(ids)):
+            self.store.add_documents(documents=documents, ids=ids)
+
+    def upsert(self, ids: List[str], embeddings, documents: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        with self.lock, span("vector", "upsert", chunks=len(ids)):
+            self.store._collection.upsert(
+                ids=ids, embeddings=embeddings, documents=documents, metadatas=metadatas
+            )
+
+    def delete(self, ids: List[str]) -> None:
+        with self.lock, span("vector", "delete", chunks=len(ids)):
+            self.store.delete(ids=ids)
+
+    def persist(self) -> None:
+        # Chroma >= 0.4 persists automatically and older wrappers still expose persist()
+        persist = getattr(self.store, "persist", None)
+        if persist is not None:
+            with self.lock:
+                persist()
+
+def get_embeddings() -> BatchedEmbeddings:
+    """The shared embedding layer, so HTTP connections and the cache are reused"""
+    global _embeddings
+    scheduler = get_request_scheduler()
+    with _lock:
+        if _embeddings is None:
+            _embeddings = build_embeddings(scheduler)
+        return _embeddings
+
+class _LazyEmbeddings(Embeddings):
+    """Stands in for the shared embedding layer until a store first embeds something
+
+    Opening a store must not build the OpenAI client, so lexical search and
+    lookups by ID keep working offline and without an API key.
+    """
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return get_embeddings().embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return get_embeddings().embed_query(text)
+
+    def __getattr__(self, name: str):
+        return getattr(get_embeddings(), name)
+
+def vector_backend() -> str:
+    """Name of the configured vector store implementation: chroma (default) or numpy"""
+    backend = os.getenv("LESSONCRAFT_VECTOR_BACKEND", "chroma").lower()
+    if backend not in VECTOR_BACKENDS:
+        raise ValueError(f"Unknown vector backend: {backend}. Expected one of: {', '.join(VECTOR_BACKENDS)}")
+    return backend
+
+def get_vector_store(persist_dir: str):
+    """Open each persist_dir once per process and return its shared handle
+
+    Returns a VectorStoreHandle (Chroma) or a NumpyVectorStore, which share one interface.
+    The embedding layer is only created once the store embeds a query or document.
+    """
+    embeddings = _LazyEmbeddings()
+    backend = vector_backend()
+    key = (backend, os.path.abspath(persist_dir))
+    with _lock:
+        handle = _stores.get(key)
+        if handle is None:
+            if backend == "numpy":
+                from lessoncraftai.utils.numpy_store import NumpyVectorStore
+                handle = NumpyVectorStore(
+                    persist_dir,
+                    embeddings,
+                    dtype=os.getenv("LESSONCRAFT_VECTOR_DTYPE", "float32").lower(),
+                    rerank=int(os.getenv("LESSONCRAFT_VECTOR_RERANK", "0"))
+                )
+            else:
+                handle = VectorStoreHandle(persist_dir, embeddings)
+            _stores[key] = handle
+        return handle
+
+def get_chat_model(temperature: float = 0.2, model: Optional[str] = None):
+    """Shared ChatOpenAI client per (model, temperature)"""
+    if _chat_model_override is not None:
+        return _chat_model_override
+    from langchain_openai import ChatOpenAI
+    model = model or os.getenv("LESSONCRAFT_CHAT_MODEL")
+    key = (model or "", temperature)
+    scheduler = get_request_scheduler()
+    with _lock:
+        llm = _chat_models.get(key)
+        if llm is None:
+            options = {"model": model} if model else {}
+            if scheduler is not None:
+                # The scheduler retries 429s itself, pausing every caller of the model
+                llm = RateLimitedChatModel(ChatOpenAI(temperature=temperature, max_retries=0, **options), scheduler)
+            else:
+                llm = ChatOpenAI(temperature=temperature, **options)
+            _chat_models[key] = llm
+        return llm
+
+def get_request_scheduler() -> Optional[RequestScheduler]:
+    """The shared OpenAI request scheduler, or None unless LESSONCRAFT_RATE_LIMIT=1"""
+    global _request_scheduler, _request_scheduler_loaded
+    with _lock:
+        if not _request_scheduler_loaded:
+            _request_scheduler = build_request_scheduler()
+            _request_scheduler_loaded = True
+        return _request_scheduler
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """The shared LLM response cache, or None unless LESSONCRAFT_LLM_CACHE is enabled"""
+    global _response_cache, _response_cache_loaded
+    with _lock:
+        if not _response_cache_loaded:
+            _response_cache = build_response_cache()
+            _response_cache_loaded = True
+        return _response_cache
+
+def get_agent_llm():
+    """LLM for crew agents: the crewai default (or an installed one), wrapped in the request scheduler,
+    the response cache and tracing when enabled
+
+    Returns None when none of them is on so agents keep crewai's own default LLM.
+    """
+    llm = _agent_llm_override
+    cache = get_response_cache()
+    scheduler = get_request_scheduler()
+    if llm is None and cache is None and scheduler is None and not tracing_enabled():
+        return None
+    if llm is None:
+        from crewai.utilities.llm_utils import create_llm
+        llm = create_llm(None)
+        if scheduler is not None:
+            from lessoncraftai.utils.rate_limited_llm import RateLimitedLLM
+            llm = _without_client_retries(llm)
+            llm = RateLimitedLLM(model=llm.model, temperature=llm.temperature, inner=llm, scheduler=scheduler)
+        if cache is not None:
+            from lessoncraftai.utils.cached_llm import CachedLLM
+            llm = CachedLLM(model=llm.model, temperature=llm.temperature, inner=llm, cache=cache)
+    if tracing_enabled():
+        from lessoncraftai.utils.traced_llm import TracedLLM
+        llm = TracedLLM(model=llm.model, temperature=llm.temperature, inner=llm)
+    return llm
+
+def _without_client_retries(llm):
+    """Rebuild an agent LLM with its SDK retries off, so 429s reach the request scheduler"""
+    if not getattr(llm, "max_retries", None):
+        return llm
+    try:
+        from crewai import LLM
+        return LLM(
+            model=llm.model,
+            temperature=llm.temperature,
+            max_retries=0,
+            api_key=getattr(llm, "api_key", None),
+            base_url=getattr(llm, "base_url", None)
+        )
+    except Exception as e:
+        print(f"Keeping the agent LLM's own retries: {e}")
+        return llm
+
+def use_backends(embeddings: Optional[BatchedEmbeddings] = None, chat_model: Any = None, agent_llm: Any = None) -> None:
+    """Install pre-built backends in place of the configured ones, e.g. fakes for offline benchmarks
+
+    Call this before any tool opens a vector store; stores already open keep their embeddings.
+    """
+    global _embeddings, _chat_model_override, _agent_llm_override
+    with _lock:
+        if embeddings is not None:
+            _embeddings = embeddings
+        if chat_model is not None:
+            _chat_model_override = chat_model
+        if agent_llm is not None:
+            _agent_llm_override = agent_llm
+
+def _close_http_client(obj: Any) -> None:
+    """Close the pooled OpenAI HTTP client behind a langchain wrapper, if there is one"""
+    for attr in ("root_client", "client"):
+        client = getattr(obj, attr, None)
+        client = getattr(client, "_client", client)
+        close = getattr(client, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception as e:
+                print(f"Error closing client: {e}")
+            return
+
+def close_all() -> None:
+    """Release every shared handle; called automatically at interpreter shutdown"""
+    global _embeddings, _response_cache, _response_cache_loaded, _chat_model_override, _agent_llm_override
+    global _request_scheduler, _request_scheduler_loaded
+    with _lock:
+        _chat_model_override = None
+        _agent_llm_override = None
+        for llm in _chat_models.values():
+            _close_http_client(llm)
+        _chat_models.clear()
+
+        if _stores:
+            for handle in _stores.values():
+                # Chroma persists on its own; the numpy index only on persist()
+                if handle.backend == "numpy":
+                    handle.persist()
+            _stores.clear()
+            try:
+                from chromadb.api.client import SharedSystemClient
+                SharedSystemClient.clear_system_cache()
+            except Exception as e:
+                print(f"Error closing vector stores: {e}")
+
+        if _embeddings is not None:
+            _close_http_client(_embeddings.backend)
+            if _embeddings.cache is not None:
+                _embeddings.cache.close()
+            _embeddings = None
+
+        if _response_cache is not None:
+            print(f"LLM response cache: {_response_cache.stats()}")
+            _response_cache.close()
+            _response_cache = None
+        _response_cache_loaded = False
+
+        if _request_scheduler is not None:
+            metrics = _request_scheduler.metrics()
+            if any(row["throttled"] or row["failures"] or row["max_wait_seconds"] >= 1 for row in metrics.values()):
+                print(f"OpenAI request scheduler:\n{format_metrics(metrics)}")
+            _request_scheduler = None
+        _request_scheduler_loaded = False
+
+atexit.register(close_all)
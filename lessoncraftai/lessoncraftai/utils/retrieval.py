@@ -0,0 +1,70 @@
+from typing import Any, Dict, List, Optional, Tuple
+from lessoncraftai.utils.bm25 import load_bm25
+from lessoncraftai.utils.tracing import span
+
+# How candidates are found: embeddings only, the local BM25 index only, or both fused
+RETRIEVAL_MODES = ("dense", "lexical", "hybrid")
+
+# Standard damping constant for reciprocal rank fusion
+RRF_K = 60
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = RRF_K) -> Dict[str, float]:
+    """Sum of 1 / (k + rank) over every ranking each ID appears in"""
+    fused: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return fused
+
+def retrieve(vectordb, persist_dir: str, query: str, k: int, mode: str = "dense") -> Tuple[Optional[List[float]], List[Dict[str, Any]]]:
+    """Query vector (None in lexical mode) and up to k candidates {"id", "text", "metadata", "vector"}
+
+    Lexical and hybrid candidates also carry a "score" in [0, 1], which
+    pack_context uses as their relevance. Lexical mode needs no embedding call.
+    """
+    if mode not in RETRIEVAL_MODES:
+        raise ValueError(f"Unknown retrieval mode: {mode}. Expected one of: {', '.join(RETRIEVAL_MODES)}")
+    if mode == "dense":
+        return vectordb.search_with_vectors(query, k=k)
+
+    index = load_bm25(persist_dir)
+    if index is None:
+        raise ValueError(f"No BM25 index in {persist_dir}. Please rerun the VectorizePDF tool to build it.")
+    with span("vector", "bm25_search", k=k) as s:
+        lexical = index.search(query, k)
+        s.set(chunks=len(lexical))
+
+    if mode == "lexical":
+        query_vector = None
+        top = max((score for _, score in lexical), default=0.0) or 1.0
+        scores = {doc_id: score / top for doc_id, score in lexical}
+        candidates = vectordb.get_candidates([doc_id for doc_id, _ in lexical])
+    else:
+        query_vector, dense = vectordb.search_with_vectors(query, k=k)
+        fused = reciprocal_rank_fusion([[c["id"] for c in dense], [doc_id for doc_id, _ in lexical]])
+        best = sorted(fused, key=fused.get, reverse=True)[:k]
+        top = fused[best[0]] if best else 1.0
+        scores = {doc_id: fused[doc_id] / top for doc_id in best}
+        known = {c["id"]: c for c in dense}
+        missing = [doc_id for doc_id in best if doc_id not in known]
+        known.update({c["id"]: c for c in vectordb.get_candidates(missing)})
+        candidates = [known[doc_id] for doc_id in best if doc_id in known]
+
+    for candidate in candidates:
+        candidate["score"] = scores[candidate["id"]]
+    candidates.sort(key=lambda c: c["score"], reverse=True)
+    return query_vector, candidates
+
+def search(vectordb, persist_dir: str, query: str, k: int = 5, mode: str = "hybrid") -> List[Dict[str, Any]]:
+    """Ranked chunks for an ad-hoc query, as {"id", "score", "text", "metadata"}"""
+    query_vector, candidates = retrieve(vectordb, persist_dir, query, k, mode)
+    results = []
+    for candidate in candidates:
+        score = candidate.get("score")
+        if score is None:
+            import numpy as np
+            vector = np.asarray(candidate["vector"], dtype=np.float32)
+            q = np.asarray(query_vector, dtype=np.float32)
+            score = float(vector @ q / ((np.linalg.norm(vector) * np.linalg.norm(q)) or 1.0))
+        results.append({"id": candidate["id"], "score": round(score, 4), "text": candidate["text"], "metadata": candidate["metadata"]})
+    return results
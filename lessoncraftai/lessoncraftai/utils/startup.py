@@ -0,0 +1,63 @@
+from typing import Any, Dict, List
+import os
+import re
+import subprocess
+import sys
+import time
+
+# Modules whose import cost is tracked by `lessoncraftai import-report`
+DEFAULT_MODULES = [
+    "lessoncraftai.main", "lessoncraftai.crew", "lessoncraftai.utils.registry",
+    "lessoncraftai.tools.vectorize_pdf", "lessoncraftai.tools.analyze_topics",
+]
+
+# Directory holding the lessoncraftai package
+PACKAGE_PARENT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Lines look like "import time:       123 |        456 |     package.module"
+_IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)")
+
+def measure_import(module: str, top: int = 5) -> Dict[str, Any]:
+    """Import `module` in a fresh interpreter with -X importtime and summarize the cost"""
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PACKAGE_PARENT,
+        capture_output=True,
+        text=True
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    cumulative_ms = 0.0
+    by_package = {}
+    for line in completed.stderr.splitlines():
+        match = _IMPORT_TIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, total_us, _, name = match.groups()
+        package = name.split(".")[0]
+        by_package[package] = by_package.get(package, 0.0) + int(self_us) / 1000
+        if name == module:
+            cumulative_ms = int(total_us) / 1000
+
+    slowest = sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top]
+    return {
+        "module": module,
+        "ok": completed.returncode == 0,
+        "import_ms": round(cumulative_ms, 1),
+        "process_wall_ms": round(wall_ms, 1),
+        "slowest_packages": [{"package": name, "self_ms": round(ms, 1)} for name, ms in slowest]
+    }
+
+def import_report(modules: List[str] = None, top: int = 5) -> List[Dict[str, Any]]:
+    return [measure_import(module, top) for module in (modules or DEFAULT_MODULES)]
+
+def format_report(report: List[Dict[str, Any]]) -> str:
+    lines = [f"{'module':<36} {'import ms':>10} {'process ms':>11}  slowest packages"]
+    for entry in report:
+        slowest = ", ".join(f"{p['package']} {p['self_ms']:.0f}ms" for p in entry["slowest_packages"])
+        status = "" if entry["ok"] else "  (import failed)"
+        lines.append(
+            f"{entry['module']:<36} {entry['import_ms']:>10.1f} {entry['process_wall_ms']:>11.1f}  {slowest}{status}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,85 @@
+from typing import Any, Callable, Iterable, Iterator, List
+import queue
+import threading
+
+# Marker placed on a queue once the producer is exhausted
+_DONE = object()
+
+def windowed(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Group an iterable into lists of at most `size` items without materializing it"""
+    window = []
+    for item in items:
+        window.append(item)
+        if len(window) >= size:
+            yield window
+            window = []
+    if window:
+        yield window
+
+def prefetch(items: Iterable[Any], depth: int = 2) -> Iterator[Any]:
+    """Produce items on a background thread, keeping at most `depth` of them buffered"""
+    buffer = queue.Queue(maxsize=max(1, depth))
+    stop = threading.Event()
+
+    def produce():
+        try:
+            for item in items:
+                if stop.is_set():
+                    return
+                buffer.put(item)
+            buffer.put(_DONE)
+        except BaseException as e:
+            buffer.put(e)
+
+    thread = threading.Thread(target=produce, name="prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        # Unblock the producer if the consumer stopped early
+        stop.set()
+        while thread.is_alive():
+            try:
+                buffer.get_nowait()
+            except queue.Empty:
+                thread.join(timeout=0.05)
+
+class BackgroundWriter:
+    """Applies `write` to submitted items on a background thread with a bounded backlog"""
+
+    def __init__(self, write: Callable[[Any], None], depth: int = 2):
+        self._write = write
+        self._queue = queue.Queue(maxsize=max(1, depth))
+        self._error = None
+        self._thread = threading.Thread(target=self._drain, name="background-writer", daemon=True)
+        self._thread.start()
+
+    def _drain(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _DONE:
+                return
+            # Keep draining after a failure so submit() never blocks forever
+            if self._error is None:
+                try:
+                    self._write(item)
+                except BaseException as e:
+                    self._error = e
+
+    def submit(self, item: Any) -> None:
+        if self._error is not None:
+            raise self._error
+        self._queue.put(item)
+
+    def close(self) -> None:
+        """Wait for pending writes and re-raise the first write error, if any"""
+        self._queue.put(_DONE)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
@@ -0,0 +1,48 @@
+from functools import lru_cache
+from typing import List
+
+# Model whose tokenizer is used when no model is given
+DEFAULT_TOKEN_MODEL = "gpt-3.5-turbo"
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # tiktoken downloads encodings on first use, which fails offline
+        print(f"Falling back to estimated token counts: {e}")
+        return None
+
+def count_tokens(text: str, model: str = DEFAULT_TOKEN_MODEL) -> int:
+    """Count tokens with tiktoken, or estimate at ~4 characters per token when it is unavailable"""
+    encoding = _encoding(model)
+    if encoding is None:
+        return max(1, len(text) // 4) if text else 0
+    return len(encoding.encode(text, disallowed_special=()))
+
+def group_by_tokens(texts: List[str], budget: int, model: str = DEFAULT_TOKEN_MODEL) -> List[List[int]]:
+    """Partition texts, in order, into groups of indexes whose token total fits the budget
+
+    A single text larger than the budget gets a group of its own.
+    """
+    groups = []
+    current = []
+    used = 0
+    for index, text in enumerate(texts):
+        tokens = count_tokens(text, model)
+        if current and used + tokens > budget:
+            groups.append(current)
+            current = []
+            used = 0
+        current.append(index)
+        used += tokens
+    if current:
+        groups.append(current)
+    return groups
@@ -0,0 +1,86 @@
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+import hashlib
+import json
+import re
+
+def parse_topic_list(result: str) -> List[Dict[str, Any]]:
+    """Parse an LLM response into a list, tolerating text around the JSON array
+
+    Raises ValueError when no JSON list can be recovered.
+    """
+    try:
+        parsed = json.loads(result)
+    except json.JSONDecodeError:
+        # Try to extract just the JSON part if there's extra text
+        if "[" not in result or "]" not in result:
+            raise ValueError("Could not parse the result as JSON")
+        try:
+            parsed = json.loads(result[result.find("["):result.rfind("]") + 1])
+        except json.JSONDecodeError:
+            raise ValueError("Could not parse the result as JSON")
+    if not isinstance(parsed, list):
+        raise ValueError(f"Expected a JSON list but got {type(parsed)}")
+    return parsed
+
+def _normalize(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", str(text).lower()).strip()
+
+def topic_id(name: str) -> str:
+    """Identity of a topic across runs: its name, ignoring case and punctuation"""
+    return _normalize(name)
+
+def merge_topics(topic_lists: Iterable[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Merge topic lists in order, combining topics and objectives that differ only in case or punctuation"""
+    merged = {}
+    for topics in topic_lists:
+        for item in topics:
+            if not isinstance(item, dict) or not item.get("topic"):
+                continue
+            key = _normalize(item["topic"])
+            if key not in merged:
+                merged[key] = {"topic": str(item["topic"]).strip(), "objectives": [], "_seen": set()}
+            entry = merged[key]
+            for chunk_id in item.get("source_chunks") or []:
+                entry.setdefault("source_chunks", [])
+                if chunk_id not in entry["source_chunks"]:
+                    entry["source_chunks"].append(chunk_id)
+            for objective in item.get("objectives") or []:
+                objective_key = _normalize(objective)
+                if objective_key and objective_key not in entry["_seen"]:
+                    entry["_seen"].add(objective_key)
+                    entry["objectives"].append(str(objective).strip())
+    return [
+        {key: value for key, value in entry.items() if key != "_seen"}
+        for entry in merged.values()
+    ]
+
+def attribute_sources(topics: List[Dict[str, Any]], chunks: Sequence[Tuple[str, str]]) -> List[Dict[str, Any]]:
+    """Record in each topic's "source_chunks" the IDs of the (id, text) chunks it was extracted from
+
+    A chunk is a source when it contains at least half of the words of the topic
+    name (ignoring words shorter than three letters); a topic that matches no
+    chunk is attributed to all of them.
+    """
+    chunk_words = [(chunk_id, set(_normalize(text).split())) for chunk_id, text in chunks]
+    for topic in topics:
+        words = {word for word in _normalize(topic.get("topic", "")).split() if len(word) >= 3}
+        matches = [
+            chunk_id for chunk_id, vocabulary in chunk_words
+            if words and len(words & vocabulary) * 2 >= len(words)
+        ]
+        topic["source_chunks"] = matches or [chunk_id for chunk_id, _ in chunks]
+    return topics
+
+def add_source_hashes(topics: List[Dict[str, Any]], texts: Dict[str, str]) -> List[Dict[str, Any]]:
+    """Set each topic's "source_hash" from the text of its source chunks
+
+    The hash ignores chunk IDs and order, so it only changes when the content
+    behind a topic does, not when the chunks move to another page.
+    """
+    for topic in topics:
+        digests = sorted(
+            hashlib.sha256(texts[chunk_id].encode("utf-8")).hexdigest()
+            for chunk_id in topic.get("source_chunks") or [] if chunk_id in texts
+        )
+        topic["source_hash"] = hashlib.sha256("\n".join(digests).encode("utf-8")).hexdigest()
+    return topics
@@ -0,0 +1,15 @@
+from lessoncraftai.utils.llm_wrapper import WrappedLLM
+from lessoncraftai.utils.tokens import count_tokens
+from lessoncraftai.utils.tracing import span
+import json
+
+class TracedLLM(WrappedLLM):
+    """Agent LLM that records every call as an "llm" span with prompt and completion token counts"""
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, **kwargs):
+        prompt = messages if isinstance(messages, str) else json.dumps(messages, default=str)
+        with span("llm", self.model, prompt_tokens=count_tokens(prompt), tools=bool(tools)) as s:
+            response = self._forward(messages, tools, callbacks, available_functions, **kwargs)
+            if isinstance(response, str):
+                s.set(completion_tokens=count_tokens(response))
+            return response
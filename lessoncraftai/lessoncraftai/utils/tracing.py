@@ -0,0 +1,193 @@
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from contextlib import contextmanager
+import contextvars
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+
+# The span code running in this thread or task belongs to; thread pools must pass `parent` explicitly
+_current: contextvars.ContextVar = contextvars.ContextVar("lessoncraft_span", default=None)
+_tracer: Optional["Tracer"] = None
+
+class Span:
+    """One timed operation with free-form attributes such as token counts and cache hits"""
+
+    def __init__(self, span_id: int, parent_id: Optional[int], category: str, name: str, attrs: Dict[str, Any]):
+        self.id = span_id
+        self.parent_id = parent_id
+        self.category = category
+        self.name = name
+        self.attrs = attrs
+        self.thread = threading.get_ident()
+        self.start = time.perf_counter()
+        self.duration = 0.0
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+    def add(self, key: str, value: float = 1) -> None:
+        self.attrs[key] = self.attrs.get(key, 0) + value
+
+class _NoopSpan:
+    """Returned when tracing is off, so instrumented code never needs to check"""
+    id = None
+
+    def set(self, **attrs) -> None:
+        pass
+
+    def add(self, key: str, value: float = 1) -> None:
+        pass
+
+NOOP_SPAN = _NoopSpan()
+
+class Tracer:
+    """Collects finished spans for one run"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._spans: List[Dict[str, Any]] = []
+        self.origin = time.perf_counter()
+
+    @contextmanager
+    def span(self, category: str, name: str, parent: Optional[Span] = None, **attrs) -> Iterator[Span]:
+        parent = parent if parent is not None else _current.get()
+        span = Span(next(self._ids), getattr(parent, "id", None), category, name, attrs)
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set(error=f"{type(e).__name__}: {e}"[:200])
+            raise
+        finally:
+            span.duration = time.perf_counter() - span.start
+            _current.reset(token)
+            with self._lock:
+                self._spans.append({
+                    "id": span.id,
+                    "parent_id": span.parent_id,
+                    "category": span.category,
+                    "name": span.name,
+                    "start_ms": round((span.start - self.origin) * 1000, 3),
+                    "duration_ms": round(span.duration * 1000, 3),
+                    "thread": span.thread,
+                    "attrs": span.attrs,
+                })
+
+    def spans(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return sorted(self._spans, key=lambda s: s["start_ms"])
+
+def enable_tracing() -> Tracer:
+    """Start collecting spans for this process, keeping the current tracer if there is one"""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer()
+    return _tracer
+
+def disable_tracing() -> Optional[Tracer]:
+    """Stop collecting spans and return the tracer that was active"""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+def get_tracer() -> Optional[Tracer]:
+    return _tracer
+
+def tracing_enabled() -> bool:
+    return _tracer is not None
+
+def span(category: str, name: str, parent: Optional[Span] = None, **attrs):
+    """Time a block as a span; a no-op unless tracing is enabled"""
+    if _tracer is None:
+        return _noop()
+    return _tracer.span(category, name, parent=parent, **attrs)
+
+@contextmanager
+def _noop() -> Iterator[_NoopSpan]:
+    yield NOOP_SPAN
+
+def current_span():
+    """The innermost open span in this context, or a no-op span"""
+    return _current.get() or NOOP_SPAN
+
+def traced(category: str) -> Callable:
+    """Decorate a tool's `_run` (or any method of an object with a `name`) with a span
+
+    The span records the token count of a string result as `output_tokens`.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with span(category, getattr(self, "name", type(self).__name__)) as s:
+                result = method(self, *args, **kwargs)
+                if _tracer is not None and isinstance(result, str):
+                    from lessoncraftai.utils.tokens import count_tokens
+                    s.set(output_tokens=count_tokens(result))
+                return result
+        return wrapper
+    return decorator
+
+# Attributes added up per (category, name) in the summary table
+SUMMARY_COUNTERS = ("prompt_tokens", "completion_tokens", "tokens", "output_tokens", "chunks", "texts", "cache_hits")
+
+def summarize_spans(spans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Aggregate spans per (category, name), slowest total first"""
+    rows: Dict[tuple, Dict[str, Any]] = {}
+    for s in spans:
+        row = rows.setdefault((s["category"], s["name"]), {
+            "category": s["category"], "name": s["name"], "count": 0,
+            "total_ms": 0.0, "max_ms": 0.0, "errors": 0,
+            **{counter: 0 for counter in SUMMARY_COUNTERS}
+        })
+        row["count"] += 1
+        row["total_ms"] += s["duration_ms"]
+        row["max_ms"] = max(row["max_ms"], s["duration_ms"])
+        row["errors"] += 1 if "error" in s["attrs"] else 0
+        for counter in SUMMARY_COUNTERS:
+            value = s["attrs"].get(counter)
+            if isinstance(value, bool):
+                value = int(value)
+            if isinstance(value, (int, float)):
+                row[counter] += value
+    for row in rows.values():
+        row["total_ms"] = round(row["total_ms"], 3)
+        row["mean_ms"] = round(row["total_ms"] / row["count"], 3)
+    return sorted(rows.values(), key=lambda r: r["total_ms"], reverse=True)
+
+def format_summary(rows: List[Dict[str, Any]]) -> str:
+    """Plain-text table of summarize_spans() output"""
+    header = f"{'category':<10} {'name':<28} {'count':>6} {'total ms':>11} {'mean ms':>10} {'max ms':>10} {'prompt tok':>10} {'compl tok':>10} {'tokens':>8} {'chunks':>7} {'hits':>6}"
+    lines = [header, "-" * len(header)]
+    for r in rows:
+        lines.append(
+            f"{r['category']:<10} {r['name'][:28]:<28} {r['count']:>6} {r['total_ms']:>11.1f} {r['mean_ms']:>10.1f} "
+            f"{r['max_ms']:>10.1f} {r['prompt_tokens']:>10} {r['completion_tokens']:>10} "
+            f"{r['tokens'] + r['output_tokens']:>8} {r['chunks']:>7} {r['cache_hits']:>6}"
+        )
+    return "\n".join(lines)
+
+def write_trace(path: str, tracer: Optional[Tracer] = None, fmt: str = "json") -> None:
+    """Write spans as JSON (spans plus summary) or in Chrome trace format for chrome://tracing and Perfetto"""
+    tracer = tracer or _tracer
+    spans = tracer.spans() if tracer else []
+    if fmt == "chrome":
+        payload = {"traceEvents": [
+            {
+                "name": s["name"], "cat": s["category"], "ph": "X",
+                "ts": round(s["start_ms"] * 1000), "dur": round(s["duration_ms"] * 1000),
+                "pid": os.getpid(), "tid": s["thread"], "args": s["attrs"]
+            }
+            for s in spans
+        ]}
+    elif fmt == "json":
+        payload = {"spans": spans, "summary": summarize_spans(spans)}
+    else:
+        raise ValueError(f"Unknown trace format '{fmt}'. Expected 'json' or 'chrome'")
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, default=str)
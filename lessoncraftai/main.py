@@ -1,6 +1,6 @@
-from crew import crew
+import sys
+from lessoncraftai.main import main
 
+# `python main.py ...` from a checkout; an installed copy provides the `lessoncraftai` command
 if __name__ == "__main__":
-    result = crew.kickoff()
-    print("\n=== RESULT ===")
-    print(result)
\ No newline at end of file
+    sys.exit(main())
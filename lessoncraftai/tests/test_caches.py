@@ -0,0 +1,137 @@
+from crewai import BaseLLM
+from lessoncraftai.utils import llm_cache
+from lessoncraftai.utils.cached_llm import CachedLLM
+from lessoncraftai.utils.embeddings import BatchedEmbeddings, EmbeddingCache, LocalHashEmbeddings
+from lessoncraftai.utils.llm_cache import ResponseCache, make_key
+
+class CountingEmbeddings(LocalHashEmbeddings):
+    """The offline backend, counting the texts it is asked to embed"""
+
+    def __init__(self):
+        super().__init__(dimensions=16)
+        self.texts = []
+
+    def embed_documents(self, texts):
+        self.texts.extend(texts)
+        return super().embed_documents(texts)
+
+class CountingLLM(BaseLLM):
+    calls: int = 0
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, **kwargs):
+        self.calls += 1
+        return f"answer {self.calls}"
+
+    def supports_function_calling(self) -> bool:
+        return True
+
+    def supports_stop_words(self) -> bool:
+        return True
+
+    def get_context_window_size(self) -> int:
+        return 8192
+
+def _embeddings(tmp_path, model="local-hash-16", max_bytes=1024 * 1024):
+    backend = CountingEmbeddings()
+    cache = EmbeddingCache(str(tmp_path / "embeddings"), max_bytes)
+    return backend, BatchedEmbeddings(backend, model, cache=cache, batch_size=2)
+
+def test_embedding_cache_hits_by_model_and_text(tmp_path):
+    backend, embeddings = _embeddings(tmp_path)
+    first = embeddings.embed_documents(["fractions", "decimals", "fractions"])
+    assert backend.texts == ["fractions", "decimals"]
+
+    assert embeddings.embed_documents(["decimals", "fractions"]) == [first[1], first[0]]
+    assert backend.texts == ["fractions", "decimals"]
+
+    embeddings.embed_documents(["ratios"])
+    assert backend.texts == ["fractions", "decimals", "ratios"]
+
+    # Another model shares the cache file but not its entries
+    other = BatchedEmbeddings(backend, "other-model", cache=embeddings.cache)
+    other.embed_documents(["fractions"])
+    assert backend.texts[-1] == "fractions"
+
+def test_embedding_cache_evicts_least_recently_used(tmp_path, monkeypatch):
+    clock = iter(range(100))
+    monkeypatch.setattr("lessoncraftai.utils.embeddings.time.time", lambda: next(clock))
+    # 16 float32 values per vector, room for two entries
+    backend, embeddings = _embeddings(tmp_path, max_bytes=2 * 16 * 4)
+    embeddings.embed_documents(["a"])
+    embeddings.embed_documents(["b"])
+    embeddings.embed_documents(["a"])
+    embeddings.embed_documents(["c"])
+    assert backend.texts == ["a", "b", "c"]
+
+    embeddings.embed_documents(["a", "c"])
+    assert backend.texts == ["a", "b", "c"]
+    embeddings.embed_documents(["b"])
+    assert backend.texts == ["a", "b", "c", "b"]
+
+def test_response_cache_keys():
+    key = make_key("gpt-4o-mini", 0.2, "prompt", "context")
+    assert key == make_key("gpt-4o-mini", 0.2, "prompt", "context")
+    assert len({
+        key,
+        make_key("gpt-4o", 0.2, "prompt", "context"),
+        make_key("gpt-4o-mini", 0.7, "prompt", "context"),
+        make_key("gpt-4o-mini", 0.2, "other prompt", "context"),
+        make_key("gpt-4o-mini", 0.2, "prompt", "other context"),
+    }) == 5
+
+def test_response_cache_hits_and_misses(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl_seconds=3600, max_entries=10)
+    key = make_key("gpt-4o-mini", 0.2, "prompt")
+    assert cache.get(key) is None
+    cache.put(key, "gpt-4o-mini", "response")
+    assert cache.get(key) == "response"
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+    cache.close()
+
+    # Totals survive the process; per-process counters start over
+    reopened = ResponseCache(str(tmp_path), ttl_seconds=3600, max_entries=10)
+    assert reopened.get(key) == "response"
+    stats = reopened.stats()
+    assert (stats["hits"], stats["total_hits"], stats["total_misses"]) == (1, 2, 1)
+
+def test_response_cache_expires_entries(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+    cache = ResponseCache(str(tmp_path), ttl_seconds=60, max_entries=10)
+    cache.put("key", "gpt-4o-mini", "response")
+
+    now[0] += 59
+    assert cache.get("key") == "response"
+    now[0] += 2
+    assert cache.get("key") is None
+    assert cache.stats()["entries"] == 0
+
+def test_response_cache_evicts_least_recently_used(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+    cache = ResponseCache(str(tmp_path), ttl_seconds=3600, max_entries=2)
+    for key in ("a", "b"):
+        now[0] += 1
+        cache.put(key, "gpt-4o-mini", key)
+    now[0] += 1
+    assert cache.get("a") == "a"
+    now[0] += 1
+    cache.put("c", "gpt-4o-mini", "c")
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == ("a", "c")
+
+def test_cached_llm_answers_repeated_calls_from_the_cache(tmp_path):
+    inner = CountingLLM(model="offline", temperature=0.2)
+    cache = ResponseCache(str(tmp_path), ttl_seconds=3600, max_entries=10)
+    llm = CachedLLM(model=inner.model, temperature=inner.temperature, inner=inner, cache=cache)
+    messages = [{"role": "user", "content": "List the topics"}]
+
+    assert llm.call(messages) == "answer 1"
+    assert llm.call(messages) == "answer 1"
+    assert llm.call([{"role": "user", "content": "List the objectives"}]) == "answer 2"
+    # Calls that offer tools always reach the wrapped LLM
+    assert llm.call(messages, tools=[{"name": "tool"}]) == "answer 3"
+    assert inner.calls == 3
@@ -0,0 +1,51 @@
+import pytest
+from langchain_core.documents import Document
+from lessoncraftai.utils.outline import OutlineBuilder, detect_heading
+
+@pytest.mark.parametrize("line", [
+    "Lesson a student will enjoy when they",
+    "part i of this guide explains how",
+    "topic a is covered below and then",
+    "2020 Edition Revised",
+    "100 Students Participated",
+    "3 Students worked in pairs",
+])
+def test_prose_is_not_a_heading(line):
+    assert detect_heading(line) is None
+
+@pytest.mark.parametrize("line, level, kind, number", [
+    ("Unit 3: Fractions", 1, "unit", "3"),
+    ("PART II Geometry", 1, "part", "II"),
+    ("lesson 4 Measuring Angles", 2, "lesson", "4"),
+    ("Section B - Ratios", 2, "section", "B"),
+    ("2.3 Comparing Fractions", 2, "numbered", "2.3"),
+    ("4. Measurement", 1, "numbered", "4"),
+    ("1) Place Value", 1, "numbered", "1"),
+    ("CCSS.MATH.5.NF.A.1 Add fractions", 3, "standard", "CCSS.MATH.5.NF.A.1"),
+    ("NUMBER AND OPERATIONS", 1, "caps", None),
+])
+def test_heading_levels(line, level, kind, number):
+    heading = detect_heading(line)
+    assert heading is not None
+    assert (heading["level"], heading["kind"], heading["number"]) == (level, kind, number)
+
+def _page(number, text):
+    return Document(page_content=text, metadata={"source": "guide.pdf", "page": number})
+
+def test_repeated_caps_lines_do_not_reset_the_hierarchy():
+    builder = OutlineBuilder()
+    builder.split_page(_page(0, "GRADE 5 MATHEMATICS\nUnit 1: Fractions\nAdding fractions.\nLesson 1 Like Denominators\nText."))
+    segments = builder.split_page(_page(1, "GRADE 5 MATHEMATICS\nMore about like denominators."))
+
+    assert [s["title"] for s in builder.sections] == ["Grade 5 Mathematics", "Unit 1: Fractions", "Lesson 1 Like Denominators"]
+    assert len(segments) == 1
+    assert segments[0].metadata["section_title"] == "Lesson 1 Like Denominators"
+    assert "GRADE 5 MATHEMATICS" not in segments[0].page_content
+
+def test_caps_lines_repeat_per_source():
+    builder = OutlineBuilder()
+    builder.split_page(_page(0, "NUMBER AND OPERATIONS\nText."))
+    other = Document(page_content="NUMBER AND OPERATIONS\nText.", metadata={"source": "other.pdf", "page": 0})
+    builder.split_page(other)
+
+    assert [s["source"] for s in builder.sections] == ["guide.pdf", "other.pdf"]